@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Input Sanitizer Scanner Benchmark for Perspective Prism
+
+Compares the precompiled injection/control-character scanners in
+app.utils.input_sanitizer against the original per-pattern / per-character
+implementations on evidence-sized (10k character) inputs, and batch evidence
+sanitization (cold and memoized) against the per-item path.
+
+Usage:
+    python .benchmarks/bench_input_sanitizer.py
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+import unicodedata
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.utils.input_sanitizer import (
+    MAX_EVIDENCE_LENGTH,
+    SUSPICIOUS_PATTERNS,
+    clear_sanitization_cache,
+    contains_control_characters,
+    contains_suspicious_patterns,
+    escape_special_characters,
+    sanitize_evidence_batch,
+    sanitize_evidence_text,
+    truncate_text,
+)
+
+TEXT_LENGTH = 10_000
+REPEAT = 5
+NUMBER = 50
+BATCH_SIZE = 12  # 4 perspectives x 3 search results
+
+WORDS = (
+    "the study found that global average temperatures rose by about one "
+    "degree since preindustrial times according to researchers at several "
+    "universities who analysed satellite records ocean buoys and weather "
+    "stations while critics argued the data was incomplete"
+).split()
+
+
+def legacy_contains_control_characters(text: str) -> bool:
+    """Original implementation: unicodedata.category() on every character."""
+    for char in text:
+        category = unicodedata.category(char)
+        if char in ["\t", "\n", "\r"]:
+            continue
+        if category.startswith("C"):
+            return True
+    return False
+
+
+def legacy_contains_suspicious_patterns(text: str) -> bool:
+    """Original implementation: one re.search() per pattern."""
+    text_lower = text.lower()
+    for pattern in SUSPICIOUS_PATTERNS:
+        if re.search(pattern, text_lower):
+            return True
+    return False
+
+
+def legacy_sanitize_evidence_text(text: str) -> str:
+    """Original sanitize_input path: per-item scans, escape the whole text, then truncate."""
+    text = text.strip()
+    legacy_contains_control_characters(text)
+    legacy_contains_suspicious_patterns(text)
+    text = escape_special_characters(text)
+    return truncate_text(text, MAX_EVIDENCE_LENGTH)
+
+
+def sanitize_items_cold(items):
+    """Per-item path with an empty memo, i.e. every item is scanned."""
+    clear_sanitization_cache()
+    return [sanitize_evidence_text(t) for t in items]
+
+
+def sanitize_batch_cold(items):
+    """Batch path with an empty memo, i.e. every item is scanned."""
+    clear_sanitization_cache()
+    return sanitize_evidence_batch(items)
+
+
+def make_evidence_text(length: int, seed: int = 0) -> str:
+    """Build clean, realistic-looking evidence text (the worst case: no early exit)."""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < length:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+        sentence = sentence.capitalize() + ".\n" if rng.random() < 0.1 else sentence.capitalize() + ". "
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)[:length]
+
+
+def bench(label: str, func, text: str) -> float:
+    best = min(timeit.repeat(lambda: func(text), repeat=REPEAT, number=NUMBER)) / NUMBER
+    print(f"  {label:<34} {best * 1e6:10.1f} µs")
+    return best
+
+
+def main():
+    text = make_evidence_text(TEXT_LENGTH)
+    assert legacy_contains_control_characters(text) == contains_control_characters(text)
+    assert legacy_contains_suspicious_patterns(text) == contains_suspicious_patterns(text)
+    oversized = make_evidence_text(3 * TEXT_LENGTH, seed=99)
+    assert legacy_sanitize_evidence_text(oversized) == sanitize_evidence_batch([oversized])[0]
+
+    print("=" * 60)
+    print("INPUT SANITIZER SCANNER BENCHMARK")
+    print("=" * 60)
+    print(f"Input: {len(text)} characters of clean evidence text\n")
+
+    print("Control characters:")
+    legacy = bench("legacy (per-character category)", legacy_contains_control_characters, text)
+    current = bench("compiled (isprintable fast paths)", contains_control_characters, text)
+    print(f"  speedup: {legacy / current:.1f}x\n")
+
+    print("Suspicious patterns:")
+    legacy = bench("legacy (15 x re.search)", legacy_contains_suspicious_patterns, text)
+    current = bench("compiled (symbol-gated scanners)", contains_suspicious_patterns, text)
+    print(f"  speedup: {legacy / current:.1f}x\n")
+
+    snippets = [f"- Result {i}: " + make_evidence_text(160, seed=i) for i in range(BATCH_SIZE)]
+    print(f"Evidence list ({BATCH_SIZE} search snippets):")
+    legacy = bench("per-item sanitize_evidence_text", sanitize_items_cold, snippets)
+    current = bench("sanitize_evidence_batch", sanitize_batch_cold, snippets)
+    print(f"  speedup: {legacy / current:.1f}x")
+    sanitize_evidence_batch(snippets)
+    memoized = bench("sanitize_evidence_batch (memo hits)", sanitize_evidence_batch, snippets)
+    print(f"  speedup: {legacy / memoized:.1f}x\n")
+
+    oversized = [oversized]
+    print(f"Oversized evidence ({len(oversized[0])} characters, truncated):")
+    legacy = bench("legacy (scan, escape all, truncate)", lambda items: [legacy_sanitize_evidence_text(t) for t in items], oversized)
+    current = bench("sanitize_evidence_batch", sanitize_batch_cold, oversized)
+    print(f"  speedup: {legacy / current:.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
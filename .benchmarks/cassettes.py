@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Record/replay cassettes of real upstream responses for Perspective Prism.
+
+Recording runs the backend against a recording proxy that forwards every
+upstream request (YouTube transcript pages, OpenAI/Gemini completions,
+Google Custom Search) to the real service and saves the response body,
+status and latency in a JSON cassette. Credentials come from backend/.env as
+usual and are never written to the cassette.
+
+Replaying serves those responses from a local server with their original
+latencies, optionally scaled, so ClaimExtractor, EvidenceRetriever and
+AnalysisService see realistic payloads and timings without network access.
+Requests are matched on their content (LLM messages, search query, video ID);
+a request with no exact match (e.g. after a prompt change) falls back to a
+recorded response of the same kind and is counted as "fallback".
+
+Usage:
+    python .benchmarks/cassettes.py record --out .benchmarks/cassettes/ted.json \\
+        "https://www.youtube.com/watch?v=sFIDCtRX_-o" "https://www.youtube.com/watch?v=6Af6b_wyiwI"
+    python .benchmarks/cassettes.py show .benchmarks/cassettes/ted.json
+    python .benchmarks/load_test.py --cassette .benchmarks/cassettes/ted.json --time-scale 0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_upstreams import ServerThread, classify_prompt  # noqa: E402
+
+CASSETTE_VERSION = 1
+
+REAL_UPSTREAMS = {
+    "openai": "https://api.openai.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "google_cse": "https://www.googleapis.com",
+    "youtube": "https://www.youtube.com",
+}
+
+# Request headers passed through to the real upstream when recording
+FORWARDED_HEADERS = {
+    "accept",
+    "accept-language",
+    "authorization",
+    "content-type",
+    "cookie",
+    "openai-organization",
+    "openai-project",
+    "user-agent",
+    "x-goog-api-client",
+    "x-goog-api-key",
+}
+
+
+def upstream_for_path(path: str) -> Optional[str]:
+    """Which upstream a request path on the proxy/replay server belongs to."""
+    if path.startswith("/v1/"):
+        return "openai"
+    if path.startswith("/v1beta/"):
+        return "gemini"
+    if path.startswith("/customsearch/"):
+        return "google_cse"
+    if path == "/watch" or path.startswith(("/youtubei/", "/api/timedtext")):
+        return "youtube"
+    return None
+
+
+def _llm_prompt(upstream: str, payload: Dict[str, Any]) -> str:
+    if upstream == "openai":
+        return "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+    return "\n".join(
+        part.get("text", "")
+        for content in payload.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+def describe_request(upstream: str, path: str, params: Dict[str, str], body: bytes) -> Tuple[str, str]:
+    """
+    Compute the (match key, kind) of an upstream request.
+
+    The key covers only what determines the response (LLM model and messages,
+    search query, video ID), never credentials or per-request tokens. The
+    kind groups interchangeable requests for fallback matching.
+    """
+    if upstream in ("openai", "gemini"):
+        payload = json.loads(body or b"{}")
+        if upstream == "openai":
+            material = {"model": payload.get("model"), "messages": payload.get("messages")}
+        else:
+            material = {"path": path, "contents": payload.get("contents")}
+        kind = classify_prompt(_llm_prompt(upstream, payload))
+    elif upstream == "google_cse":
+        material = {"q": params.get("q"), "num": params.get("num")}
+        kind = "search"
+    else:
+        if path.startswith("/youtubei/"):
+            video_id = json.loads(body or b"{}").get("videoId")
+            kind = "player"
+        elif path.startswith("/api/timedtext"):
+            video_id = params.get("v")
+            kind = "timedtext"
+        else:
+            video_id = params.get("v")
+            kind = "watch"
+        material = {"video_id": video_id, "lang": params.get("lang")}
+    digest = hashlib.blake2b(
+        json.dumps([upstream, kind, material], sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return digest, kind
+
+
+class Cassette:
+    """Recorded upstream interactions for a set of videos."""
+
+    def __init__(
+        self,
+        interactions: Optional[List[Dict[str, Any]]] = None,
+        videos: Optional[List[str]] = None,
+        provider: str = "openai",
+        recorded_at: Optional[str] = None,
+    ):
+        self.interactions = interactions or []
+        self.videos = videos or []
+        self.provider = provider
+        self.recorded_at = recorded_at or datetime.now(timezone.utc).isoformat()
+        self._lock = threading.Lock()
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CASSETTE_VERSION,
+                "recorded_at": self.recorded_at,
+                "provider": self.provider,
+                "videos": self.videos,
+                "interactions": self.interactions,
+            }, f, indent=1)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {data.get('version')} in {path}")
+        return cls(data["interactions"], data["videos"], data["provider"], data["recorded_at"])
+
+
+class Replayer:
+    """Serves cassette interactions and counts calls per upstream and outcome."""
+
+    def __init__(self, cassette: Cassette, time_scale: float = 1.0):
+        self.cassette = cassette
+        self.time_scale = time_scale
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_kind: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for interaction in cassette.interactions:
+            self._by_key.setdefault(interaction["key"], []).append(interaction)
+            self._by_kind.setdefault((interaction["upstream"], interaction["kind"]), []).append(interaction)
+        self._cursors: Counter = Counter()
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def lookup(self, upstream: str, key: str, kind: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Pick the interaction to serve and the outcome to count.
+
+        Repeated requests cycle through the responses recorded for them, so a
+        recorded 429 followed by a successful retry replays the same way.
+        """
+        with self._lock:
+            candidates = self._by_key.get(key)
+            cursor_key = key
+            if candidates:
+                interaction = candidates[self._cursors[cursor_key] % len(candidates)]
+                outcome = _status_outcome(interaction["status"])
+            else:
+                candidates = self._by_kind.get((upstream, kind))
+                cursor_key = f"{upstream}:{kind}"
+                if not candidates:
+                    self.calls[(upstream, "miss")] += 1
+                    return None, "miss"
+                interaction = candidates[self._cursors[cursor_key] % len(candidates)]
+                outcome = "fallback"
+            self._cursors[cursor_key] += 1
+            self.calls[(upstream, outcome)] += 1
+        return interaction, outcome
+
+    def call_counts(self) -> Dict[str, Dict[str, int]]:
+        """Calls served so far as {upstream: {outcome: count}}."""
+        with self._lock:
+            snapshot = dict(self.calls)
+        counts: Dict[str, Dict[str, int]] = {}
+        for (upstream, outcome), count in sorted(snapshot.items()):
+            counts.setdefault(upstream, {})[outcome] = count
+        return counts
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+
+def _status_outcome(status: int) -> str:
+    if status == 429:
+        return "rate_limited"
+    return "ok" if status < 400 else "error"
+
+
+def create_replay_app(replayer: Replayer) -> FastAPI:
+    """Build the FastAPI app that serves a cassette in place of all upstreams."""
+    app = FastAPI(title="Perspective Prism cassette replay")
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def replay(path: str, request: Request):
+        path = f"/{path}"
+        upstream = upstream_for_path(path)
+        if upstream is None:
+            return Response(status_code=404)
+        key, kind = describe_request(upstream, path, dict(request.query_params), await request.body())
+        interaction, _ = replayer.lookup(upstream, key, kind)
+        if interaction is None:
+            return Response(f"No recorded {upstream} {kind} response", status_code=404)
+        await asyncio.sleep(interaction["latency_ms"] / 1000 * replayer.time_scale)
+        return Response(
+            interaction["body"],
+            status_code=interaction["status"],
+            media_type=interaction["content_type"],
+        )
+
+    return app
+
+
+def create_recording_app(cassette: Cassette, targets: Dict[str, str]) -> FastAPI:
+    """Build the FastAPI app that forwards to the real upstreams and records responses."""
+    app = FastAPI(title="Perspective Prism cassette recorder")
+    client = httpx.AsyncClient(timeout=120.0)
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def record(path: str, request: Request):
+        path = f"/{path}"
+        upstream = upstream_for_path(path)
+        if upstream is None:
+            return Response(status_code=404)
+        body = await request.body()
+        headers = {k: v for k, v in request.headers.items() if k.lower() in FORWARDED_HEADERS}
+        start = time.perf_counter()
+        response = await client.request(
+            request.method,
+            targets[upstream].rstrip("/") + path,
+            params=list(request.query_params.multi_items()),
+            content=body,
+            headers=headers,
+        )
+        latency_ms = (time.perf_counter() - start) * 1000
+        key, kind = describe_request(upstream, path, dict(request.query_params), body)
+        content_type = response.headers.get("content-type", "application/octet-stream")
+        cassette.add({
+            "upstream": upstream,
+            "kind": kind,
+            "key": key,
+            "method": request.method,
+            "path": path,
+            "status": response.status_code,
+            "content_type": content_type,
+            "body": response.text,
+            "latency_ms": round(latency_ms, 1),
+        })
+        return Response(response.content, status_code=response.status_code, media_type=content_type)
+
+    return app
+
+
+def video_id_from_arg(value: str) -> str:
+    """Accept a YouTube watch/short URL or a bare video ID."""
+    parsed = urlparse(value)
+    if parsed.hostname == "youtu.be":
+        return parsed.path.lstrip("/")
+    if parsed.hostname and "v" in parse_qs(parsed.query):
+        return parse_qs(parsed.query)["v"][0]
+    return value
+
+
+def record(args) -> int:
+    from load_test import free_port, run_job, start_backend, wait_for_backend
+
+    video_ids = [video_id_from_arg(v) for v in args.videos]
+    cassette = Cassette(videos=video_ids, provider=args.provider)
+    targets = {name: args.upstream_base or url for name, url in REAL_UPSTREAMS.items()}
+    proxy = ServerThread(create_recording_app(cassette, targets))
+    proxy_url = proxy.start()
+
+    port = free_port()
+    backend_url = f"http://127.0.0.1:{port}"
+    backend = start_backend(port, proxy_url, args.provider, args.verbose, fake_credentials=False)
+    failed = 0
+    try:
+        wait_for_backend(backend_url, backend)
+
+        async def run_all():
+            nonlocal failed
+            async with httpx.AsyncClient(base_url=backend_url, timeout=60.0) as client:
+                for video_id in video_ids:
+                    result = await run_job(client, video_id, poll_wait=25.0, job_timeout=args.job_timeout)
+                    print(f"  {video_id}: {result.status} in {result.latency:.1f}s"
+                          + (f" ({result.error})" if result.error else ""))
+                    failed += result.status != "completed"
+
+        print(f"Recording {len(video_ids)} video(s) with provider {args.provider}...")
+        asyncio.run(run_all())
+    finally:
+        backend.terminate()
+        backend.wait(timeout=10)
+        proxy.stop()
+
+    cassette.save(args.out)
+    print(f"Saved {len(cassette.interactions)} interactions to {args.out}")
+    return 1 if failed else 0
+
+
+def show(args) -> int:
+    cassette = Cassette.load(args.cassette)
+    print(f"Recorded {cassette.recorded_at} with provider {cassette.provider}")
+    print(f"Videos: {', '.join(cassette.videos)}")
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for interaction in cassette.interactions:
+        groups.setdefault((interaction["upstream"], interaction["kind"]), []).append(interaction)
+    print(f"\n  {'upstream':<12} {'kind':<12} {'count':>6} {'errors':>7} {'mean ms':>9} {'max ms':>9}")
+    for (upstream, kind), items in sorted(groups.items()):
+        latencies = [i["latency_ms"] for i in items]
+        errors = sum(1 for i in items if i["status"] >= 400)
+        print(f"  {upstream:<12} {kind:<12} {len(items):6d} {errors:7d} "
+              f"{sum(latencies) / len(latencies):9.1f} {max(latencies):9.1f}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record or inspect upstream response cassettes.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Analyze videos against the real APIs and save a cassette")
+    record_parser.add_argument("videos", nargs="+", help="YouTube URLs or video IDs")
+    record_parser.add_argument("--out", required=True, help="Cassette file to write")
+    record_parser.add_argument("--provider", choices=("openai", "gemini"), default="openai")
+    record_parser.add_argument("--upstream-base", help="Forward every upstream to this base URL instead of the real APIs")
+    record_parser.add_argument("--job-timeout", type=float, default=600.0)
+    record_parser.add_argument("--verbose", action="store_true", help="Show the backend's stdout")
+    record_parser.set_defaults(func=record)
+
+    show_parser = subparsers.add_parser("show", help="Summarize a cassette")
+    show_parser.add_argument("cassette")
+    show_parser.set_defaults(func=show)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
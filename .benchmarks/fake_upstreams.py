@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the upstream APIs used by Perspective Prism.
+
+A single FastAPI app serves fake versions of:
+
+- OpenAI chat completions      POST /v1/chat/completions
+- Gemini generateContent       POST /v1beta/models/{model}:generateContent
+- Google Custom Search         GET  /customsearch/v1
+- YouTube transcripts          GET  /watch, POST /youtubei/v1/player, GET /api/timedtext
+
+Each upstream has an UpstreamProfile with a latency distribution and injected
+error / 429 rates. LLM responses are synthesized from the prompt (claims JSON
+for extraction prompts, stance JSON for perspective prompts, bias JSON for bias
+prompts), so the real services parse them unchanged. Every request is counted
+per upstream and outcome.
+
+Used by load_test.py; can also be run on its own for manual testing:
+
+    python .benchmarks/fake_upstreams.py --port 8900
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+UPSTREAMS = ("openai", "gemini", "google_cse", "youtube")
+
+INNERTUBE_API_KEY = "fake-innertube-key"
+
+SENTENCES = [
+    "global average temperatures have risen by about one point one degrees since preindustrial times",
+    "the new vaccine reduced hospitalizations by ninety percent in the clinical trial",
+    "unemployment fell to its lowest level in fifty years last spring",
+    "the city spends more on policing than on schools and parks combined",
+    "renewable energy now supplies a third of the country's electricity",
+    "most of the plastic in the ocean comes from just ten rivers",
+    "the minimum wage has not kept pace with inflation since nineteen sixty eight",
+    "crime rates in large cities are lower today than in the nineteen nineties",
+    "the average household now spends six hours a day looking at screens",
+    "the bridge project came in two years late and forty percent over budget",
+]
+
+_TIMESTAMP_LINE_RE = re.compile(r"^\[(\d+):(\d{2})\]\s+(.+)$", re.MULTILINE)
+_SITE_RE = re.compile(r"site:([\w.-]+)")
+
+
+@dataclass
+class UpstreamProfile:
+    """Latency distribution and fault injection for one upstream."""
+
+    # "fixed", "uniform" (median +/- spread) or "lognormal" (sigma = spread)
+    distribution: str = "lognormal"
+    median_ms: float = 100.0
+    spread: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw one response latency in seconds."""
+        median = self.median_ms / 1000
+        if self.distribution == "fixed":
+            return median
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(median * (1 - self.spread), median * (1 + self.spread)))
+        if self.distribution == "lognormal":
+            return rng.lognormvariate(math.log(median), self.spread) if median > 0 else 0.0
+        raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+
+def default_profiles() -> Dict[str, UpstreamProfile]:
+    """Rough shape of production latencies for each upstream."""
+    return {
+        "openai": UpstreamProfile(median_ms=900, spread=0.5),
+        "gemini": UpstreamProfile(median_ms=700, spread=0.5),
+        "google_cse": UpstreamProfile(median_ms=250, spread=0.4),
+        "youtube": UpstreamProfile(median_ms=150, spread=0.3),
+    }
+
+
+def apply_overrides(profiles: Dict[str, UpstreamProfile], overrides: List[str]) -> None:
+    """
+    Apply ``upstream.field=value`` overrides (e.g. ``openai.median_ms=1500``).
+
+    ``*`` as the upstream applies the override to every upstream.
+    """
+    field_types = {f.name: f.type for f in fields(UpstreamProfile)}
+    for override in overrides:
+        try:
+            target, value = override.split("=", 1)
+            upstream, field_name = target.split(".", 1)
+        except ValueError:
+            raise ValueError(f"Expected upstream.field=value, got {override!r}")
+        if field_name not in field_types:
+            raise ValueError(f"Unknown profile field {field_name!r}; expected one of {sorted(field_types)}")
+        targets = list(profiles) if upstream == "*" else [upstream]
+        for name in targets:
+            if name not in profiles:
+                raise ValueError(f"Unknown upstream {name!r}; expected one of {list(profiles)}")
+            converted = value if field_types[field_name] in (str, "str") else float(value)
+            setattr(profiles[name], field_name, converted)
+
+
+def classify_prompt(prompt: str) -> str:
+    """Which service prompt this is: "claims", "bias" or "perspective"."""
+    if "extract the key claims" in prompt:
+        return "claims"
+    if "bias and deception analyst" in prompt:
+        return "bias"
+    return "perspective"
+
+
+class SyntheticResponder:
+    """Builds plausible upstream payloads from the request contents."""
+
+    def __init__(self, transcript_segments: int = 120, claims_per_video: int = 5, results_per_search: int = 3):
+        self.transcript_segments = transcript_segments
+        self.claims_per_video = claims_per_video
+        self.results_per_search = results_per_search
+
+    def llm_completion(self, prompt: str) -> str:
+        """JSON content an LLM would return for one of the service prompts."""
+        kind = classify_prompt(prompt)
+        if kind == "claims":
+            return json.dumps({"claims": self._claims(prompt)})
+        if kind == "bias":
+            return json.dumps({
+                "framing_bias": "Presents the issue mainly through economic costs.",
+                "sourcing_bias": None,
+                "omission_bias": "Does not mention long-term trends.",
+                "sensationalism": None,
+                "deception_rating": round(_stable_fraction(prompt) * 4, 1),
+                "deception_rationale": "Claims are mostly supported but selectively framed.",
+            })
+        stance = ("Support", "Refute", "Ambiguous")[int(_stable_fraction(prompt) * 3)]
+        return json.dumps({
+            "stance": stance,
+            "confidence": round(0.5 + _stable_fraction(prompt[::-1]) / 2, 2),
+            "explanation": f"The retrieved sources {stance.lower()} the claim.",
+        })
+
+    def _claims(self, prompt: str) -> List[Dict]:
+        lines = _TIMESTAMP_LINE_RE.findall(prompt)
+        if not lines:
+            return []
+        step = max(1, len(lines) // self.claims_per_video)
+        claims = []
+        for minutes, seconds, text in lines[::step][: self.claims_per_video]:
+            start = int(minutes) * 60 + int(seconds)
+            claims.append({
+                "text": text.strip().capitalize() + ".",
+                "start_time": float(start),
+                "end_time": float(start + 8),
+                "context": text.strip(),
+            })
+        return claims
+
+    def search_results(self, query: str, num: int) -> Dict:
+        """Custom Search JSON API payload for a site-filtered query."""
+        domains = _SITE_RE.findall(query) or ["example.com"]
+        topic = query.split(" (site:", 1)[0]
+        slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")[:60]
+        items = []
+        for i in range(min(num, self.results_per_search)):
+            domain = domains[i % len(domains)]
+            items.append({
+                "link": f"https://{domain}/articles/{slug}-{i}",
+                "title": f"{topic[:60]} | {domain}",
+                "snippet": self._snippet(topic, domain, i),
+                "displayLink": domain,
+            })
+        return {"kind": "customsearch#search", "items": items}
+
+    def _snippet(self, topic: str, domain: str, rank: int) -> str:
+        """
+        On-topic snippet that differs per result, as real ones do: identical
+        boilerplate would be dropped as syndicated copies by evidence dedup.
+        """
+        rng = random.Random(f"{domain}/{rank}/{topic}")
+        background = ". ".join(rng.sample(SENTENCES, 3))
+        return f"{domain} looked at whether {topic[:120]}. Background: {background}."
+
+    def transcript_xml(self, video_id: str) -> str:
+        """Timed-text XML for a video, deterministic per video ID."""
+        rng = random.Random(video_id)
+        parts = ["<?xml version=\"1.0\" encoding=\"utf-8\" ?><transcript>"]
+        start = 0.0
+        for _ in range(self.transcript_segments):
+            duration = round(rng.uniform(2.0, 6.0), 2)
+            text = escape(rng.choice(SENTENCES))
+            parts.append(f'<text start="{start:.2f}" dur="{duration}">{text}</text>')
+            start += duration
+        parts.append("</transcript>")
+        return "".join(parts)
+
+
+def _stable_fraction(text: str) -> float:
+    """Deterministic value in [0, 1) derived from text."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+class FakeUpstreams:
+    """Shared state behind the fake upstream app: profiles, RNG and call counts."""
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, UpstreamProfile]] = None,
+        responder: Optional[SyntheticResponder] = None,
+        seed: int = 0,
+    ):
+        self.profiles = profiles or default_profiles()
+        self.responder = responder or SyntheticResponder()
+        self.rng = random.Random(seed)
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    async def simulate(self, upstream: str) -> str:
+        """Sleep for a sampled latency and pick the outcome: ok, error or rate_limited."""
+        profile = self.profiles[upstream]
+        with self._lock:
+            latency = profile.sample_latency(self.rng)
+            roll = self.rng.random()
+        await asyncio.sleep(latency)
+        if roll < profile.rate_limit_rate:
+            outcome = "rate_limited"
+        elif roll < profile.rate_limit_rate + profile.error_rate:
+            outcome = "error"
+        else:
+            outcome = "ok"
+        with self._lock:
+            self.calls[(upstream, outcome)] += 1
+        return outcome
+
+    def call_counts(self) -> Dict[str, Dict[str, int]]:
+        """Calls served so far as {upstream: {outcome: count}}."""
+        with self._lock:
+            snapshot = dict(self.calls)
+        counts: Dict[str, Dict[str, int]] = {}
+        for (upstream, outcome), count in sorted(snapshot.items()):
+            counts.setdefault(upstream, {})[outcome] = count
+        return counts
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+
+def _openai_error(outcome: str) -> JSONResponse:
+    if outcome == "rate_limited":
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            status_code=429,
+        )
+    return JSONResponse({"error": {"message": "The server had an error", "type": "server_error"}}, status_code=500)
+
+
+def _google_error(outcome: str) -> JSONResponse:
+    if outcome == "rate_limited":
+        return JSONResponse(
+            {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}},
+            status_code=429,
+        )
+    return JSONResponse({"error": {"code": 500, "message": "Internal error", "status": "INTERNAL"}}, status_code=500)
+
+
+def _plain_error(outcome: str) -> Response:
+    return Response(status_code=429 if outcome == "rate_limited" else 500)
+
+
+def create_app(upstreams: FakeUpstreams) -> FastAPI:
+    """Build the FastAPI app serving all fake upstreams."""
+    app = FastAPI(title="Perspective Prism fake upstreams")
+    app.state.upstreams = upstreams
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat_completions(request: Request):
+        payload = await request.json()
+        outcome = await upstreams.simulate("openai")
+        if outcome != "ok":
+            return _openai_error(outcome)
+        prompt = "\n".join(m.get("content", "") for m in payload.get("messages", []))
+        content = upstreams.responder.llm_completion(prompt)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.post("/v1beta/models/{model_method}")
+    async def gemini_generate_content(model_method: str, request: Request):
+        if not model_method.endswith(":generateContent"):
+            return JSONResponse({"error": {"code": 404, "status": "NOT_FOUND"}}, status_code=404)
+        payload = await request.json()
+        outcome = await upstreams.simulate("gemini")
+        if outcome != "ok":
+            return _google_error(outcome)
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in payload.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        text = upstreams.responder.llm_completion(prompt)
+        return {
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt) + len(text)) // 4,
+            },
+        }
+
+    @app.get("/customsearch/v1")
+    async def google_custom_search(q: str = "", num: int = 10):
+        outcome = await upstreams.simulate("google_cse")
+        if outcome != "ok":
+            return _google_error(outcome)
+        return upstreams.responder.search_results(q, num)
+
+    @app.get("/watch")
+    async def youtube_watch(v: str = ""):
+        outcome = await upstreams.simulate("youtube")
+        if outcome != "ok":
+            return _plain_error(outcome)
+        return HTMLResponse(
+            f'<html><head><script>ytcfg.set({{"INNERTUBE_API_KEY": "{INNERTUBE_API_KEY}"}});</script></head>'
+            f"<body>{v}</body></html>"
+        )
+
+    @app.post("/youtubei/v1/player")
+    async def youtube_player(request: Request):
+        payload = await request.json()
+        outcome = await upstreams.simulate("youtube")
+        if outcome != "ok":
+            return _plain_error(outcome)
+        video_id = payload.get("videoId", "")
+        return {
+            "playabilityStatus": {"status": "OK"},
+            "captions": {
+                "playerCaptionsTracklistRenderer": {
+                    "captionTracks": [{
+                        # Absolute youtube.com URL like the real API; the backend's
+                        # redirecting session sends it back to this server
+                        "baseUrl": f"https://www.youtube.com/api/timedtext?v={video_id}&lang=en",
+                        "name": {"runs": [{"text": "English"}]},
+                        "languageCode": "en",
+                        "isTranslatable": False,
+                    }],
+                    "translationLanguages": [],
+                }
+            },
+        }
+
+    @app.get("/api/timedtext")
+    async def youtube_timedtext(v: str = ""):
+        outcome = await upstreams.simulate("youtube")
+        if outcome != "ok":
+            return _plain_error(outcome)
+        return Response(upstreams.responder.transcript_xml(v), media_type="text/xml")
+
+    @app.get("/_calls")
+    async def call_counts():
+        return upstreams.call_counts()
+
+    return app
+
+
+class ServerThread:
+    """Run a uvicorn server in a daemon thread with its own event loop."""
+
+    def __init__(self, app: FastAPI, host: str = "127.0.0.1", port: int = 0):
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self, timeout: float = 10.0) -> str:
+        """Start serving and return the base URL once the socket is bound."""
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("Fake upstream server failed to start")
+            time.sleep(0.01)
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake upstream APIs for local testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="UPSTREAM.FIELD=VALUE",
+                        help="Override a latency/fault profile field, e.g. openai.median_ms=1500 or *.error_rate=0.01")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profiles = default_profiles()
+    apply_overrides(profiles, args.overrides)
+    app = create_app(FakeUpstreams(profiles, seed=args.seed))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
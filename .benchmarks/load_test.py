@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Offline Load Test for Perspective Prism
+
+Starts local fake upstream servers (OpenAI, Gemini, Google Custom Search and
+YouTube transcripts, see fake_upstreams.py), runs the backend against them in
+a subprocess and drives the job API (POST /analyze/jobs + long-polled
+GET /analyze/jobs/{id}) at a configurable concurrency. Reports throughput,
+p50/p95/p99 job latency, mean per-stage latency from /metrics and the number
+of calls each upstream received. No network access or API keys are needed.
+
+With --cassette, recorded real responses (see cassettes.py) are replayed
+instead of the synthetic fakes.
+
+Usage:
+    python .benchmarks/load_test.py --jobs 40 --concurrency 8
+    python .benchmarks/load_test.py --set openai.median_ms=2000 --set google_cse.rate_limit_rate=0.05
+    python .benchmarks/load_test.py --cassette .benchmarks/cassettes/ted.json --time-scale 0.5
+    python .benchmarks/load_test.py --json > results.json
+
+Exits non-zero when --min-throughput / --max-p95 / --max-failure-rate are
+given and not met, so it can gate a deploy.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cassettes import Cassette, Replayer, create_replay_app  # noqa: E402
+from fake_upstreams import (  # noqa: E402
+    FakeUpstreams,
+    ServerThread,
+    SyntheticResponder,
+    apply_overrides,
+    create_app,
+    default_profiles,
+)
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "backend")
+BACKEND_ENTRY = os.path.join(os.path.dirname(__file__), "load_test_backend.py")
+TERMINAL_STATUSES = ("completed", "failed")
+
+_STAGE_SAMPLE_RE = re.compile(
+    r'^perspective_prism_stage_duration_seconds_(sum|count)\{stage="([^"]+)"\} (\S+)$', re.MULTILINE
+)
+
+
+@dataclass
+class JobResult:
+    video_id: str
+    status: str
+    latency: float
+    error: Optional[str] = None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q-th percentile (0-100) with linear interpolation between closest ranks."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_backend(
+    port: int,
+    upstream_url: str,
+    provider: str,
+    verbose: bool = False,
+    fake_credentials: bool = True,
+) -> subprocess.Popen:
+    """
+    Start the API in a subprocess with every upstream pointed at upstream_url.
+
+    With fake_credentials=False the API keys come from backend/.env, as needed
+    when upstream_url is the cassette recording proxy.
+    """
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": provider,
+        "OPENAI_BASE_URL": f"{upstream_url}/v1",
+        "GEMINI_API_ENDPOINT": upstream_url,
+        "GOOGLE_SEARCH_BASE_URL": f"{upstream_url}/customsearch/v1",
+        "OTLP_TRACES_ENDPOINT": "",
+    })
+    if fake_credentials:
+        env.update({
+            "OPENAI_API_KEY": "sk-load-test",
+            "GEMINI_API_KEY": "load-test",
+            "GOOGLE_API_KEY": "load-test",
+            "GOOGLE_CSE_ID": "load-test",
+        })
+    return subprocess.Popen(
+        [sys.executable, BACKEND_ENTRY, "--port", str(port), "--youtube-base-url", upstream_url],
+        cwd=BACKEND_DIR,
+        env=env,
+        # The pipeline prints per-claim progress; keep it out of the report unless asked
+        stdout=None if verbose else subprocess.DEVNULL,
+    )
+
+
+def wait_for_backend(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("Backend did not become healthy in time")
+
+
+async def run_job(client: httpx.AsyncClient, video_id: str, poll_wait: float, job_timeout: float) -> JobResult:
+    """Submit one analysis job and long-poll it to a terminal state."""
+    start = time.perf_counter()
+    try:
+        response = await client.post("/analyze/jobs", json={"url": f"https://www.youtube.com/watch?v={video_id}"})
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+        while True:
+            if time.perf_counter() - start > job_timeout:
+                return JobResult(video_id, "timeout", time.perf_counter() - start)
+            response = await client.get(f"/analyze/jobs/{job_id}", params={"wait": poll_wait})
+            response.raise_for_status()
+            body = response.json()
+            if body["status"] in TERMINAL_STATUSES:
+                return JobResult(video_id, body["status"], time.perf_counter() - start, body.get("error"))
+    except httpx.HTTPError as e:
+        return JobResult(video_id, "client_error", time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+
+async def drive(base_url: str, video_ids: List[str], concurrency: int, poll_wait: float, job_timeout: float):
+    """Run all jobs with at most `concurrency` in flight; returns (results, wall time)."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for video_id in video_ids:
+        queue.put_nowait(video_id)
+    results: List[JobResult] = []
+
+    async def worker(client: httpx.AsyncClient):
+        while True:
+            try:
+                video_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            results.append(await run_job(client, video_id, poll_wait, job_timeout))
+
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=poll_wait + 30, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        wall_time = time.perf_counter() - start
+    return results, wall_time
+
+
+def stage_means(metrics_text: str) -> Dict[str, float]:
+    """Mean seconds per pipeline stage from the backend's /metrics output."""
+    sums: Dict[str, float] = {}
+    counts: Dict[str, float] = {}
+    for kind, stage, value in _STAGE_SAMPLE_RE.findall(metrics_text):
+        (sums if kind == "sum" else counts)[stage] = float(value)
+    return {stage: sums[stage] / counts[stage] for stage in sums if counts.get(stage)}
+
+
+def summarize(results: List[JobResult], wall_time: float, upstream_calls, stages, args) -> Dict:
+    video_ids = [r.video_id for r in results]
+    latencies = [r.latency for r in results if r.status == "completed"]
+    statuses: Dict[str, int] = {}
+    for r in results:
+        statuses[r.status] = statuses.get(r.status, 0) + 1
+    completed = statuses.get("completed", 0)
+    errors = sorted({" ".join(r.error.split())[:200] for r in results if r.error})
+    return {
+        "config": {
+            "jobs": args.jobs,
+            "concurrency": args.concurrency,
+            "distinct_videos": len(set(video_ids)),
+            "provider": args.provider,
+            "cassette": args.cassette,
+            "time_scale": args.time_scale if args.cassette else None,
+            "overrides": args.overrides,
+            "seed": args.seed,
+        },
+        "wall_time_s": round(wall_time, 3),
+        "statuses": statuses,
+        "failure_rate": round(1 - completed / len(results), 4) if results else 0.0,
+        "throughput_jobs_per_s": round(completed / wall_time, 4) if wall_time else 0.0,
+        "latency_s": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(max(latencies), 3) if latencies else math.nan,
+        },
+        "stage_mean_s": {stage: round(mean, 3) for stage, mean in sorted(stages.items())},
+        "upstream_calls": upstream_calls,
+        "upstream_calls_per_job": {
+            upstream: round(sum(outcomes.values()) / len(results), 2)
+            for upstream, outcomes in upstream_calls.items()
+        } if results else {},
+        "errors": errors[:10],
+    }
+
+
+def print_report(summary: Dict) -> None:
+    config = summary["config"]
+    print("=" * 60)
+    print("PERSPECTIVE PRISM OFFLINE LOAD TEST")
+    print("=" * 60)
+    print(f"Jobs: {config['jobs']}  concurrency: {config['concurrency']}  "
+          f"distinct videos: {config['distinct_videos']}  provider: {config['provider']}")
+    if config["cassette"]:
+        print(f"Replaying: {config['cassette']} (time scale {config['time_scale']})")
+    if config["overrides"]:
+        print(f"Overrides: {', '.join(config['overrides'])}")
+    print(f"\nWall time:   {summary['wall_time_s']:.2f}s")
+    print(f"Statuses:    {summary['statuses']}")
+    print(f"Throughput:  {summary['throughput_jobs_per_s']:.3f} jobs/s "
+          f"({summary['throughput_jobs_per_s'] * 60:.1f} jobs/min)")
+    latency = summary["latency_s"]
+    print(f"Job latency: p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s  "
+          f"p99 {latency['p99']:.2f}s  max {latency['max']:.2f}s")
+
+    if summary["stage_mean_s"]:
+        print("\nMean stage latency:")
+        for stage, mean in summary["stage_mean_s"].items():
+            print(f"  {stage:<22} {mean:8.3f}s")
+
+    print("\nUpstream calls:")
+    for upstream, outcomes in summary["upstream_calls"].items():
+        detail = ", ".join(f"{outcome}={count}" for outcome, count in outcomes.items())
+        per_job = summary["upstream_calls_per_job"][upstream]
+        print(f"  {upstream:<12} {sum(outcomes.values()):6d}  ({per_job:.2f}/job; {detail})")
+
+    if summary["errors"]:
+        print("\nErrors (first 10 distinct):")
+        for error in summary["errors"]:
+            print(f"  - {error}")
+    print("=" * 60)
+
+
+def check_thresholds(summary: Dict, args) -> List[str]:
+    failures = []
+    if args.min_throughput is not None and summary["throughput_jobs_per_s"] < args.min_throughput:
+        failures.append(f"throughput {summary['throughput_jobs_per_s']:.3f} jobs/s < {args.min_throughput}")
+    p95 = summary["latency_s"]["p95"]
+    if args.max_p95 is not None and not p95 <= args.max_p95:
+        failures.append(f"p95 latency {p95:.2f}s > {args.max_p95}s")
+    if args.max_failure_rate is not None and summary["failure_rate"] > args.max_failure_rate:
+        failures.append(f"failure rate {summary['failure_rate']:.2%} > {args.max_failure_rate:.2%}")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test against fake upstream APIs.")
+    parser.add_argument("--jobs", type=int, default=40, help="Total analysis jobs to run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Jobs in flight at once")
+    parser.add_argument("--distinct-videos", type=int, default=0,
+                        help="Cycle through this many video IDs (default: one per job)")
+    parser.add_argument("--provider", choices=("openai", "gemini"), default="openai")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="UPSTREAM.FIELD=VALUE",
+                        help="Override a latency/fault profile field, e.g. openai.median_ms=1500, "
+                             "google_cse.rate_limit_rate=0.05, *.distribution=fixed")
+    parser.add_argument("--cassette", help="Replay upstream responses from a recorded cassette (see cassettes.py) "
+                                           "instead of synthetic fakes; --set overrides are ignored")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Multiply recorded cassette latencies by this factor (0 = no delay)")
+    parser.add_argument("--transcript-segments", type=int, default=120)
+    parser.add_argument("--claims-per-video", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--poll-wait", type=float, default=25.0, help="Long-poll wait per status request")
+    parser.add_argument("--job-timeout", type=float, default=300.0)
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the backend's stdout")
+    parser.add_argument("--min-throughput", type=float, help="Fail if completed jobs/s is below this")
+    parser.add_argument("--max-p95", type=float, help="Fail if p95 job latency (s) is above this")
+    parser.add_argument("--max-failure-rate", type=float, help="Fail if the non-completed fraction is above this")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.cassette:
+        cassette = Cassette.load(args.cassette)
+        args.provider = cassette.provider
+        upstreams = Replayer(cassette, args.time_scale)
+        app = create_replay_app(upstreams)
+        video_pool = cassette.videos[: args.distinct_videos or None]
+    else:
+        profiles = default_profiles()
+        apply_overrides(profiles, args.overrides)
+        upstreams = FakeUpstreams(
+            profiles,
+            SyntheticResponder(args.transcript_segments, args.claims_per_video),
+            seed=args.seed,
+        )
+        app = create_app(upstreams)
+        video_pool = [f"lt{i:09d}" for i in range(args.distinct_videos or args.jobs)]
+    upstream_server = ServerThread(app)
+    upstream_url = upstream_server.start()
+
+    port = free_port()
+    backend_url = f"http://127.0.0.1:{port}"
+    backend = start_backend(port, upstream_url, args.provider, args.verbose)
+    try:
+        wait_for_backend(backend_url, backend)
+        video_ids = [video_pool[i % len(video_pool)] for i in range(args.jobs)]
+        results, wall_time = asyncio.run(
+            drive(backend_url, video_ids, args.concurrency, args.poll_wait, args.job_timeout)
+        )
+        stages = stage_means(httpx.get(f"{backend_url}/metrics", timeout=5.0).text)
+    finally:
+        backend.terminate()
+        backend.wait(timeout=10)
+        upstream_server.stop()
+
+    summary = summarize(results, wall_time, upstreams.call_counts(), stages, args)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+
+    failures = check_thresholds(summary, args)
+    for failure in failures:
+        print(f"THRESHOLD FAILED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
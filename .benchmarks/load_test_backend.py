@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Backend entry point used by load_test.py.
+
+Runs the Perspective Prism API under uvicorn with YouTube transcript requests
+redirected to the fake upstream server. The LLM and search upstreams are
+pointed at the fakes through the environment (OPENAI_BASE_URL,
+GEMINI_API_ENDPOINT, GOOGLE_SEARCH_BASE_URL), which load_test.py sets before
+starting this process.
+
+Usage:
+    python .benchmarks/load_test_backend.py --port 8000 --youtube-base-url http://127.0.0.1:8900
+"""
+
+import argparse
+import os
+import sys
+
+import requests
+import uvicorn
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+YOUTUBE_ORIGIN = "https://www.youtube.com"
+
+
+class RedirectingSession(requests.Session):
+    """requests.Session that sends youtube.com requests to another origin."""
+
+    def __init__(self, target_origin: str):
+        super().__init__()
+        self.target_origin = target_origin.rstrip("/")
+
+    def request(self, method, url, *args, **kwargs):
+        if isinstance(url, str) and url.startswith(YOUTUBE_ORIGIN):
+            url = self.target_origin + url[len(YOUTUBE_ORIGIN):]
+        return super().request(method, url, *args, **kwargs)
+
+
+def install_youtube_redirect(target_origin: str) -> None:
+    """Make ClaimExtractor fetch transcripts from target_origin instead of YouTube."""
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    from app.services import claim_extractor
+
+    claim_extractor.YouTubeTranscriptApi = lambda: YouTubeTranscriptApi(
+        http_client=RedirectingSession(target_origin)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API against fake upstreams.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--youtube-base-url", required=True)
+    args = parser.parse_args()
+
+    install_youtube_redirect(args.youtube_base_url)
+
+    from app.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Fixtures for the CPU micro-benchmarks: realistic transcripts, evidence text,
+LLM claim responses and a fully populated analysis result.
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+# Services validate credentials at construction; the benchmarks never call out
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ.setdefault("GOOGLE_CSE_ID", "benchmark")
+
+from app.models.schemas import (  # noqa: E402
+    Evidence,
+    PerspectiveType,
+    Transcript,
+    TranscriptSegment,
+)
+
+WORDS = (
+    "the study found that global average temperatures rose by about one "
+    "degree since preindustrial times according to researchers at several "
+    "universities who analysed satellite records ocean buoys and weather "
+    "stations while critics argued the data was incomplete"
+).split()
+
+
+def make_text(length: int, seed: int = 0) -> str:
+    """Clean prose of the given length (no early exit for the scanners)."""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < length:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + ". "
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)[:length]
+
+
+def make_transcript(minutes: int, seed: int = 0) -> Transcript:
+    """Caption-style transcript with one ~4 second segment per line."""
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    while start < minutes * 60:
+        duration = round(rng.uniform(2.0, 6.0), 2)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12)))
+        segments.append(TranscriptSegment(text=text, start=start, duration=duration))
+        start += duration
+    return Transcript(
+        video_id="benchmark01",
+        segments=segments,
+        full_text=" ".join(s.text for s in segments),
+    )
+
+
+@pytest.fixture(scope="session")
+def evidence_text():
+    return make_text(10_000)
+
+
+@pytest.fixture(scope="session")
+def oversized_text():
+    return make_text(100_000, seed=1)
+
+
+@pytest.fixture(scope="session")
+def short_transcript():
+    return make_transcript(10)
+
+
+@pytest.fixture(scope="session")
+def long_transcript():
+    return make_transcript(180, seed=1)
+
+
+@pytest.fixture(scope="session")
+def claims_json():
+    return json.dumps({
+        "claims": [
+            {
+                "text": make_text(160, seed=i),
+                "start_time": 30.0 * i,
+                "end_time": 30.0 * i + 12.5,
+                "context": make_text(400, seed=100 + i),
+            }
+            for i in range(7)
+        ]
+    })
+
+
+@pytest.fixture(scope="session")
+def search_items():
+    """Raw Custom Search items for 4 perspectives x 3 results."""
+    return [
+        (perspective, {
+            "link": f"https://example{i}.org/articles/{perspective.name.lower()}-{i}",
+            "title": make_text(70, seed=i),
+            "snippet": make_text(160, seed=50 + i),
+            "displayLink": f"example{i}.org",
+        })
+        for perspective in PerspectiveType
+        for i in range(3)
+    ]
+
+
+@pytest.fixture(scope="session")
+def evidence_by_perspective(search_items):
+    evidence = {}
+    for perspective, item in search_items:
+        evidence.setdefault(perspective, []).append(Evidence(
+            url=item["link"],
+            title=item["title"],
+            snippet=item["snippet"],
+            source=item["displayLink"],
+            perspective=perspective,
+        ))
+    return evidence
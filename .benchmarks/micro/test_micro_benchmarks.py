@@ -0,0 +1,131 @@
+"""
+CPU micro-benchmarks for the per-request hot paths that remain once upstream
+latency is cached away. Run through .benchmarks/micro_benchmarks.py, which
+compares against the committed baseline.
+"""
+
+import pytest
+
+from app.models.schemas import (
+    AnalysisMetadata,
+    AnalysisResponse,
+    BiasIndicators,
+    ClientClaimAnalysis,
+    ClientTruthProfile,
+    Evidence,
+    JobStatus,
+    JobStatusResponse,
+    PerspectiveAnalysis,
+)
+from app.services.claim_extractor import format_transcript, parse_claims
+from app.utils.transcript_compactor import compact_transcript
+from app.utils.input_sanitizer import (
+    MAX_EVIDENCE_LENGTH,
+    sanitize_evidence_text,
+    sanitize_input,
+)
+
+STANCES = ("Support", "Refute", "Ambiguous", "Support")
+
+
+class TestSanitizeInput:
+    # sanitize_input itself is not memoized; the field wrappers are
+    def test_evidence_sized_input(self, benchmark, evidence_text):
+        benchmark(sanitize_input, evidence_text, MAX_EVIDENCE_LENGTH, "evidence")
+
+    def test_oversized_input_truncated(self, benchmark, oversized_text):
+        benchmark(sanitize_input, oversized_text, MAX_EVIDENCE_LENGTH, "evidence")
+
+    def test_memoized_evidence_text(self, benchmark, evidence_text):
+        sanitize_evidence_text(evidence_text)
+        benchmark(sanitize_evidence_text, evidence_text)
+
+
+class TestTranscriptFormatting:
+    def test_ten_minute_transcript(self, benchmark, short_transcript):
+        benchmark(format_transcript, short_transcript, "gpt-3.5-turbo")
+
+    def test_three_hour_transcript(self, benchmark, long_transcript):
+        benchmark(format_transcript, long_transcript, "gpt-3.5-turbo")
+
+    def test_three_hour_transcript_large_context(self, benchmark, long_transcript):
+        benchmark(format_transcript, long_transcript, "gpt-4o")
+
+    def test_compact_three_hour_transcript(self, benchmark, long_transcript):
+        benchmark(compact_transcript, long_transcript)
+
+
+def test_parse_claims(benchmark, claims_json):
+    claims = benchmark(parse_claims, claims_json)
+    assert len(claims) == 7
+
+
+def _build_perspective_analyses(search_items):
+    evidence = {}
+    for perspective, item in search_items:
+        evidence.setdefault(perspective, []).append(Evidence(
+            url=item.get("link", ""),
+            title=item.get("title", ""),
+            snippet=item.get("snippet", ""),
+            source=item.get("displayLink", ""),
+            perspective=perspective,
+        ))
+    return [
+        PerspectiveAnalysis(
+            perspective=perspective,
+            stance=stance,
+            confidence=0.8,
+            explanation="The retrieved sources support the claim.",
+            evidence=items,
+        )
+        for (perspective, items), stance in zip(evidence.items(), STANCES)
+    ]
+
+
+def test_evidence_and_perspective_construction(benchmark, search_items):
+    analyses = benchmark(_build_perspective_analyses, search_items)
+    assert len(analyses) == 4
+
+
+@pytest.fixture(scope="module")
+def job_status_response(search_items):
+    claims = []
+    for i in range(3):
+        perspectives = {}
+        for analysis in _build_perspective_analyses(search_items):
+            entry = analysis.model_dump()
+            entry["assessment"] = analysis.stance
+            perspectives[analysis.perspective.value] = entry
+        claims.append(ClientClaimAnalysis(
+            claim_text=f"Claim {i}: global average temperatures rose by about one degree",
+            video_timestamp_start=30.0 * i,
+            video_timestamp_end=30.0 * i + 12.5,
+            truth_profile=ClientTruthProfile(
+                overall_assessment="Likely True",
+                perspectives=perspectives,
+                bias_indicators=BiasIndicators(deception_score=2.0),
+            ),
+        ))
+    result = AnalysisResponse(
+        video_id="benchmark01",
+        metadata=AnalysisMetadata(analyzed_at="2025-01-01T00:00:00+00:00"),
+        claims=claims,
+    )
+    return JobStatusResponse(job_id="job-1", status=JobStatus.COMPLETED, result=result)
+
+
+def test_analysis_response_serialization(benchmark, job_status_response):
+    body = benchmark(job_status_response.model_dump_json)
+    assert body.startswith('{"job_id":"job-1"')
+
+
+def _calibration_workload():
+    """Fixed pure-Python workload; other results are compared relative to it."""
+    table = {}
+    for i in range(2000):
+        table[f"key{i}"] = i * 3 % 7
+    return sum(value for key, value in table.items() if key.endswith("7"))
+
+
+def test_calibration(benchmark):
+    benchmark(_calibration_workload)
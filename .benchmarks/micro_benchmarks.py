@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+CPU Micro-Benchmarks for Perspective Prism
+
+Runs the pytest-benchmark suite in .benchmarks/micro (sanitization, transcript
+formatting, claim parsing, model construction and response serialization)
+and compares it against the committed baseline in .benchmarks/micro/baseline.json,
+failing when any benchmark regresses by more than the threshold.
+
+Each result is divided by the suite's calibration benchmark (a fixed
+pure-Python workload) before comparing, so the check tracks the cost of our
+code relative to the interpreter rather than the speed of the machine, and
+a baseline recorded on one machine stays usable on another. Shared or
+single-core runners are noisy; raise --threshold there rather than trusting
+a single run.
+
+Usage:
+    python .benchmarks/micro_benchmarks.py                  # compare, fail on >20% regression
+    python .benchmarks/micro_benchmarks.py --threshold 10 --stat median
+    python .benchmarks/micro_benchmarks.py --save-baseline  # after an intended change
+    python .benchmarks/micro_benchmarks.py -- -k transcript # extra pytest arguments
+
+Requires pytest-benchmark (pip install -r backend/requirements.txt).
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from typing import Dict
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(BENCHMARKS_DIR, "..", "backend")
+SUITE_DIR = os.path.join(BENCHMARKS_DIR, "micro")
+BASELINE = os.path.join(SUITE_DIR, "baseline.json")
+CALIBRATION = "test_calibration"
+STATS = ("min", "median", "mean")
+
+
+def run_suite(pytest_args) -> Dict[str, Dict[str, float]]:
+    """Run the suite and return {benchmark name: {stat: seconds}}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "results.json")
+        command = [
+            sys.executable, "-m", "pytest", SUITE_DIR,
+            "-c", os.path.join(BACKEND_DIR, "pyproject.toml"),
+            "--rootdir", BACKEND_DIR,
+            "-p", "no:cacheprovider",
+            "-q",
+            "--benchmark-only",
+            "--benchmark-sort=name",
+            "--benchmark-disable-gc",
+            "--benchmark-columns=min,median,mean,stddev,rounds",
+            f"--benchmark-json={output}",
+            *pytest_args,
+        ]
+        returncode = subprocess.call(command, cwd=BACKEND_DIR)
+        if returncode != 0:
+            raise SystemExit(returncode)
+        with open(output) as f:
+            data = json.load(f)
+    return {
+        bench["name"]: {stat: bench["stats"][stat] for stat in STATS}
+        for bench in data["benchmarks"]
+    }
+
+
+def relative(results: Dict[str, Dict[str, float]], stat: str) -> Dict[str, float]:
+    """Each benchmark's stat as a multiple of the calibration benchmark's."""
+    calibration = results[CALIBRATION][stat]
+    return {name: stats[stat] / calibration for name, stats in results.items() if name != CALIBRATION}
+
+
+def save_baseline(results: Dict[str, Dict[str, float]]) -> None:
+    with open(BASELINE, "w") as f:
+        json.dump({
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "benchmarks": results,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Saved baseline for {len(results)} benchmarks to {BASELINE}")
+
+
+def compare(results: Dict[str, Dict[str, float]], stat: str, threshold: float) -> int:
+    with open(BASELINE) as f:
+        baseline = json.load(f)["benchmarks"]
+    current = relative(results, stat)
+    previous = relative(baseline, stat)
+
+    print(f"\nRegression check ({stat}, relative to {CALIBRATION}, threshold {threshold:g}%):")
+    print(f"  {'benchmark':<46} {'baseline':>9} {'now':>9} {'change':>8}")
+    regressions = []
+    for name in sorted(current):
+        if name not in previous:
+            print(f"  {name:<46} {'-':>9} {current[name]:9.3f}      new")
+            continue
+        change = (current[name] / previous[name] - 1) * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<46} {previous[name]:9.3f} {current[name]:9.3f} {change:+7.1f}%{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {threshold:g}%.")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run CPU micro-benchmarks against the committed baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed regression in percent")
+    parser.add_argument("--stat", default="median", choices=STATS, help="Statistic compared against the baseline")
+    parser.add_argument("pytest_args", nargs="*", help="Extra arguments passed to pytest (after --)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.pytest_args)
+    if args.save_baseline:
+        save_baseline(results)
+        return 0
+    if not os.path.exists(BASELINE):
+        print(f"No baseline at {BASELINE}; run with --save-baseline first.", file=sys.stderr)
+        return 1
+    if CALIBRATION not in results:
+        print(f"{CALIBRATION} was not run; cannot compare against the baseline.", file=sys.stderr)
+        return 1
+    return compare(results, args.stat, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,14 +12,35 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-3.5-turbo"  # Default model, can be overridden via .env
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-pro"
+    GEMINI_API_ENDPOINT: str = ""  # Optional host override (proxy or local stand-in); forces REST transport
     LLM_PROVIDER: str = "openai"  # "openai" or "gemini"
+    LLM_STRUCTURED_OUTPUT: str = "auto"  # Send JSON schemas with requests: "auto" (by model), "true" or "false"
+    TRANSCRIPT_MAX_TOKENS: int = 0  # Cap on transcript tokens per extraction prompt; 0 = model context window
+    TRANSCRIPT_COMPACTION: bool = True  # Merge caption segments into deduplicated sentences before extraction
+    TRANSCRIPT_TIMESTAMP_INTERVAL: float = 30.0  # Seconds between timestamps in compacted transcripts
+    CLAIM_DEDUP_THRESHOLD: float = 0.6  # TF-IDF cosine at which claims in one video are merged; 0 disables
+    CLAIM_INDEX_PATH: str = ""  # SQLite file for reusing truth profiles across videos; empty disables
+    CLAIM_INDEX_SIMILARITY: float = 0.8  # Term Jaccard similarity needed to reuse a stored claim
+    CLAIM_INDEX_MAX_AGE_HOURS: float = 168.0  # Stored profiles older than this are re-analyzed
     GOOGLE_API_KEY: str = ""
     GOOGLE_CSE_ID: str = ""
+    GOOGLE_SEARCH_BASE_URL: str = "https://www.googleapis.com/customsearch/v1"
     GOOGLE_SEARCH_TIMEOUT: float = (
         10.0  # Timeout in seconds for Google Search API requests
     )
     GOOGLE_SEARCH_MAX_CONCURRENT: int = 3  # Max concurrent Google Search API requests
-    SEARCH_PROVIDER: str = "google"
+    SEARCH_PROVIDER: str = "google"  # "google", "local" (offline index only) or "local+google" (index first)
+    EVIDENCE_INDEX_PATH: str = "evidence_index.sqlite3"  # SQLite FTS5 index used by the local providers
+    EVIDENCE_DEDUP: bool = True  # Canonicalize evidence URLs and drop cross-perspective duplicates before analysis
+    EVIDENCE_MIN_RELEVANCE: float = 0.1  # TF-IDF cosine to the claim below which evidence is dropped; 0 disables
+    SEARCH_STRATEGY: str = "per_perspective"  # "per_perspective", "combined" (one broad query, bucketed) or "sharded" (all domains)
+    JOB_DEADLINE_SECONDS: float = 120.0  # Time budget per analysis job; unfinished claims come back timed out; 0 disables
+    RESULT_CACHE_SIZE: int = 256  # Completed analyses kept by video ID for instant repeat/prefetched jobs
+    RESULT_CACHE_TTL_SECONDS: float = 3600.0  # Cached analyses older than this are re-run
+    PREFETCH_QUEUE_SIZE: int = 50  # Max videos waiting in the POST /analyze/prefetch queue; 0 disables prefetch
+    JOB_LONG_POLL_MAX_WAIT: float = 30.0  # Upper bound in seconds for GET /analyze/jobs/{id}?wait=
+    OTLP_TRACES_ENDPOINT: str = ""  # e.g. http://localhost:4318/v1/traces; empty disables export
+    OTLP_EXPORT_TIMEOUT: float = 5.0  # Timeout in seconds for exporting a job trace
     BACKEND_CORS_ORIGINS: list[str] | str = [
         "http://localhost:5173",
         "http://localhost:3000",
@@ -0,0 +1,147 @@
+"""
+Per-job deadlines.
+
+Each job runs under a Deadline (JOB_DEADLINE_SECONDS). Like the trace, the
+active deadline lives in a context variable, so every stage and upstream
+call made on behalf of the job sees it without threading it through
+signatures:
+
+- stage_deadline() runs a pipeline stage under a sub-deadline (a share of
+  the job's total budget or a fixed number of seconds, never past the job's
+  own expiry) and raises DeadlineExceeded when it passes;
+- time_left() caps an upstream call's timeout at the remaining time.
+
+Without an active deadline both are no-ops.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+
+# Share of the job's total budget each pre-claim stage may use; claims split what is left
+STAGE_BUDGET_SHARES = {
+    "transcript_fetch": 0.15,
+    "claim_extraction": 0.4,
+}
+
+# Upstream timeouts never drop below this, so a nearly spent deadline still
+# fails through the stage timeout rather than a zero-second client timeout
+MIN_UPSTREAM_TIMEOUT = 0.1
+
+
+class DeadlineExceeded(Exception):
+    """A stage ran past its share of the job's deadline."""
+
+
+class Deadline:
+    def __init__(self, seconds: float, expires_at: Optional[float] = None):
+        self.total = seconds
+        self.expires_at = expires_at if expires_at is not None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def sub(self, seconds: float) -> "Deadline":
+        """A deadline seconds from now, or this one if it expires sooner."""
+        return Deadline(seconds, min(self.expires_at, time.monotonic() + seconds))
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def activate_deadline(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make deadline the active deadline for code running in this context."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def adopt_deadline(deadline: Optional[Deadline]) -> None:
+    """
+    Make deadline active for the rest of the current task, if none is.
+
+    For jobs that start without a deadline and are given one later (a
+    promoted prefetch job). Call it between stages, not inside one; the
+    job's own activate_deadline() still restores the outer value.
+    """
+    if deadline is not None and current_deadline() is None:
+        _current_deadline.set(deadline)
+
+
+def time_left(default: float) -> float:
+    """default, capped at the active deadline's remaining time."""
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    return max(MIN_UPSTREAM_TIMEOUT, min(default, deadline.remaining()))
+
+
+def fair_share(parts: int) -> Optional[float]:
+    """The active deadline's remaining time split evenly over parts, or None without one."""
+    deadline = current_deadline()
+    if deadline is None:
+        return None
+    return deadline.remaining() / max(1, parts)
+
+
+@asynccontextmanager
+async def stage_deadline(
+    stage: str,
+    seconds: Optional[float] = None,
+    share: Optional[float] = None,
+) -> AsyncIterator[Optional[Deadline]]:
+    """
+    Run a block under a sub-deadline of the active deadline.
+
+    The budget is seconds, else share of the job's total budget, else
+    whatever remains; it never extends past the active deadline.
+
+    Raises:
+        DeadlineExceeded: If the budget runs out (or already has)
+    """
+    parent = current_deadline()
+    if parent is None:
+        yield None
+        return
+
+    if seconds is None:
+        seconds = parent.total * share if share is not None else parent.remaining()
+    deadline = parent.sub(seconds)
+    if deadline.expired:
+        raise DeadlineExceeded(f"{stage} skipped: job deadline already passed")
+
+    # Cancel the running task when the budget runs out (asyncio.timeout is 3.11+ only)
+    task = asyncio.current_task()
+    expired = False
+
+    def expire() -> None:
+        nonlocal expired
+        expired = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(deadline.remaining(), expire)
+    with activate_deadline(deadline):
+        try:
+            yield deadline
+        except asyncio.CancelledError as e:
+            if not expired:
+                raise
+            # Only our own cancellation becomes DeadlineExceeded; keep the task's cancel count straight
+            if hasattr(task, "uncancel"):
+                task.uncancel()
+            raise DeadlineExceeded(f"{stage} exceeded its {seconds:.1f}s budget") from e
+        finally:
+            handle.cancel()
@@ -0,0 +1,328 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+
+Metrics are plain counters, gauges and histograms kept in memory and exposed
+at GET /metrics. They cover per-stage pipeline latency, upstream (LLM and
+search) call counts and latency, rate-limit responses, job queue depth and
+cache effectiveness.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upstream calls range from ~100ms searches to multi-minute LLM completions
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+    return f"{{{inner}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        return list(zip(self.labelnames, key))
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> ([count per bucket], sum, count)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(labels + [("le", _format_value(upper_bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Pipeline stages: transcript_fetch, claim_extraction, evidence_retrieval,
+# perspective_analysis, bias_analysis and the end-to-end job ("total")
+STAGE_DURATION = registry.histogram(
+    "perspective_prism_stage_duration_seconds",
+    "Time spent in each analysis pipeline stage.",
+    ["stage"],
+)
+JOBS_FINISHED = registry.counter(
+    "perspective_prism_jobs_finished_total",
+    "Analysis jobs that reached a terminal state.",
+    ["status"],
+)
+JOBS_IN_QUEUE = registry.gauge(
+    "perspective_prism_jobs",
+    "Analysis jobs currently held in the job store, by status.",
+    ["status"],
+)
+CLAIMS_TIMED_OUT = registry.counter(
+    "perspective_prism_claims_timed_out_total",
+    "Claims returned unanalyzed because their job's deadline passed.",
+)
+LLM_CALLS = registry.counter(
+    "perspective_prism_llm_calls_total",
+    "LLM API calls by service, provider and outcome.",
+    ["service", "provider", "outcome"],
+)
+LLM_CALL_DURATION = registry.histogram(
+    "perspective_prism_llm_call_duration_seconds",
+    "Latency of LLM API calls.",
+    ["service", "provider"],
+)
+LLM_TOKENS = registry.counter(
+    "perspective_prism_llm_tokens_total",
+    "LLM tokens by service, provider and kind (prompt, cached_prompt, completion).",
+    ["service", "provider", "kind"],
+)
+LLM_OUTPUT_REPAIRS = registry.counter(
+    "perspective_prism_llm_output_repairs_total",
+    "Repair calls made for LLM responses that failed schema validation, by outcome.",
+    ["service", "output", "outcome"],
+)
+SEARCH_CALLS = registry.counter(
+    "perspective_prism_search_calls_total",
+    "Search API calls by provider and outcome.",
+    ["provider", "outcome"],
+)
+SEARCH_CALL_DURATION = registry.histogram(
+    "perspective_prism_search_call_duration_seconds",
+    "Latency of search API calls.",
+    ["provider"],
+)
+UPSTREAM_RATE_LIMITED = registry.counter(
+    "perspective_prism_upstream_rate_limited_total",
+    "HTTP 429 / quota-exhausted responses from upstream APIs.",
+    ["upstream"],
+)
+CACHE_LOOKUPS = registry.gauge(
+    "perspective_prism_cache_lookups",
+    "Lookups served by in-process caches since startup, by cache and result.",
+    ["cache", "result"],
+)
+CACHE_HIT_RATIO = registry.gauge(
+    "perspective_prism_cache_hit_ratio",
+    "Fraction of cache lookups that were hits, by cache.",
+    ["cache"],
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an upstream SDK exception represents an HTTP 429 / quota error."""
+    # openai.RateLimitError exposes status_code; google.api_core errors expose code
+    return getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429
+
+
+def record_llm_call(service: str, provider: str, duration: float, error: Optional[BaseException] = None) -> None:
+    """Record the outcome and latency of one LLM API call."""
+    if error is None:
+        outcome = "success"
+    elif is_rate_limit_error(error):
+        outcome = "rate_limited"
+        UPSTREAM_RATE_LIMITED.inc(upstream=provider)
+    else:
+        outcome = "error"
+    LLM_CALLS.inc(service=service, provider=provider, outcome=outcome)
+    LLM_CALL_DURATION.observe(duration, service=service, provider=provider)
+
+
+def record_llm_tokens(service: str, provider: str, usage: Dict[str, int]) -> None:
+    """
+    Record the token counts of one LLM response.
+
+    usage is keyed like the span attributes set by annotate_llm_usage
+    ("llm.prompt_tokens", "llm.cached_prompt_tokens", "llm.completion_tokens");
+    cached_prompt against prompt is the provider's prefix-cache hit rate.
+    """
+    for key, value in usage.items():
+        LLM_TOKENS.inc(value, service=service, provider=provider, kind=key[len("llm."):-len("_tokens")])
+
+
+def record_llm_repair(service: str, output: str, outcome: str) -> None:
+    """Record a repair call for an off-schema LLM response ("repaired" or "failed")."""
+    LLM_OUTPUT_REPAIRS.inc(service=service, output=output, outcome=outcome)
+
+
+def record_cache_stats(cache: str, hits: int, misses: int) -> None:
+    """Publish a cache's cumulative hit/miss counts and hit ratio."""
+    CACHE_LOOKUPS.set(hits, cache=cache, result="hit")
+    CACHE_LOOKUPS.set(misses, cache=cache, result="miss")
+    lookups = hits + misses
+    CACHE_HIT_RATIO.set(hits / lookups if lookups else 0.0, cache=cache)
@@ -0,0 +1,119 @@
+"""
+Interactive vs. background (prefetch) job priority.
+
+Interactive jobs register with the PriorityGate while they run. Background
+jobs call yield_to_interactive() before each upstream request (LLM, Custom
+Search, transcript fetch) and wait there while any interactive job is
+running, so prefetching only uses spare capacity. Requests already in flight
+finish; the next one waits.
+
+A job's priority lives in a context variable like its trace and deadline. A
+background job can be promoted (the user opened the video it is
+prefetching), after which it stops yielding and, from its next stage on,
+runs under the deadline it was promoted with.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from app.core.deadline import Deadline, adopt_deadline
+
+
+class JobPriority:
+    def __init__(self, interactive: bool):
+        self.interactive = interactive
+        # Whether the job is running, and whether it counts towards the gate
+        self.running = False
+        self.registered = False
+        # Deadline given on promotion; background jobs otherwise run without one
+        self.deadline: Optional[Deadline] = None
+
+    def _register(self) -> None:
+        if not self.registered:
+            self.registered = True
+            priority_gate.interactive_started()
+
+
+class PriorityGate:
+    """Counts running interactive jobs and holds background work while there are any."""
+
+    def __init__(self):
+        self.active = 0
+        # Plain futures rather than an Event, so the gate isn't bound to one event loop
+        self._waiters: List[asyncio.Future] = []
+
+    def interactive_started(self) -> None:
+        self.active += 1
+
+    def interactive_finished(self) -> None:
+        self.active -= 1
+        if self.active == 0:
+            self.wake()
+
+    def wake(self) -> None:
+        """Let waiting background work re-check whether it may proceed."""
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait_idle(self, priority: JobPriority) -> None:
+        """Wait until no interactive job is running, or priority is promoted."""
+        while self.active and not priority.interactive:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+
+priority_gate = PriorityGate()
+
+_current_priority: ContextVar[Optional[JobPriority]] = ContextVar("current_priority", default=None)
+
+
+@contextmanager
+def activate_priority(priority: JobPriority) -> Iterator[JobPriority]:
+    """Run a job at priority; interactive jobs hold back background work until they finish."""
+    token = _current_priority.set(priority)
+    priority.running = True
+    if priority.interactive:
+        priority._register()
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(token)
+        priority.running = False
+        if priority.registered:
+            priority.registered = False
+            priority_gate.interactive_finished()
+
+
+def promote(priority: JobPriority, deadline: Optional[Deadline] = None) -> None:
+    """
+    Make a background job interactive; it stops yielding and holds back other background work.
+
+    A running job picks up deadline at its next stage (see adopt_promoted_deadline).
+    """
+    if priority.interactive:
+        return
+    priority.interactive = True
+    priority.deadline = deadline
+    # A job that hasn't started yet registers when it does
+    if priority.running:
+        priority._register()
+    priority_gate.wake()
+
+
+async def yield_to_interactive() -> None:
+    """Wait while interactive jobs are running, if the current job is background work."""
+    priority = _current_priority.get()
+    if priority is not None and not priority.interactive:
+        await priority_gate.wait_idle(priority)
+
+
+def adopt_promoted_deadline() -> None:
+    """Put the current job under the deadline it was promoted with, if it has none yet."""
+    priority = _current_priority.get()
+    if priority is not None:
+        adopt_deadline(priority.deadline)
@@ -0,0 +1,247 @@
+"""
+In-process tracing of analysis jobs.
+
+Each job carries a Trace; code running on behalf of the job opens spans with
+start_span(). The active trace and parent span live in context variables, so
+spans opened inside asyncio tasks (e.g. the per-perspective gather) nest under
+the span that was active when the task was created. Outside an active trace,
+start_span() is a cheap no-op.
+
+Traces are served at GET /analyze/jobs/{job_id}/trace and can be exported as
+OTLP/JSON to a local collector (see OTLP_TRACES_ENDPOINT).
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "perspective-prism"
+
+# OTLP span kind INTERNAL and status codes
+_OTLP_SPAN_KIND_INTERNAL = 1
+_OTLP_STATUS_OK = 1
+_OTLP_STATUS_ERROR = 2
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._start_perf = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_time_ns is None:
+            self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+            self.end_time_ns = self.start_time_ns + int(self.duration_ms * 1_000_000)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_offset_ms": round((self.start_time_ns - self.trace.start_time_ns) / 1_000_000, 3),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded by start_span() when no trace is active."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """All spans recorded for one analysis job."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.trace_id = os.urandom(16).hex()
+        self.start_time_ns = time.time_ns()
+        self.spans: List[Span] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Span timeline ordered by start time, for GET /analyze/jobs/{job_id}/trace."""
+        spans = sorted(self.spans, key=lambda span: span.start_time_ns)
+        return {
+            "job_id": self.job_id,
+            "trace_id": self.trace_id,
+            "spans": [span.to_dict() for span in spans],
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode finished spans as an OTLP/JSON ExportTraceServiceRequest."""
+        otlp_spans = []
+        for span in self.spans:
+            if span.end_time_ns is None:
+                continue
+            status = {"code": _OTLP_STATUS_ERROR if span.status == "error" else _OTLP_STATUS_OK}
+            if span.error:
+                status["message"] = span.error
+            otlp_spans.append({
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": _OTLP_SPAN_KIND_INTERNAL,
+                "startTimeUnixNano": str(span.start_time_ns),
+                "endTimeUnixNano": str(span.end_time_ns),
+                "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+                "status": status,
+            })
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        _otlp_attribute("service.name", SERVICE_NAME),
+                        _otlp_attribute("job.id", self.job_id),
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def activate_trace(trace: Trace) -> Iterator[Trace]:
+    """Make trace the active trace for the enclosed block (and tasks created in it)."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Record a span around the enclosed block under the active trace.
+
+    Yields the span so callers can attach attributes (token counts, result
+    sizes, cache status). Exceptions are recorded on the span and re-raised.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    span = Span(trace, name, parent.span_id if parent else None, attributes)
+    trace.spans.append(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def current_span() -> Any:
+    """The innermost active span, or a no-op span outside a trace."""
+    return _current_span.get() or _NOOP_SPAN
+
+
+async def export_otlp(trace: Trace, endpoint: str, timeout: float) -> None:
+    """
+    POST a trace as OTLP/JSON to a collector (e.g. http://localhost:4318/v1/traces).
+
+    Best effort: failures are logged and never affect the job.
+    """
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(endpoint, json=trace.to_otlp())
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning("Failed to export trace for job %s to %s: %s", trace.job_id, endpoint, e)
+
+
+def annotate_llm_usage(span: Any, response: Any) -> Dict[str, int]:
+    """
+    Attach token counts from an OpenAI or Gemini response to a span.
+
+    Missing usage fields (older SDKs, mocked clients) are skipped.
+
+    Returns:
+        The counts that were found, keyed by span attribute name
+    """
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        # OpenAI chat completions
+        details = getattr(usage, "prompt_tokens_details", None)
+        counts = {
+            "llm.prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "llm.completion_tokens": getattr(usage, "completion_tokens", None),
+            "llm.cached_prompt_tokens": getattr(details, "cached_tokens", None),
+        }
+    else:
+        # Gemini generate_content
+        usage = getattr(response, "usage_metadata", None)
+        counts = {
+            "llm.prompt_tokens": getattr(usage, "prompt_token_count", None),
+            "llm.completion_tokens": getattr(usage, "candidates_token_count", None),
+            "llm.cached_prompt_tokens": getattr(usage, "cached_content_token_count", None),
+        }
+    found = {
+        key: value for key, value in counts.items() if isinstance(value, int) and not isinstance(value, bool)
+    }
+    for key, value in found.items():
+        span.set_attribute(key, value)
+    return found
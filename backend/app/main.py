@@ -1,18 +1,44 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
+from app.core.deadline import (
+    STAGE_BUDGET_SHARES, Deadline, DeadlineExceeded, activate_deadline, fair_share, stage_deadline
+)
+from app.core.metrics import (
+    CLAIMS_TIMED_OUT, JOBS_FINISHED, JOBS_IN_QUEUE, STAGE_DURATION, record_cache_stats, registry as metrics_registry
+)
+from app.core.priority import (
+    JobPriority, activate_priority, adopt_promoted_deadline, promote, yield_to_interactive
+)
+from app.core.tracing import Trace, activate_trace, current_span, export_otlp, start_span
 from app.models.schemas import (
     VideoRequest, AnalysisResponse, TruthProfile, PerspectiveType,
-    JobResponse, JobStatusResponse, JobStatus,
-    AnalysisMetadata, ClientClaimAnalysis, ClientTruthProfile, BiasIndicators
+    JobResponse, JobStatusResponse, JobStatus, PrefetchRequest, PrefetchResponse,
+    AnalysisMetadata, ClientClaimAnalysis, ClientTruthProfile, BiasIndicators, Claim
 )
 from app.services.claim_extractor import ClaimExtractor
 from app.services.evidence_retriever import EvidenceRetriever
+from app.services.local_evidence_index import LocalEvidenceIndex
+from app.services.search_provider import SearchProvider, TieredSearchProvider
 from app.services.analysis_service import AnalysisService
+from app.services.claim_index import ClaimIndex
+from app.utils.claim_dedup import dedupe_claims
+from app.utils.claim_scheduler import schedule_claims
+from app.utils.evidence_canonicalizer import dedupe_evidence
+from app.utils.evidence_relevance import filter_relevant_evidence
+from app.utils.http_cache import compute_etag, etag_matches
+from app.utils.input_sanitizer import get_sanitization_cache_stats
+from app.utils.result_cache import ResultCache
+from app.utils.transcript_compactor import compact_transcript
+from app.utils.transcript_packer import load_token_counter
 import asyncio
 import logging
+import time
 import uuid
-from typing import Dict, Any, Optional
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Any, Iterator, List, Optional
 from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
@@ -27,20 +53,115 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
+def create_search_provider(provider: str) -> SearchProvider:
+    """
+    Builds the evidence search provider selected by SEARCH_PROVIDER:
+    "google", "local" (offline, local index only) or "local+google"
+    (local index first, Google for the gaps, written back to the index).
+    """
+    provider = provider.lower()
+    if provider == "google":
+        return EvidenceRetriever()
+    if provider == "local":
+        return LocalEvidenceIndex(settings.EVIDENCE_INDEX_PATH)
+    if provider == "local+google":
+        local_index = LocalEvidenceIndex(settings.EVIDENCE_INDEX_PATH)
+        return TieredSearchProvider([local_index, EvidenceRetriever()], write_through=local_index)
+    raise ValueError(f"Unsupported SEARCH_PROVIDER: {provider}")
+
+
 # Initialize services
 claim_extractor = ClaimExtractor()
-evidence_retriever = EvidenceRetriever()
+evidence_retriever = create_search_provider(settings.SEARCH_PROVIDER)
 analysis_service = AnalysisService()
+# Cross-video reuse of per-claim truth profiles (disabled unless CLAIM_INDEX_PATH is set)
+claim_index = ClaimIndex(
+    settings.CLAIM_INDEX_PATH,
+    similarity_threshold=settings.CLAIM_INDEX_SIMILARITY,
+    max_age_seconds=settings.CLAIM_INDEX_MAX_AGE_HOURS * 3600,
+) if settings.CLAIM_INDEX_PATH else None
+# Completed results by video ID, filled by interactive and prefetch jobs alike. Only
+# results analyzed without a playback position are cached: with one, which claims
+# are kept depends on the position (see schedule_claims)
+result_cache = ResultCache(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL_SECONDS)
+
+# Videos waiting to be prefetched (oldest first), the task analyzing them one
+# at a time, and in-flight prefetch jobs by video ID so an interactive request
+# for the same video can take the job over
+prefetch_queue: Deque[str] = deque()
+prefetch_task: Optional[asyncio.Task] = None
+prefetch_jobs: Dict[str, str] = {}
 
 
 # Job Store (In-memory for MVP)
-# Structure: {job_id: {"status": JobStatus, "result": AnalysisResponse | None, "error": str | None, "created_at": datetime}}
+# Structure: {job_id: {"status": JobStatus, "result": AnalysisResponse | None, "error": str | None, "created_at": datetime,
+#                      "response_body": bytes | None, "etag": str | None, "partial_body": bytes | None,
+#                      "status_changed": asyncio.Event, "trace": Trace, "priority": JobPriority}}
+# "response_body"/"etag" are filled in once a job reaches a terminal state (see finalize_job).
+# "partial_body" is the pre-serialized in-flight response, refreshed on each publish_partial_result.
+# "status_changed" is set (and replaced) on every status transition, and whenever newly analyzed
+# claims are published to an in-flight job's "result", to wake long-poll requests.
 jobs: Dict[str, Dict[str, Any]] = {}
 jobs_lock = asyncio.Lock()
 
+# Completed results are immutable for the lifetime of the job (cleaned up after 1 hour)
+COMPLETED_JOB_CACHE_CONTROL = "private, max-age=3600, immutable"
+# Failed jobs don't change either, but clients should revalidate so a retry isn't masked
+FAILED_JOB_CACHE_CONTROL = "no-cache"
+IN_FLIGHT_JOB_CACHE_CONTROL = "no-store"
+
+
+def new_job(job_id: str, priority: JobPriority) -> Dict[str, Any]:
+    """
+    A fresh pending job entry for the job store.
+    """
+    return {
+        "status": JobStatus.PENDING,
+        "result": None,
+        "error": None,
+        "created_at": datetime.now(timezone.utc),
+        "response_body": None,
+        "etag": None,
+        "partial_body": None,
+        "status_changed": asyncio.Event(),
+        "trace": Trace(job_id),
+        "priority": priority
+    }
+
+
+def finalize_job(job_id: str, job: Dict[str, Any]) -> None:
+    """
+    Serialize a terminal job's status response once and store it with its ETag.
+
+    Must be called with jobs_lock held, after status/result/error are set.
+    Subsequent polls serve these bytes directly instead of re-validating and
+    re-serializing the nested AnalysisResponse on every request.
+    """
+    body = JobStatusResponse(
+        job_id=job_id,
+        status=job["status"],
+        result=job["result"],
+        error=job["error"]
+    ).model_dump_json().encode("utf-8")
+    job["response_body"] = body
+    job["etag"] = compute_etag(body)
+
+
+def notify_job_update(job: Dict[str, Any]) -> None:
+    """
+    Wake every long-poll request waiting on this job.
+
+    Must be called with jobs_lock held, after the job's fields are updated.
+    The event is swapped for a fresh one so later waiters block until the
+    next transition.
+    """
+    job["status_changed"].set()
+    job["status_changed"] = asyncio.Event()
+
 @app.get("/")
 def read_root():
     return {"message": f"Welcome to {settings.PROJECT_NAME} API"}
@@ -49,6 +170,29 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Exposes in-process metrics in the Prometheus text format.
+    """
+    async with jobs_lock:
+        status_counts = {status: 0 for status in JobStatus}
+        for job in jobs.values():
+            status_counts[job["status"]] += 1
+    for status, count in status_counts.items():
+        JOBS_IN_QUEUE.set(count, status=status.value)
+
+    sanitization_stats = get_sanitization_cache_stats()
+    record_cache_stats("sanitization", sanitization_stats["hits"], sanitization_stats["misses"])
+    if claim_index is not None:
+        record_cache_stats("claim_index", claim_index.hits, claim_index.misses)
+    record_cache_stats("analysis_results", result_cache.hits, result_cache.misses)
+
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 async def cleanup_jobs():
     """
     Background task to clean up old jobs.
@@ -68,6 +212,10 @@ async def cleanup_jobs():
                 
                 if jobs_to_remove:
                     logger.info(f"Cleaned up {len(jobs_to_remove)} old jobs")
+            if claim_index is not None:
+                pruned = claim_index.prune()
+                if pruned:
+                    logger.info(f"Pruned {pruned} stale claim index entries")
         except asyncio.CancelledError:
             logger.info("Cleanup jobs task cancelled")
             raise
@@ -77,15 +225,205 @@ async def cleanup_jobs():
 @app.on_event("startup")
 async def startup_event():
     asyncio.create_task(cleanup_jobs())
+    # Fetch the tokenizer before the first job needs it
+    asyncio.create_task(load_token_counter(claim_extractor.model))
+
+@contextmanager
+def pipeline_stage(stage: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Time a pipeline stage into the stage histogram and record it as a trace span.
+    """
+    with STAGE_DURATION.time(stage=stage), start_span(stage, **attributes) as span:
+        yield span
+
+async def analyze_perspective_traced(claim, perspective: PerspectiveType, evidence) -> Any:
+    """
+    Runs one perspective analysis inside its own span so slow perspectives stand out in the trace.
+    """
+    with start_span(
+        "analyze_perspective",
+        claim_id=claim.id,
+        perspective=perspective.value,
+        evidence_count=len(evidence)
+    ) as span:
+        analysis = await analysis_service.analyze_perspective(claim, perspective, evidence)
+        span.set_attribute("stance", analysis.stance)
+        return analysis
 
 async def process_analysis(job_id: str, request: VideoRequest):
     """
-    Background task to process the video analysis.
+    Background task to process the video analysis under the job's trace.
+    """
+    async with jobs_lock:
+        trace = jobs[job_id]["trace"] if job_id in jobs else Trace(job_id)
+        priority = jobs[job_id].get("priority") if job_id in jobs else None
+    priority = priority or JobPriority(interactive=True)
+    # Prefetch jobs spend most of their time waiting behind interactive ones, so they run without a
+    # deadline until promoted
+    deadline = (
+        Deadline(settings.JOB_DEADLINE_SECONDS)
+        if settings.JOB_DEADLINE_SECONDS > 0 and priority.interactive else None
+    )
+
+    with activate_trace(trace), activate_deadline(deadline), activate_priority(priority):
+        with start_span(
+            "analysis_job",
+            job_id=job_id,
+            url=str(request.url),
+            priority="interactive" if priority.interactive else "prefetch"
+        ) as span:
+            await run_analysis(job_id, request)
+            async with jobs_lock:
+                if job_id in jobs:
+                    span.set_attribute("job.status", jobs[job_id]["status"].value)
+
+    if settings.OTLP_TRACES_ENDPOINT:
+        await export_otlp(trace, settings.OTLP_TRACES_ENDPOINT, settings.OTLP_EXPORT_TIMEOUT)
+
+async def analyze_claim(claim) -> ClientTruthProfile:
+    """
+    Retrieves evidence for a claim and runs the perspective and bias analyses into a truth profile.
+    """
+    # 3. Retrieve Evidence (Parallelize perspectives)
+    perspectives = [
+        PerspectiveType.SCIENTIFIC,
+        PerspectiveType.JOURNALISTIC,
+        PerspectiveType.PARTISAN_LEFT,
+        PerspectiveType.PARTISAN_RIGHT
+    ]
+    
+    with pipeline_stage("evidence_retrieval", claim_id=claim.id, claim_text=claim.text[:80]):
+        evidence_results = await evidence_retriever.retrieve_evidence(claim, perspectives)
+    
+    # The same story often comes back under several perspectives (AMP variants, wire copies)
+    if settings.EVIDENCE_DEDUP:
+        with pipeline_stage("evidence_dedup", claim_id=claim.id) as span:
+            retrieved = sum(len(items) for items in evidence_results.values())
+            evidence_results = dedupe_evidence(evidence_results)
+            span.set_attribute("evidence.dropped", retrieved - sum(len(items) for items in evidence_results.values()))
+    
+    # Drop off-topic snippets so they don't reach the prompts (or cost an LLM call when none remain)
+    if settings.EVIDENCE_MIN_RELEVANCE > 0:
+        with pipeline_stage("evidence_filtering", claim_id=claim.id) as span:
+            retrieved = sum(len(items) for items in evidence_results.values())
+            evidence_results = filter_relevant_evidence(claim.text, evidence_results, settings.EVIDENCE_MIN_RELEVANCE)
+            span.set_attribute("evidence.dropped", retrieved - sum(len(items) for items in evidence_results.values()))
+    
+    # 4. Analyze Perspectives (Parallelize analysis)
+    perspective_analyses = []
+    analysis_tasks = []
+    
+    for perspective in perspectives:
+        evidence = evidence_results.get(perspective, [])
+        analysis_tasks.append(
+            analyze_perspective_traced(claim, perspective, evidence)
+        )
+    
+    with pipeline_stage("perspective_analysis", claim_id=claim.id):
+        perspective_analyses = await asyncio.gather(*analysis_tasks)
+    
+    # 5. Analyze Bias and Deception
+    with pipeline_stage("bias_analysis", claim_id=claim.id):
+        bias_analysis = await analysis_service.analyze_bias_and_deception(claim)
+    
+    # 6. Construct Truth Profile
+    # Simple overall assessment logic for MVP
+    overall_assessment = "Mixed"
+    support_count = sum(1 for p in perspective_analyses if p.stance == "Support")
+    refute_count = sum(1 for p in perspective_analyses if p.stance == "Refute")
+    
+    if support_count > refute_count and support_count >= 2:
+        overall_assessment = "Likely True"
+    elif refute_count > support_count and refute_count >= 2:
+        overall_assessment = "Likely False"
+    elif bias_analysis.deception_rating > 7:
+        overall_assessment = "Suspicious/Deceptive"
+        
+    # Map to ClientClaimAnalysis
+    client_perspectives = {}
+    for p in perspective_analyses:
+        # Convert to dict and add 'assessment' field for UI compatibility
+        p_dict = p.dict()
+        p_dict['assessment'] = p.stance  # UI expects 'assessment'
+        client_perspectives[p.perspective.value] = p_dict
+    
+    bias_indicators = BiasIndicators(
+        logical_fallacies=[], # MVP placeholder
+        emotional_manipulation=[], # MVP placeholder
+        deception_score=bias_analysis.deception_rating
+    )
+    
+    return ClientTruthProfile(
+        overall_assessment=overall_assessment,
+        perspectives=client_perspectives,
+        bias_indicators=bias_indicators
+    )
+
+async def publish_partial_result(job_id: str, video_id: str, claims: list) -> None:
+    """
+    Expose the claims analyzed so far on an in-flight job and wake its long-poll requests.
+
+    The status response is serialized here, once per publish, like finalize_job
+    does for terminal jobs, so polls don't rebuild it.
+    """
+    result = AnalysisResponse(
+        video_id=video_id,
+        metadata=AnalysisMetadata(
+            analyzed_at=datetime.now(timezone.utc).isoformat(),
+            partial=True
+        ),
+        claims=list(claims)
+    )
+    async with jobs_lock:
+        if job_id in jobs and jobs[job_id]["status"] == JobStatus.PROCESSING:
+            jobs[job_id]["result"] = result
+            jobs[job_id]["partial_body"] = JobStatusResponse(
+                job_id=job_id,
+                status=JobStatus.PROCESSING,
+                result=result
+            ).model_dump_json().encode("utf-8")
+            notify_job_update(jobs[job_id])
+
+def timed_out_profile() -> ClientTruthProfile:
+    """
+    Placeholder truth profile for a claim the job's deadline cut off before analysis finished.
+    """
+    return ClientTruthProfile(
+        overall_assessment="Timed Out",
+        perspectives={},
+        bias_indicators=BiasIndicators(deception_score=0.0)
+    )
+
+def is_reusable_profile(profile: ClientTruthProfile) -> bool:
+    """
+    Whether a truth profile is worth indexing for other videos: no failed analyses and some evidence found.
+    """
+    stances = [p.stance for p in profile.perspectives.values()]
+    return "Error" not in stances and any(stance != "Unknown" for stance in stances)
+
+def is_cacheable_result(claims: List[Claim], result: AnalysisResponse) -> bool:
     """
+    Whether a finished result may be served to later requests for the video: claim
+    extraction succeeded, and no perspective analysis failed or ran into the search quota.
+    """
+    if any((claim.metadata or {}).get("status") == "error" for claim in claims):
+        return False
+    for analysis in result.claims:
+        for perspective in analysis.truth_profile.perspectives.values():
+            if perspective.stance == "Error" or any(e.source == "System" for e in perspective.evidence):
+                return False
+    return True
+
+async def run_analysis(job_id: str, request: VideoRequest):
+    """
+    Runs the analysis pipeline for a job and stores the result or error.
+    """
+    job_started_at = time.perf_counter()
     try:
         async with jobs_lock:
             if job_id in jobs:
                 jobs[job_id]["status"] = JobStatus.PROCESSING
+                notify_job_update(jobs[job_id])
         
         print(f"DEBUG: Starting analysis for job {job_id}, URL: {request.url}")
         logger.info(f"Starting analysis for job {job_id}, URL: {request.url}")
@@ -94,100 +432,110 @@ async def process_analysis(job_id: str, request: VideoRequest):
         video_id = claim_extractor.extract_video_id(str(request.url))
         # Validation is now done in create_analysis_job
         
-        transcript = claim_extractor.get_transcript(video_id)
+        await yield_to_interactive()
+        adopt_promoted_deadline()
+        with pipeline_stage("transcript_fetch", video_id=video_id) as span:
+            async with stage_deadline("transcript_fetch", share=STAGE_BUDGET_SHARES["transcript_fetch"]):
+                # In a worker thread so a hung fetch can be abandoned at the deadline
+                transcript = await asyncio.to_thread(claim_extractor.get_transcript, video_id)
+            span.set_attribute("segment_count", len(transcript.segments))
+        
+        if settings.TRANSCRIPT_COMPACTION:
+            with pipeline_stage("transcript_compaction") as span:
+                transcript = compact_transcript(
+                    transcript, timestamp_interval=settings.TRANSCRIPT_TIMESTAMP_INTERVAL
+                )
+                span.set_attribute("unit_count", len(transcript.segments))
         
         # 2. Extract Claims
-        claims = await claim_extractor.extract_claims(transcript)
+        adopt_promoted_deadline()
+        with pipeline_stage("claim_extraction") as span:
+            async with stage_deadline("claim_extraction", share=STAGE_BUDGET_SHARES["claim_extraction"]):
+                claims = await claim_extractor.extract_claims(transcript)
+            span.set_attribute("claim_count", len(claims))
+        
+        # Merge restated claims before they each cost a full evidence/analysis round
+        if settings.CLAIM_DEDUP_THRESHOLD > 0:
+            with pipeline_stage("claim_dedup") as span:
+                claims = dedupe_claims(claims, threshold=settings.CLAIM_DEDUP_THRESHOLD)
+                span.set_attribute("claim_count", len(claims))
         
         # Process claims with a reasonable limit
         MAX_CLAIMS_PER_REQUEST = 3  # Limit to prevent timeouts from processing too many claims
         if len(claims) > MAX_CLAIMS_PER_REQUEST:
             logger.warning(f"Video has {len(claims)} claims, limiting to {MAX_CLAIMS_PER_REQUEST}")
-        claims_to_process = claims[:MAX_CLAIMS_PER_REQUEST]
+        # Nearest to the viewer's playback position first (extraction order without one)
+        claims_to_process = schedule_claims(claims, request.current_time)[:MAX_CLAIMS_PER_REQUEST]
         
         claims_to_return = []
+        timed_out = 0
         
         for i, claim in enumerate(claims_to_process):
             print(f"DEBUG: Processing claim {i+1}/{len(claims_to_process)}: {claim.text[:50]}...")
             logger.info(f"Processing claim {i+1}/{len(claims_to_process)}: {claim.id}")
             
-            # 3. Retrieve Evidence (Parallelize perspectives)
-            perspectives = [
-                PerspectiveType.SCIENTIFIC,
-                PerspectiveType.JOURNALISTIC,
-                PerspectiveType.PARTISAN_LEFT,
-                PerspectiveType.PARTISAN_RIGHT
-            ]
-            
-            evidence_results = await evidence_retriever.retrieve_evidence(claim, perspectives)
+            truth_profile = None
+            if claim_index is not None:
+                with pipeline_stage("claim_index_lookup", claim_id=claim.id) as span:
+                    match = claim_index.lookup(claim.text)
+                    span.set_attribute("claim_index.hit", match is not None)
+                if match is not None:
+                    logger.info(f"Reusing indexed truth profile for {claim.id} (similarity {match.similarity:.2f})")
+                    truth_profile = match.profile
             
-            # 4. Analyze Perspectives (Parallelize analysis)
-            perspective_analyses = []
-            analysis_tasks = []
-            
-            for perspective in perspectives:
-                evidence = evidence_results.get(perspective, [])
-                analysis_tasks.append(
-                    analysis_service.analyze_perspective(claim, perspective, evidence)
-                )
-            
-            perspective_analyses = await asyncio.gather(*analysis_tasks)
-            
-            # 5. Analyze Bias and Deception
-            bias_analysis = await analysis_service.analyze_bias_and_deception(claim)
-            
-            # 6. Construct Truth Profile
-            # Simple overall assessment logic for MVP
-            overall_assessment = "Mixed"
-            support_count = sum(1 for p in perspective_analyses if p.stance == "Support")
-            refute_count = sum(1 for p in perspective_analyses if p.stance == "Refute")
-            
-            if support_count > refute_count and support_count >= 2:
-                overall_assessment = "Likely True"
-            elif refute_count > support_count and refute_count >= 2:
-                overall_assessment = "Likely False"
-            elif bias_analysis.deception_rating > 7:
-                overall_assessment = "Suspicious/Deceptive"
-                
-            # Map to ClientClaimAnalysis
-            client_perspectives = {}
-            for p in perspective_analyses:
-                # Convert to dict and add 'assessment' field for UI compatibility
-                p_dict = p.dict()
-                p_dict['assessment'] = p.stance  # UI expects 'assessment'
-                client_perspectives[p.perspective.value] = p_dict
-            
-            bias_indicators = BiasIndicators(
-                logical_fallacies=[], # MVP placeholder
-                emotional_manipulation=[], # MVP placeholder
-                deception_score=bias_analysis.deception_rating
-            )
-            
-            client_truth_profile = ClientTruthProfile(
-                overall_assessment=overall_assessment,
-                perspectives=client_perspectives,
-                bias_indicators=bias_indicators
-            )
+            status = "completed"
+            if truth_profile is None:
+                # A prefetch job taken over by a viewer is bounded from here on
+                adopt_promoted_deadline()
+                try:
+                    # Each claim gets an even share of what is left, so one slow claim can't starve the rest
+                    async with stage_deadline(claim.id, seconds=fair_share(len(claims_to_process) - i)):
+                        truth_profile = await analyze_claim(claim)
+                except DeadlineExceeded as e:
+                    logger.warning(f"Job {job_id}: {e}")
+                    truth_profile = timed_out_profile()
+                    status = "timed_out"
+                    timed_out += 1
+                else:
+                    if claim_index is not None and is_reusable_profile(truth_profile):
+                        claim_index.store(claim.text, truth_profile)
             
             claims_to_return.append(ClientClaimAnalysis(
                 claim_text=claim.text,
                 video_timestamp_start=claim.timestamp_start,
                 video_timestamp_end=claim.timestamp_end,
-                truth_profile=client_truth_profile
+                video_timestamp_ranges=claim.timestamp_ranges,
+                truth_profile=truth_profile,
+                status=status
             ))
+            if i < len(claims_to_process) - 1:
+                await publish_partial_result(job_id, video_id, claims_to_return)
+        
+        if timed_out:
+            CLAIMS_TIMED_OUT.inc(timed_out)
+            current_span().set_attribute("claims.timed_out", timed_out)
             
         result = AnalysisResponse(
             video_id=video_id,
             metadata=AnalysisMetadata(
-                analyzed_at=datetime.now(timezone.utc).isoformat()
+                analyzed_at=datetime.now(timezone.utc).isoformat(),
+                partial=timed_out > 0
             ),
             claims=claims_to_return
         )
         
+        # Failures and quota placeholders would otherwise be served for the cache's whole TTL
+        if not timed_out and request.current_time is None and is_cacheable_result(claims_to_process, result):
+            result_cache.put(video_id, result)
+        
         async with jobs_lock:
             if job_id in jobs:
                 jobs[job_id]["status"] = JobStatus.COMPLETED
                 jobs[job_id]["result"] = result
+                finalize_job(job_id, jobs[job_id])
+                notify_job_update(jobs[job_id])
+        STAGE_DURATION.observe(time.perf_counter() - job_started_at, stage="total")
+        JOBS_FINISHED.inc(status=JobStatus.COMPLETED.value)
         logger.info(f"Job {job_id} completed successfully")
 
     except Exception as e:
@@ -197,6 +545,9 @@ async def process_analysis(job_id: str, request: VideoRequest):
             if job_id in jobs:
                 jobs[job_id]["status"] = JobStatus.FAILED
                 jobs[job_id]["error"] = str(e)
+                finalize_job(job_id, jobs[job_id])
+                notify_job_update(jobs[job_id])
+        JOBS_FINISHED.inc(status=JobStatus.FAILED.value)
 
 @app.post("/analyze/jobs", response_model=JobResponse)
 async def create_analysis_job(request: VideoRequest, background_tasks: BackgroundTasks):
@@ -208,36 +559,171 @@ async def create_analysis_job(request: VideoRequest, background_tasks: Backgroun
     if not video_id:
         raise HTTPException(status_code=400, detail="Invalid video URL: could not extract video ID")
 
+    # Cached and prefetched results were analyzed without a playback position
+    position_independent = request.current_time is None
+    cached = result_cache.get(video_id) if position_independent else None
     job_id = str(uuid.uuid4())
     async with jobs_lock:
-        jobs[job_id] = {
-            "status": JobStatus.PENDING,
-            "result": None,
-            "error": None,
-            "created_at": datetime.now(timezone.utc)
-        }
+        # The video is being prefetched: take that job over instead of starting another
+        prefetch_job_id = prefetch_jobs.get(video_id) if position_independent else None
+        if cached is None and prefetch_job_id in jobs and jobs[prefetch_job_id]["response_body"] is None:
+            promote(
+                jobs[prefetch_job_id]["priority"],
+                Deadline(settings.JOB_DEADLINE_SECONDS) if settings.JOB_DEADLINE_SECONDS > 0 else None
+            )
+            return JobResponse(job_id=prefetch_job_id)
+        
+        jobs[job_id] = new_job(job_id, JobPriority(interactive=True))
+        if cached is not None:
+            jobs[job_id]["status"] = JobStatus.COMPLETED
+            jobs[job_id]["result"] = cached
+            finalize_job(job_id, jobs[job_id])
+            return JobResponse(job_id=job_id)
     
+    # Analyzed interactively now, so no need to prefetch it later
+    if video_id in prefetch_queue:
+        prefetch_queue.remove(video_id)
     background_tasks.add_task(process_analysis, job_id, request)
     
     return JobResponse(job_id=job_id)
 
+@app.post("/analyze/prefetch", response_model=PrefetchResponse, status_code=202)
+async def prefetch_analysis(request: PrefetchRequest):
+    """
+    Queues videos the user is likely to open next (recommendations, hovered
+    thumbnails, the next playlist item) for background analysis.
+
+    Prefetch jobs run one at a time and only make upstream calls while no
+    interactive job is running. Their results go into the result cache, so
+    a later POST /analyze/jobs for the video completes immediately; one made
+    while the video is still being prefetched takes over the prefetch job.
+    """
+    global prefetch_task
+    queued, skipped = [], []
+    for video_id in dict.fromkeys(request.video_ids):
+        if (
+            video_id in result_cache
+            or video_id in prefetch_queue
+            or video_id in prefetch_jobs
+            or len(prefetch_queue) >= settings.PREFETCH_QUEUE_SIZE
+        ):
+            skipped.append(video_id)
+            continue
+        prefetch_queue.append(video_id)
+        queued.append(video_id)
+    
+    if queued and (prefetch_task is None or prefetch_task.done()):
+        prefetch_task = asyncio.create_task(drain_prefetch_queue())
+    return PrefetchResponse(queued=queued, skipped=skipped)
+
+async def drain_prefetch_queue():
+    """
+    Analyzes queued prefetch videos one at a time at background priority.
+    """
+    while prefetch_queue:
+        video_id = prefetch_queue.popleft()
+        if video_id in result_cache:
+            continue
+        job_id = str(uuid.uuid4())
+        async with jobs_lock:
+            jobs[job_id] = new_job(job_id, JobPriority(interactive=False))
+            prefetch_jobs[video_id] = job_id
+        try:
+            await process_analysis(job_id, VideoRequest(url=f"https://www.youtube.com/watch?v={video_id}"))
+        except Exception as e:
+            logger.error(f"Prefetch of {video_id} failed: {e}")
+        finally:
+            prefetch_jobs.pop(video_id, None)
+
 @app.get("/analyze/jobs/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(job_id: str):
+async def get_job_status(
+    job_id: str,
+    response: Response,
+    wait: float = Query(default=0.0, ge=0.0, description="Long-poll: seconds to wait for a status change"),
+    if_none_match: Optional[str] = Header(default=None)
+):
     """
     Retrieves the status and result of an analysis job.
+
+    With ``wait`` > 0, an in-flight job's request is held until its status
+    changes, newly analyzed claims are published, or the timeout (capped at
+    JOB_LONG_POLL_MAX_WAIT) expires, so clients learn about progress without
+    a fixed polling delay. In-flight results carry the claims finished so
+    far with metadata.partial set, served from the body serialized when they
+    were published.
+
+    Terminal jobs are served from their pre-serialized body with a strong ETag,
+    so clients polling with If-None-Match get a 304 without a payload.
     """
+    if wait > 0:
+        async with jobs_lock:
+            if job_id not in jobs:
+                raise HTTPException(status_code=404, detail="Job not found")
+            job = jobs[job_id]
+            status_changed = job["status_changed"] if job["response_body"] is None else None
+
+        if status_changed is not None:
+            try:
+                await asyncio.wait_for(
+                    status_changed.wait(),
+                    timeout=min(wait, settings.JOB_LONG_POLL_MAX_WAIT)
+                )
+            except asyncio.TimeoutError:
+                pass
+
     async with jobs_lock:
         if job_id not in jobs:
             raise HTTPException(status_code=404, detail="Job not found")
         job = jobs[job_id]
-        # Return a copy or extract fields to avoid race conditions if job is modified after lock release
-        # (Though for simple dict access in this MVP, returning the values is fine)
-        return JobStatusResponse(
-            job_id=job_id,
-            status=job["status"],
-            result=job["result"],
-            error=job["error"]
-        )
+        body = job["response_body"]
+        etag = job["etag"]
+        status = job["status"]
+        partial_body = job["partial_body"]
+        if body is None and partial_body is None:
+            # Still in flight with nothing published yet: the payload is tiny, so build it per request
+            in_flight_response = JobStatusResponse(
+                job_id=job_id,
+                status=status,
+                result=job["result"],
+                error=job["error"]
+            )
+
+    if body is None:
+        if partial_body is not None:
+            return Response(
+                content=partial_body,
+                media_type="application/json",
+                headers={"Cache-Control": IN_FLIGHT_JOB_CACHE_CONTROL}
+            )
+        response.headers["Cache-Control"] = IN_FLIGHT_JOB_CACHE_CONTROL
+        return in_flight_response
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            COMPLETED_JOB_CACHE_CONTROL if status == JobStatus.COMPLETED
+            else FAILED_JOB_CACHE_CONTROL
+        ),
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/analyze/jobs/{job_id}/trace")
+async def get_job_trace(
+    job_id: str,
+    format: str = Query(default="timeline", pattern="^(timeline|otlp)$")
+):
+    """
+    Retrieves the span timeline recorded for an analysis job.
+
+    ``format=otlp`` returns the same spans as an OTLP/JSON export request.
+    """
+    async with jobs_lock:
+        if job_id not in jobs:
+            raise HTTPException(status_code=404, detail="Job not found")
+        trace = jobs[job_id]["trace"]
+        return trace.to_otlp() if format == "otlp" else trace.to_dict()
 
 # Deprecated synchronous endpoint (kept for backward compatibility if needed, but we'll remove it or wrap it)
 # For now, we'll remove it to force usage of the new flow as per instructions to "replace"
@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, StringConstraints
 
 
 class PerspectiveType(str, Enum):
@@ -13,6 +13,8 @@ class PerspectiveType(str, Enum):
 
 class VideoRequest(BaseModel):
     url: HttpUrl
+    # Viewer's playback position in seconds; claims nearest to it are analyzed first
+    current_time: Optional[float] = Field(default=None, ge=0)
 
 
 class TranscriptSegment(BaseModel):
@@ -27,11 +29,26 @@ class Transcript(BaseModel):
     full_text: str
 
 
+class CompactedTranscript(Transcript):
+    """
+    Transcript whose segments are merged sentence-level units.
+
+    source_spans[i] is the (first, last) index into original_segments that
+    unit i was built from; timestamps are rendered at most once per
+    timestamp_interval seconds.
+    """
+    original_segments: List[TranscriptSegment]
+    source_spans: List[Tuple[int, int]]
+    timestamp_interval: float = 0.0
+
+
 class Claim(BaseModel):
     id: str
     text: str
     timestamp_start: Optional[float] = None
     timestamp_end: Optional[float] = None
+    # Every (start, end) the claim was made at, when near-duplicates were merged
+    timestamp_ranges: Optional[List[Tuple[float, float]]] = None
     context: Optional[str] = None
     metadata: Optional[Dict] = None
 
@@ -61,6 +78,34 @@ class BiasAnalysis(BaseModel):
     deception_rationale: str
 
 
+# LLM response formats. These are sent to the provider as JSON schemas and
+# validated on the way back (see app.utils.structured_output).
+
+
+class PerspectiveVerdict(BaseModel):
+    stance: Literal["Support", "Refute", "Ambiguous"]
+    confidence: float = Field(..., ge=0, le=1)
+    explanation: str
+
+
+class BiasVerdict(BaseModel):
+    framing_bias: Optional[str] = None
+    sourcing_bias: Optional[str] = None
+    omission_bias: Optional[str] = None
+    sensationalism: Optional[str] = None
+    deception_rating: float = Field(..., ge=0, le=10)
+    deception_rationale: str
+
+
+class ExtractedClaim(BaseModel):
+    text: str
+    context: str = ""
+
+
+class ClaimExtractionResult(BaseModel):
+    claims: List[ExtractedClaim]
+
+
 class TruthProfile(BaseModel):
     claim: Claim
     perspectives: List[PerspectiveAnalysis]
@@ -70,6 +115,8 @@ class TruthProfile(BaseModel):
 
 class AnalysisMetadata(BaseModel):
     analyzed_at: str
+    # True when the job deadline passed before every claim was analyzed
+    partial: bool = False
 
 
 class BiasIndicators(BaseModel):
@@ -88,7 +135,9 @@ class ClientClaimAnalysis(BaseModel):
     claim_text: str
     video_timestamp_start: Optional[float] = None
     video_timestamp_end: Optional[float] = None
+    video_timestamp_ranges: Optional[List[Tuple[float, float]]] = None
     truth_profile: ClientTruthProfile
+    status: str = "completed"  # "completed" or "timed_out" (placeholder truth profile)
 
 
 class AnalysisResponse(BaseModel):
@@ -101,6 +150,18 @@ class JobResponse(BaseModel):
     job_id: str
 
 
+class PrefetchRequest(BaseModel):
+    video_ids: List[Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9_-]{1,64}$")]] = Field(
+        ..., min_length=1, max_length=20
+    )
+
+
+class PrefetchResponse(BaseModel):
+    queued: List[str]
+    # Already cached, queued or being prefetched, or the queue is full
+    skipped: List[str]
+
+
 class JobStatus(str, Enum):
     PENDING = "pending"
     PROCESSING = "processing"
@@ -1,8 +1,12 @@
-import json
 import logging
+import time
 from typing import Dict, List
 
 from app.core.config import settings
+from app.core.deadline import time_left
+from app.core.metrics import record_llm_call, record_llm_tokens
+from app.core.priority import yield_to_interactive
+from app.core.tracing import annotate_llm_usage, current_span, start_span
 from app.models.schemas import (
     BiasAnalysis,
     Claim,
@@ -14,9 +18,17 @@ from app.utils.input_sanitizer import (
     SanitizationError,
     sanitize_claim_text,
     sanitize_context,
-    sanitize_evidence_text,
+    sanitize_evidence_batch,
     sanitize_perspective_value,
-    wrap_user_data,
+)
+from app.utils.prompt_templates import BIAS_ANALYSIS, PERSPECTIVE_ANALYSIS
+from app.utils.structured_output import (
+    BIAS_OUTPUT,
+    PERSPECTIVE_OUTPUT,
+    StructuredOutput,
+    call_structured,
+    is_schema_rejection,
+    schema_output_enabled,
 )
 from openai import AsyncOpenAI
 
@@ -29,6 +41,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Per-request LLM timeout in seconds, further capped by the job's deadline
+LLM_REQUEST_TIMEOUT = 60.0
+
 
 class AnalysisService:
     def __init__(self):
@@ -59,7 +74,15 @@ class AnalysisService:
                     "Example: GEMINI_API_KEY=..."
                 )
 
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+            if settings.GEMINI_API_ENDPOINT:
+                # Custom endpoints (proxies, local stand-ins) are served over REST
+                genai.configure(
+                    api_key=settings.GEMINI_API_KEY,
+                    transport="rest",
+                    client_options={"api_endpoint": settings.GEMINI_API_ENDPOINT},
+                )
+            else:
+                genai.configure(api_key=settings.GEMINI_API_KEY)
             self.model = settings.GEMINI_MODEL
             self.client = None  # Gemini uses a different API pattern
         else:
@@ -67,8 +90,31 @@ class AnalysisService:
                 f"Unsupported LLM_PROVIDER: {self.provider}. Use 'openai' or 'gemini'"
             )
 
-    async def _call_llm(self, prompt: str, system_prompt: str = None) -> str:
-        """Provider-agnostic LLM call that returns JSON string."""
+        # JSON schemas only for models that take them, unless configured explicitly
+        self.structured_output = schema_output_enabled(settings.LLM_STRUCTURED_OUTPUT, self.model)
+
+    async def _call_llm(self, prompt: str, system_prompt: str = None, output: StructuredOutput = None) -> str:
+        """Provider-agnostic LLM call that returns JSON string, constrained to output's schema if given."""
+        await yield_to_interactive()
+        start = time.perf_counter()
+        with start_span("llm_call", service="analysis_service", provider=self.provider, model=self.model):
+            try:
+                try:
+                    content = await self._request_completion(prompt, system_prompt, output)
+                except Exception as e:
+                    if output is None or not self.structured_output or not is_schema_rejection(e):
+                        raise
+                    logger.warning(f"{self.model} rejected the response schema, using JSON mode: {e}")
+                    self.structured_output = False
+                    content = await self._request_completion(prompt, system_prompt, output)
+            except Exception as e:
+                record_llm_call("analysis_service", self.provider, time.perf_counter() - start, e)
+                raise
+            record_llm_call("analysis_service", self.provider, time.perf_counter() - start)
+        return content
+
+    async def _request_completion(self, prompt: str, system_prompt: str = None, output: StructuredOutput = None) -> str:
+        """Send the prompt to the configured provider and return the raw response text."""
         if self.provider == "openai":
             messages = []
             if system_prompt:
@@ -78,8 +124,14 @@ class AnalysisService:
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                response_format={"type": "json_object"},
+                response_format=(
+                    output.openai_response_format
+                    if output is not None and self.structured_output
+                    else {"type": "json_object"}
+                ),
+                timeout=time_left(LLM_REQUEST_TIMEOUT),
             )
+            record_llm_tokens("analysis_service", self.provider, annotate_llm_usage(current_span(), response))
             return response.choices[0].message.content
 
         elif self.provider == "gemini":
@@ -87,17 +139,27 @@ class AnalysisService:
             # We'll use asyncio to run it in a thread pool
             import asyncio
 
+            # Read here: executor threads don't see the job's deadline context
+            timeout = time_left(LLM_REQUEST_TIMEOUT)
+
             def _sync_call():
                 model = genai.GenerativeModel(self.model)
                 full_prompt = prompt
                 if system_prompt:
                     full_prompt = f"{system_prompt}\n\n{prompt}"
 
-                response = model.generate_content(full_prompt)
-                return response.text
+                options = {"request_options": {"timeout": timeout}}
+                if output is not None and self.structured_output:
+                    options["generation_config"] = genai.GenerationConfig(
+                        response_mime_type="application/json",
+                        response_schema=output.gemini_schema,
+                    )
+                return model.generate_content(full_prompt, **options)
 
             loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, _sync_call)
+            response = await loop.run_in_executor(None, _sync_call)
+            record_llm_tokens("analysis_service", self.provider, annotate_llm_usage(current_span(), response))
+            return response.text
 
     async def analyze_perspective(
         self, claim: Claim, perspective: PerspectiveType, evidence_list: List[Evidence]
@@ -119,10 +181,9 @@ class AnalysisService:
             sanitized_claim = sanitize_claim_text(claim.text)
             sanitized_perspective = sanitize_perspective_value(perspective.value)
             sanitized_evidence = "\n".join(
-                [
-                    sanitize_evidence_text(f"- {e.title}: {e.snippet}")
-                    for e in evidence_list
-                ]
+                sanitize_evidence_batch(
+                    [f"- {e.title}: {e.snippet}" for e in evidence_list]
+                )
             )
         except SanitizationError as e:
             logger.error(
@@ -138,37 +199,21 @@ class AnalysisService:
                 evidence=evidence_list,
             )
 
-        # Build prompt with clear separation between instructions and user data
-        prompt = f"""You are an objective analyst. Your task is to analyze a claim based on evidence from a specific perspective.
-
-INSTRUCTIONS:
-1. Read the claim and evidence provided in the USER DATA section below
-2. Based ONLY on the provided evidence, determine if this perspective SUPPORTS, REFUTES, or is AMBIGUOUS regarding the claim
-3. Provide a confidence score (0.0 to 1.0) and a brief explanation
-4. Output your analysis in the specified JSON format
-
-{wrap_user_data(sanitized_claim, "CLAIM")}
-
-{wrap_user_data(sanitized_perspective, "PERSPECTIVE")}
-
-{wrap_user_data(sanitized_evidence, "EVIDENCE")}
-
-OUTPUT FORMAT (JSON):
-{{
-    "stance": "Support" | "Refute" | "Ambiguous",
-    "confidence": float,
-    "explanation": "string"
-}}"""
+        # Static instructions go in the system prompt so providers can cache the prefix
+        system_prompt, prompt = PERSPECTIVE_ANALYSIS.render(
+            perspective=sanitized_perspective, claim=sanitized_claim, evidence=sanitized_evidence
+        )
 
         try:
-            content = await self._call_llm(prompt)
-            result = json.loads(content)
+            verdict = await call_structured(
+                self._call_llm, prompt, system_prompt, PERSPECTIVE_OUTPUT, "analysis_service"
+            )
 
             return PerspectiveAnalysis(
                 perspective=perspective,
-                stance=result.get("stance", "Ambiguous"),
-                confidence=result.get("confidence", 0.0),
-                explanation=result.get("explanation", "Failed to parse explanation."),
+                stance=verdict.stance,
+                confidence=verdict.confidence,
+                explanation=verdict.explanation,
                 evidence=evidence_list,
             )
 
@@ -202,48 +247,17 @@ OUTPUT FORMAT (JSON):
                 deception_rationale=f"Input validation failed: {str(e)}",
             )
 
-        # Build prompt with clear separation between instructions and user data
-        prompt = f"""You are a bias and deception analyst. Your task is to analyze text for various forms of bias and potential deception.
-
-INSTRUCTIONS:
-1. Read the claim and context provided in the USER DATA section below
-2. Evaluate the following aspects:
-   - Framing Bias (loaded language, emotional appeals)
-   - Sourcing Bias (if sources are mentioned)
-   - Omission Bias (cherry-picking)
-   - Sensationalism (clickbait style)
-   - Deception Rating (0-10, where 10 is highly deceptive/intentional lie)
-3. Output your analysis in the specified JSON format
-
-{wrap_user_data(sanitized_claim, "CLAIM TEXT")}
-
-{wrap_user_data(sanitized_context if sanitized_context else "No context provided", "CONTEXT")}
-
-OUTPUT FORMAT (JSON):
-{{
-    "framing_bias": "string or null",
-    "sourcing_bias": "string or null",
-    "omission_bias": "string or null",
-    "sensationalism": "string or null",
-    "deception_rating": float,
-    "deception_rationale": "string"
-}}"""
+        system_prompt, prompt = BIAS_ANALYSIS.render(
+            claim=sanitized_claim, context=sanitized_context if sanitized_context else "No context provided"
+        )
 
         try:
-            content = await self._call_llm(prompt)
-            result = json.loads(content)
-
-            return BiasAnalysis(
-                framing_bias=result.get("framing_bias"),
-                sourcing_bias=result.get("sourcing_bias"),
-                omission_bias=result.get("omission_bias"),
-                sensationalism=result.get("sensationalism"),
-                deception_rating=result.get("deception_rating", 0.0),
-                deception_rationale=result.get(
-                    "deception_rationale", "No rationale provided."
-                ),
+            verdict = await call_structured(
+                self._call_llm, prompt, system_prompt, BIAS_OUTPUT, "analysis_service"
             )
 
+            return BiasAnalysis(**verdict.model_dump())
+
         except Exception as e:
             logger.exception("Error in bias analysis for claim '%s'", claim.text[:50])
             return BiasAnalysis(
@@ -1,11 +1,30 @@
-import json
 import logging
-from typing import List
+import time
+from typing import List, Optional
 from urllib.parse import parse_qs, urlparse
 
 from app.core.config import settings
-from app.models.schemas import Claim, Transcript, TranscriptSegment
-from app.utils.input_sanitizer import wrap_user_data
+from app.core.deadline import time_left
+from app.core.metrics import record_llm_call, record_llm_tokens
+from app.core.priority import yield_to_interactive
+from app.core.tracing import annotate_llm_usage, current_span, start_span
+from app.models.schemas import (
+    Claim,
+    ClaimExtractionResult,
+    CompactedTranscript,
+    Transcript,
+    TranscriptSegment,
+)
+from app.utils.claim_aligner import align_claims
+from app.utils.prompt_templates import CLAIM_EXTRACTION
+from app.utils.structured_output import (
+    CLAIM_EXTRACTION_OUTPUT,
+    StructuredOutput,
+    call_structured,
+    is_schema_rejection,
+    schema_output_enabled,
+)
+from app.utils.transcript_packer import load_token_counter, pack_transcript, transcript_token_budget
 from openai import AsyncOpenAI
 from youtube_transcript_api import YouTubeTranscriptApi
 
@@ -18,6 +37,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Per-request LLM timeout in seconds, further capped by the job's deadline
+LLM_REQUEST_TIMEOUT = 60.0
+
 
 class ClaimExtractor:
     def __init__(self):
@@ -40,14 +62,45 @@ class ClaimExtractor:
                 raise ValueError(
                     "GEMINI_API_KEY is not configured. Please set it in your .env file."
                 )
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+            if settings.GEMINI_API_ENDPOINT:
+                # Custom endpoints (proxies, local stand-ins) are served over REST
+                genai.configure(
+                    api_key=settings.GEMINI_API_KEY,
+                    transport="rest",
+                    client_options={"api_endpoint": settings.GEMINI_API_ENDPOINT},
+                )
+            else:
+                genai.configure(api_key=settings.GEMINI_API_KEY)
             self.model = settings.GEMINI_MODEL
             self.client = None
         else:
             raise ValueError(f"Unsupported LLM_PROVIDER: {self.provider}")
 
-    async def _call_llm(self, prompt: str, system_prompt: str = None) -> str:
-        """Provider-agnostic LLM call that returns JSON string."""
+        # JSON schemas only for models that take them, unless configured explicitly
+        self.structured_output = schema_output_enabled(settings.LLM_STRUCTURED_OUTPUT, self.model)
+
+    async def _call_llm(self, prompt: str, system_prompt: str = None, output: StructuredOutput = None) -> str:
+        """Provider-agnostic LLM call that returns JSON string, constrained to output's schema if given."""
+        await yield_to_interactive()
+        start = time.perf_counter()
+        with start_span("llm_call", service="claim_extractor", provider=self.provider, model=self.model):
+            try:
+                try:
+                    content = await self._request_completion(prompt, system_prompt, output)
+                except Exception as e:
+                    if output is None or not self.structured_output or not is_schema_rejection(e):
+                        raise
+                    logger.warning(f"{self.model} rejected the response schema, using JSON mode: {e}")
+                    self.structured_output = False
+                    content = await self._request_completion(prompt, system_prompt, output)
+            except Exception as e:
+                record_llm_call("claim_extractor", self.provider, time.perf_counter() - start, e)
+                raise
+            record_llm_call("claim_extractor", self.provider, time.perf_counter() - start)
+        return content
+
+    async def _request_completion(self, prompt: str, system_prompt: str = None, output: StructuredOutput = None) -> str:
+        """Send the prompt to the configured provider and return the raw response text."""
         if self.provider == "openai":
             messages = []
             if system_prompt:
@@ -57,25 +110,40 @@ class ClaimExtractor:
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                response_format={"type": "json_object"},
-                timeout=60.0,
+                response_format=(
+                    output.openai_response_format
+                    if output is not None and self.structured_output
+                    else {"type": "json_object"}
+                ),
+                timeout=time_left(LLM_REQUEST_TIMEOUT),
             )
+            record_llm_tokens("claim_extractor", self.provider, annotate_llm_usage(current_span(), response))
             return response.choices[0].message.content
 
         elif self.provider == "gemini":
             import asyncio
 
+            # Read here: executor threads don't see the job's deadline context
+            timeout = time_left(LLM_REQUEST_TIMEOUT)
+
             def _sync_call():
                 model = genai.GenerativeModel(self.model)
                 full_prompt = prompt
                 if system_prompt:
                     full_prompt = f"{system_prompt}\n\n{prompt}"
 
-                response = model.generate_content(full_prompt)
-                return response.text
+                options = {"request_options": {"timeout": timeout}}
+                if output is not None and self.structured_output:
+                    options["generation_config"] = genai.GenerationConfig(
+                        response_mime_type="application/json",
+                        response_schema=output.gemini_schema,
+                    )
+                return model.generate_content(full_prompt, **options)
 
             loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, _sync_call)
+            response = await loop.run_in_executor(None, _sync_call)
+            record_llm_tokens("claim_extractor", self.provider, annotate_llm_usage(current_span(), response))
+            return response.text
 
     def extract_video_id(self, url: str) -> str:
         """
@@ -142,141 +210,21 @@ class ClaimExtractor:
         Scans the transcript to identify meaningful claims.
         """
         # 1. Prepare transcript text with timestamps for the LLM
-        # We'll chunk it if it's too long, but for MVP we'll try to process a significant portion.
-        # We'll format it as: [00:00] Text...
-
-        formatted_transcript = ""
-        for seg in transcript.segments:
-            # Simple timestamp formatting MM:SS
-            minutes = int(seg.start // 60)
-            seconds = int(seg.start % 60)
-            timestamp = f"[{minutes:02d}:{seconds:02d}]"
-            formatted_transcript += f"{timestamp} {seg.text}\n"
-
-        # Truncate to ~12000 chars (approx 3000 tokens) to be safe with context window + output
-        # A 10 min video is usually around 1500 words / 7-8k chars.
-        if len(formatted_transcript) > 12000:
-            formatted_transcript = formatted_transcript[:12000] + "\n...[TRUNCATED]..."
-
-        # 2. Construct Prompt
-        prompt = f"""You are an expert content analyst. Your task is to analyze the following video transcript and extract the key claims made by the speaker.
-
-INSTRUCTIONS:
-1. Identify distinct, verifiable claims or strong arguments.
-2. Ignore filler, introductions, questions, or purely descriptive text.
-3. For each claim, provide:
-   - The exact text of the claim (or a concise summary if the speaker is verbose).
-   - The start and end timestamps (approximate) based on the transcript markers.
-   - The context (surrounding text) to help understand the claim.
-4. Extract between 3 and 7 most important claims.
-5. Output valid JSON.
-
-{wrap_user_data(formatted_transcript, "TRANSCRIPT")}
-
-OUTPUT FORMAT (JSON):
-{{
-    "claims": [
-        {{
-            "text": "string",
-            "start_time": float (in seconds, convert MM:SS to seconds),
-            "end_time": float (in seconds),
-            "context": "string"
-        }}
-    ]
-}}"""
+        # (the tokenizer may still need downloading; do that off the event loop)
+        await load_token_counter(self.model)
+        formatted_transcript = format_transcript(transcript, self.model)
+
+        # 2. Construct Prompt (static instructions first, see app.utils.prompt_templates)
+        system_prompt, prompt = CLAIM_EXTRACTION.render(transcript=formatted_transcript)
 
         try:
-            content = await self._call_llm(
-                prompt=prompt,
-                system_prompt="You are a helpful assistant that extracts claims from transcripts.",
+            result = await call_structured(
+                self._call_llm, prompt, system_prompt, CLAIM_EXTRACTION_OUTPUT, "claim_extractor"
             )
-            if not content:
-                return []
-
-            data = json.loads(content)
-            claims_data = data.get("claims", [])
-
-            claims = []
-            for i, item in enumerate(claims_data):
-                # Validate required fields
-                try:
-                    # Validate text: must be non-empty string
-                    text = item.get("text", "")
-                    if not isinstance(text, str) or not text.strip():
-                        logger.warning(
-                            f"Skipping claim at index {i}: missing or empty 'text' field",
-                            extra={"claim_index": i, "missing_fields": ["text"]},
-                        )
-                        continue
-
-                    # Validate start_time: must be numeric or castable to float
-                    start_time_raw = item.get("start_time")
-                    if start_time_raw is None:
-                        logger.warning(
-                            f"Skipping claim at index {i}: missing 'start_time' field",
-                            extra={"claim_index": i, "missing_fields": ["start_time"]},
-                        )
-                        continue
-
-                    try:
-                        start_time = float(start_time_raw)
-                    except (ValueError, TypeError):
-                        logger.warning(
-                            f"Skipping claim at index {i}: 'start_time' is not numeric",
-                            extra={
-                                "claim_index": i,
-                                "error_type": "invalid_type",
-                                "field": "start_time",
-                            },
-                        )
-                        continue
-
-                    # Validate end_time: must be numeric or castable to float
-                    end_time_raw = item.get("end_time")
-                    if end_time_raw is None:
-                        logger.warning(
-                            f"Skipping claim at index {i}: missing 'end_time' field",
-                            extra={"claim_index": i, "missing_fields": ["end_time"]},
-                        )
-                        continue
-
-                    try:
-                        end_time = float(end_time_raw)
-                    except (ValueError, TypeError):
-                        logger.warning(
-                            f"Skipping claim at index {i}: 'end_time' is not numeric",
-                            extra={
-                                "claim_index": i,
-                                "error_type": "invalid_type",
-                                "field": "end_time",
-                            },
-                        )
-                        continue
-
-                    # Optional context: default to empty string
-                    context = item.get("context", "")
-                    if not isinstance(context, str):
-                        context = ""
-
-                    # All validations passed, create Claim
-                    claims.append(
-                        Claim(
-                            id=f"claim_{i}",
-                            text=text.strip(),
-                            timestamp_start=start_time,
-                            timestamp_end=end_time,
-                            context=context,
-                        )
-                    )
-
-                except Exception as e:
-                    # Catch any unexpected errors during claim construction
-                    logger.warning(
-                        f"Unexpected error creating claim at index {i}: {e}",
-                        extra={"claim_index": i, "error": str(e)},
-                    )
-                    continue
 
+            claims = build_claims(result)
+            aligned = align_claims(claims, transcript)
+            current_span().set_attribute("claims.aligned", aligned)
             return claims
         except Exception as e:
             logger.error(f"Error extracting claims with LLM: {e}")
@@ -296,3 +244,65 @@ OUTPUT FORMAT (JSON):
                     },
                 )
             ]
+
+
+def format_transcript(transcript: Transcript, model: str, token_budget: Optional[int] = None) -> str:
+    """
+    Render transcript segments as "[MM:SS] text" lines for the extraction prompt.
+
+    Segments are packed up to the model's transcript token budget (see
+    app.utils.transcript_packer); later segments are dropped and marked as
+    truncated. Compacted transcripts carry timestamps at coarser intervals.
+    """
+    if token_budget is None:
+        token_budget = transcript_token_budget(model)
+    timestamp_interval = (
+        transcript.timestamp_interval if isinstance(transcript, CompactedTranscript) else 0.0
+    )
+    packed = pack_transcript(transcript.segments, token_budget, model, timestamp_interval)
+    current_span().set_attributes(
+        **{
+            "transcript.tokens": packed.token_count,
+            "transcript.segments_used": packed.segments_used,
+            "transcript.truncated": packed.truncated,
+        }
+    )
+    if packed.truncated:
+        logger.info(
+            "Transcript for %s truncated to %d of %d segments (%d tokens, budget %d)",
+            transcript.video_id,
+            packed.segments_used,
+            len(transcript.segments),
+            packed.token_count,
+            token_budget,
+        )
+    return packed.text
+
+
+def parse_claims(content: str) -> List[Claim]:
+    """
+    Parse the LLM's claims JSON into claims.
+
+    Raises:
+        ValidationError: If content is not JSON matching ClaimExtractionResult
+    """
+    return build_claims(CLAIM_EXTRACTION_OUTPUT.parse(content))
+
+
+def build_claims(result: ClaimExtractionResult) -> List[Claim]:
+    """
+    Turn a validated extraction result into claims, skipping entries without claim text.
+
+    Timestamps are worked out locally afterwards (see app.utils.claim_aligner).
+    """
+    claims = []
+    for i, item in enumerate(result.claims):
+        text = item.text.strip()
+        if not text:
+            logger.warning(
+                f"Skipping claim at index {i}: missing or empty 'text' field",
+                extra={"claim_index": i, "missing_fields": ["text"]},
+            )
+            continue
+        claims.append(Claim(id=f"claim_{i}", text=text, context=item.context))
+    return claims
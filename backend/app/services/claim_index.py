@@ -0,0 +1,173 @@
+"""
+Persistent cross-video claim index.
+
+Many videos repeat the same talking points. The index stores each analyzed
+claim's truth profile in a local SQLite file, keyed by its normalized text
+and a MinHash signature over its terms, so a later video making the same
+claim can reuse the profile instead of re-running evidence retrieval and
+analysis.
+
+Lookup: claims sharing any LSH band of the signature (8 bands of 4 hashes,
+which catches ~98% of pairs at 0.8 term Jaccard similarity) are candidates,
+and are accepted when their actual term Jaccard similarity reaches the
+configured threshold and they state the same numbers and negations (a
+profile for "1.7 trillion" or "is not" says nothing about "3.7 trillion"
+or "is"). Entries older than max_age are ignored and pruned.
+"""
+
+import hashlib
+import logging
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional
+
+from app.models.schemas import ClientTruthProfile
+from app.utils.text_similarity import jaccard, key_facts, terms
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HASHES = 32
+BAND_ROWS = 4
+BANDS = SIGNATURE_HASHES // BAND_ROWS
+MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+HASH_PARAMS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(SIGNATURE_HASHES)
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY,
+    normalized_text TEXT NOT NULL UNIQUE,
+    profile_json TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claim_bands (
+    band INTEGER NOT NULL,
+    claim_id INTEGER NOT NULL REFERENCES claims (id)
+);
+CREATE INDEX IF NOT EXISTS claim_bands_band ON claim_bands (band);
+CREATE INDEX IF NOT EXISTS claim_bands_claim ON claim_bands (claim_id);
+"""
+
+
+@dataclass
+class ClaimIndexMatch:
+    profile: ClientTruthProfile
+    similarity: float
+    age_seconds: float
+
+
+def normalize_claim(text: str) -> str:
+    """Lowercased claim terms without punctuation or stopwords."""
+    return " ".join(terms(text))
+
+
+def minhash(term_set: FrozenSet[str]) -> List[int]:
+    """MinHash signature of a set of terms."""
+    bases = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big") for t in term_set]
+    return [min((a * h + b) % MERSENNE_PRIME for h in bases) for a, b in HASH_PARAMS]
+
+
+def lsh_bands(signature: List[int]) -> List[int]:
+    """One key per band of the signature, as signed 64-bit ints for SQLite."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(repr((band, rows)).encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+class ClaimIndex:
+    def __init__(self, path: str, similarity_threshold: float = 0.8, max_age_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        # A lookup is one indexed band query plus a Jaccard pass over its few candidates
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def lookup(self, claim_text: str) -> Optional[ClaimIndexMatch]:
+        """
+        Find a fresh stored profile for a claim with the same or a similar wording.
+
+        Returns:
+            The best match at or above the similarity threshold, or None
+        """
+        normalized = normalize_claim(claim_text)
+        if not normalized:
+            return None
+        claim_terms = frozenset(normalized.split())
+        bands = lsh_bands(minhash(claim_terms))
+        cutoff = time.time() - self.max_age_seconds
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT normalized_text, profile_json, created_at FROM claims "
+                "WHERE created_at >= ? AND (normalized_text = ? OR id IN "
+                f"(SELECT claim_id FROM claim_bands WHERE band IN ({', '.join('?' * BANDS)})))",
+                (cutoff, normalized, *bands),
+            ).fetchall()
+
+        # Numbers and negations must match exactly for a profile to be reused
+        facts = key_facts(claim_terms)
+        best = None
+        for stored_text, profile_json, created_at in rows:
+            stored_terms = frozenset(stored_text.split())
+            if key_facts(stored_terms) != facts:
+                continue
+            similarity = jaccard(claim_terms, stored_terms)
+            if similarity >= self.similarity_threshold and (best is None or similarity > best[0]):
+                best = (similarity, profile_json, created_at)
+
+        if best is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        similarity, profile_json, created_at = best
+        return ClaimIndexMatch(
+            profile=ClientTruthProfile.model_validate_json(profile_json),
+            similarity=similarity,
+            age_seconds=time.time() - created_at,
+        )
+
+    def store(self, claim_text: str, profile: ClientTruthProfile) -> None:
+        """Store (or refresh) the truth profile computed for a claim."""
+        normalized = normalize_claim(claim_text)
+        if not normalized:
+            return
+        bands = lsh_bands(minhash(frozenset(normalized.split())))
+        with self._lock, self._conn:
+            claim_id = self._conn.execute(
+                "INSERT INTO claims (normalized_text, profile_json, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (normalized_text) DO UPDATE SET profile_json = excluded.profile_json, "
+                "created_at = excluded.created_at RETURNING id",
+                (normalized, profile.model_dump_json(), time.time()),
+            ).fetchone()[0]
+            self._conn.execute("DELETE FROM claim_bands WHERE claim_id = ?", (claim_id,))
+            self._conn.executemany(
+                "INSERT INTO claim_bands (band, claim_id) VALUES (?, ?)",
+                [(band, claim_id) for band in bands],
+            )
+
+    def prune(self) -> int:
+        """Delete entries older than max_age. Returns the number removed."""
+        cutoff = time.time() - self.max_age_seconds
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM claim_bands WHERE claim_id IN (SELECT id FROM claims WHERE created_at < ?)",
+                (cutoff,),
+            )
+            return self._conn.execute("DELETE FROM claims WHERE created_at < ?", (cutoff,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,17 +1,40 @@
 import httpx
-from typing import List, Dict
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
+from urllib.parse import urlparse
 import logging
 import asyncio
+import time
+import weakref
 from app.core.config import settings
-from app.models.schemas import Claim, Evidence, PerspectiveType
+from app.core.deadline import time_left
+from app.core.metrics import SEARCH_CALLS, SEARCH_CALL_DURATION, UPSTREAM_RATE_LIMITED
+from app.core.priority import yield_to_interactive
+from app.core.tracing import start_span
+from app.models.schemas import Evidence, PerspectiveType
+from app.services.search_provider import RESULTS_PER_PERSPECTIVE, SearchProvider
 
 logger = logging.getLogger(__name__)
 
-class EvidenceRetriever:
+# Combined strategy: site filters in the one broad query (round-robin across
+# perspectives) and results requested for it (the CSE maximum)
+COMBINED_MAX_SITES = 12
+COMBINED_NUM_RESULTS = 10
+# Google ignores query words past the 32nd; each "site:" filter and each "OR"
+# between them is a word, so the claim's own words limit how many sites fit
+MAX_QUERY_WORDS = 32
+# Sharded strategy: site filters per shard query (the same cap as a single
+# per-perspective query, so each shard stays within query limits)
+SHARD_SIZE = 5
+
+class EvidenceRetriever(SearchProvider):
+    """Google Custom Search provider."""
+
+    name = "google"
+
     def __init__(self):
         self.api_key = settings.GOOGLE_API_KEY
         self.cse_id = settings.GOOGLE_CSE_ID
-        self.base_url = "https://www.googleapis.com/customsearch/v1"
+        self.base_url = settings.GOOGLE_SEARCH_BASE_URL
         
         # Validate credentials at initialization
         if not self.api_key or not self.cse_id:
@@ -44,11 +67,48 @@ class EvidenceRetriever:
                 "washingtontimes.com", "newsmax.com", "nationalreview.com"
             ]
         }
+        # Reverse lookup for bucketing results from broad queries
+        self.domain_perspectives = {
+            domain: perspective
+            for perspective, domains in self.perspective_domains.items()
+            for domain in domains
+        }
+        self.strategy = settings.SEARCH_STRATEGY
+        # One limiter per event loop, shared by every CSE request from this retriever
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _limiter(self) -> asyncio.Semaphore:
+        """
+        Global cap on concurrent CSE requests (GOOGLE_SEARCH_MAX_CONCURRENT), across claims and jobs.
+        """
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = self._limiters[loop] = asyncio.Semaphore(settings.GOOGLE_SEARCH_MAX_CONCURRENT)
+        return limiter
+
+    def perspective_for_host(self, host: str) -> Optional[PerspectiveType]:
+        """
+        Perspective whose domain list covers a host, matching subdomains (e.g. www.bbc.com, news.bbc.com).
+        """
+        host = host.lower().rstrip(".")
+        while host:
+            perspective = self.domain_perspectives.get(host)
+            if perspective is not None:
+                return perspective
+            _, _, host = host.partition(".")
+        return None
 
     async def search_google(self, query: str, perspective: PerspectiveType) -> List[Evidence]:
         """
         Searches Google for the query, filtered by the perspective's domains.
         """
+        with start_span("search_google", perspective=perspective.value, query=query) as span:
+            results = await self._search_google(query, perspective)
+            span.set_attribute("search.result_count", len(results))
+            return results
+
+    async def _search_google(self, query: str, perspective: PerspectiveType) -> List[Evidence]:
         # Construct query with site filters
         domains = self.perspective_domains.get(perspective, [])
         if not domains:
@@ -59,92 +119,229 @@ class EvidenceRetriever:
         site_filter = " OR ".join([f"site:{d}" for d in domains[:5]])
         full_query = f"{query} ({site_filter})"
         
+        outcome, items = await self._query_cse(full_query, RESULTS_PER_PERSPECTIVE, perspective.value)
+        if outcome == "rate_limited":
+            return [self._quota_exceeded_evidence(perspective)]
+        return [self._to_evidence(item, perspective) for item in items]
+
+    async def _query_cse(self, full_query: str, num: int, label: str) -> Tuple[str, List[dict]]:
+        """
+        Runs one Custom Search request under the global request limiter.
+
+        Returns:
+            (outcome, items): outcome is the SEARCH_CALLS label ("success",
+            "rate_limited", "http_error", "timeout", "network_error"); items
+            is empty unless the call succeeded
+        """
         params = {
             "key": self.api_key,
             "cx": self.cse_id,
             "q": full_query,
-            "num": 3 # Number of results to return per perspective
+            "num": num
         }
         
+        # Prefetch jobs wait here (not holding a limiter slot) while interactive jobs run
+        await yield_to_interactive()
+        async with self._limiter():
+            return await self._send_cse_request(params, label)
+
+    async def _send_cse_request(self, params: dict, label: str) -> Tuple[str, List[dict]]:
+        start = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=settings.GOOGLE_SEARCH_TIMEOUT) as client:
-                response = await client.get(self.base_url, params=params)
+            async with httpx.AsyncClient(timeout=time_left(settings.GOOGLE_SEARCH_TIMEOUT)) as client:
+                try:
+                    response = await client.get(self.base_url, params=params)
+                finally:
+                    SEARCH_CALL_DURATION.observe(time.perf_counter() - start, provider="google")
                 response.raise_for_status()
                 data = response.json()
-                
-                items = data.get("items", [])
-                evidence_list = []
-                
-                for item in items:
-                    evidence_list.append(Evidence(
-                        url=item.get("link", ""),
-                        title=item.get("title", ""),
-                        snippet=item.get("snippet", ""),
-                        source=item.get("displayLink", ""),
-                        perspective=perspective
-                    ))
-                    
-                return evidence_list
+                SEARCH_CALLS.inc(provider="google", outcome="success")
+                return "success", data.get("items", [])
                 
         except httpx.HTTPStatusError as e:
             # API returned 4xx or 5xx status code (e.g., rate limit, invalid query)
             logger.error(
                 "Google API returned error status %s for %s: %s",
                 e.response.status_code,
-                perspective.value,
+                label,
                 e.response.text[:200],
                 exc_info=True
             )
             if e.response.status_code == 429:
-                return [Evidence(
-                    url="https://developers.google.com/custom-search/v1/overview",
-                    title="Search Quota Exceeded",
-                    snippet="The quota for Google Custom Search API has been exceeded. Unable to retrieve live evidence for this perspective.",
-                    source="System",
-                    perspective=perspective
-                )]
-            return []
+                SEARCH_CALLS.inc(provider="google", outcome="rate_limited")
+                UPSTREAM_RATE_LIMITED.inc(upstream="google_cse")
+                return "rate_limited", []
+            SEARCH_CALLS.inc(provider="google", outcome="http_error")
+            return "http_error", []
         except httpx.TimeoutException:
             # Request timed out - recoverable, can retry later
             logger.warning(
-                "Timeout searching Google for %s (exceeded 10s)",
-                perspective.value
+                "Timeout searching Google for %s (exceeded %ss)",
+                label,
+                settings.GOOGLE_SEARCH_TIMEOUT
             )
-            return []
+            SEARCH_CALLS.inc(provider="google", outcome="timeout")
+            return "timeout", []
         except httpx.RequestError as e:
             # Network errors, connection errors, etc. - recoverable
             logger.error(
                 "Network error searching Google for %s: %s",
-                perspective.value,
+                label,
                 str(e),
                 exc_info=True
             )
-            return []
+            SEARCH_CALLS.inc(provider="google", outcome="network_error")
+            return "network_error", []
         # Let unexpected exceptions propagate (e.g., JSON decode errors, programming errors)
 
-    async def retrieve_evidence(self, claim: Claim, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+    def _to_evidence(self, item: dict, perspective: PerspectiveType) -> Evidence:
+        return Evidence(
+            url=item.get("link", ""),
+            title=item.get("title", ""),
+            snippet=item.get("snippet", ""),
+            source=item.get("displayLink", ""),
+            perspective=perspective
+        )
+
+    def _quota_exceeded_evidence(self, perspective: PerspectiveType) -> Evidence:
+        return Evidence(
+            url="https://developers.google.com/custom-search/v1/overview",
+            title="Search Quota Exceeded",
+            snippet="The quota for Google Custom Search API has been exceeded. Unable to retrieve live evidence for this perspective.",
+            source="System",
+            perspective=perspective
+        )
+
+    def _item_perspective(self, item: dict) -> Optional[PerspectiveType]:
+        host = item.get("displayLink") or urlparse(item.get("link", "")).hostname or ""
+        return self.perspective_for_host(host)
+
+    def _combined_sites(self, query: str, perspectives: List[PerspectiveType]) -> List[str]:
         """
-        Retrieves evidence for a claim across multiple perspectives concurrently.
+        Site filters for the broad query, taking each perspective's top domains in turn.
+
+        As many as fit in the words the query leaves (n filters take 2n - 1),
+        up to COMBINED_MAX_SITES.
+        """
+        words_left = MAX_QUERY_WORDS - len(query.split())
+        max_sites = min(COMBINED_MAX_SITES, max(0, (words_left + 1) // 2))
+        lists = [self.perspective_domains.get(p, []) for p in perspectives]
+        sites = []
+        for rank in range(max((len(domains) for domains in lists), default=0)):
+            for domains in lists:
+                if rank < len(domains) and len(sites) < max_sites:
+                    sites.append(domains[rank])
+        return sites
+
+    async def search_google_combined(self, query: str, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+        """
+        Runs one broad query across the perspectives' domains and buckets results by domain.
+
+        Perspectives left empty are filled with a targeted per-perspective
+        search, so a claim costs 1 query when the broad one covers everything
+        instead of one per perspective.
+        """
+        searchable = [p for p in perspectives if self.perspective_domains.get(p)]
+        if not searchable:
+            return {perspective: [] for perspective in perspectives}
+        sites = self._combined_sites(query, perspectives)
+        if len(sites) < len(searchable):
+            # Too long a claim to cover every perspective in one query; search them individually
+            return await self._search_perspectives(query, perspectives)
+        full_query = f"{query} ({' OR '.join(f'site:{d}' for d in sites)})"
+
+        with start_span("search_google_combined", query=query, site_count=len(sites)) as span:
+            outcome, items = await self._query_cse(full_query, COMBINED_NUM_RESULTS, "combined query")
+            if outcome == "rate_limited":
+                # Targeted fills would hit the same exhausted quota
+                return {perspective: [self._quota_exceeded_evidence(perspective)] for perspective in perspectives}
+
+            results: Dict[PerspectiveType, List[Evidence]] = {perspective: [] for perspective in perspectives}
+            for item in items:
+                perspective = self._item_perspective(item)
+                if perspective in results and len(results[perspective]) < RESULTS_PER_PERSPECTIVE:
+                    results[perspective].append(self._to_evidence(item, perspective))
+            span.set_attribute("search.result_count", len(items))
+
+            missing = [perspective for perspective in perspectives if not results[perspective]]
+            span.set_attribute("search.fill_queries", len(missing))
+        if missing:
+            fills = await self._search_perspectives(query, missing)
+            results.update(fills)
+        return results
+
+    async def search_google_sharded(self, query: str, perspective: PerspectiveType) -> List[Evidence]:
+        """
+        Searches all of a perspective's domains in concurrent shards of SHARD_SIZE site filters.
+
+        Returns once RESULTS_PER_PERSPECTIVE results have arrived, cancelling
+        shards still in flight. Results are ordered by their rank within
+        their shard, then by shard (earlier domains first).
+        """
+        domains = self.perspective_domains.get(perspective, [])
+        shards = [domains[i:i + SHARD_SIZE] for i in range(0, len(domains), SHARD_SIZE)]
+        if not shards:
+            return []
+
+        with start_span("search_google_sharded", perspective=perspective.value, query=query, shard_count=len(shards)) as span:
+            async def search_shard(index: int, shard: List[str]) -> Tuple[int, str, List[dict]]:
+                site_filter = " OR ".join(f"site:{d}" for d in shard)
+                outcome, items = await self._query_cse(
+                    f"{query} ({site_filter})", RESULTS_PER_PERSPECTIVE, f"{perspective.value} shard {index}"
+                )
+                return index, outcome, items
+
+            tasks = [asyncio.create_task(search_shard(i, shard)) for i, shard in enumerate(shards)]
+            ranked = []
+            outcomes = []
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    index, outcome, items = await next_done
+                    outcomes.append(outcome)
+                    ranked.extend((rank, index, item) for rank, item in enumerate(items))
+                    if len(ranked) >= RESULTS_PER_PERSPECTIVE:
+                        break
+            finally:
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                span.set_attribute("search.shards_cancelled", len(pending))
+
+            if not ranked and outcomes and all(outcome == "rate_limited" for outcome in outcomes):
+                return [self._quota_exceeded_evidence(perspective)]
+            ranked.sort(key=lambda entry: entry[:2])
+            results = [self._to_evidence(item, perspective) for _, _, item in ranked[:RESULTS_PER_PERSPECTIVE]]
+            span.set_attribute("search.result_count", len(results))
+            return results
+
+    async def search(self, query: str, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+        """
+        Searches Google for every perspective using the configured SEARCH_STRATEGY.
         Rate-limited to prevent API throttling.
         """
-        # Use the claim text as the query. 
-        # In a real app, we might want to summarize or extract keywords from the claim text first.
-        query = claim.text
-        
-        # Truncate query if too long (Google limit is around 2048 chars, but practical limit is lower)
-        if len(query) > 100:
-            query = query[:100]
-        
-        # Create semaphore for rate limiting
-        semaphore = asyncio.Semaphore(settings.GOOGLE_SEARCH_MAX_CONCURRENT)
-        
-        async def rate_limited_search(perspective: PerspectiveType) -> List[Evidence]:
-            """Wrapper to rate-limit search_google calls."""
-            async with semaphore:
-                return await self.search_google(query, perspective)
-        
-        # Build coroutines for concurrent execution with rate limiting
-        search_tasks = [rate_limited_search(perspective) for perspective in perspectives]
+        if self.strategy == "combined":
+            try:
+                return await self.search_google_combined(query, perspectives)
+            except Exception as e:
+                logger.error("Combined search failed, searching per perspective: %s", str(e), exc_info=True)
+        if self.strategy == "sharded":
+            return await self._search_perspectives(query, perspectives, self.search_google_sharded)
+        return await self._search_perspectives(query, perspectives)
+
+    async def _search_perspectives(
+        self,
+        query: str,
+        perspectives: List[PerspectiveType],
+        search: Optional[Callable[[str, PerspectiveType], Awaitable[List[Evidence]]]] = None,
+    ) -> Dict[PerspectiveType, List[Evidence]]:
+        """
+        Runs one search per perspective concurrently (search_google unless another search is given).
+        Requests are rate-limited by the global CSE limiter.
+        """
+        search = search or self.search_google
+        search_tasks = [search(query, perspective) for perspective in perspectives]
         
         # Execute all searches concurrently, capturing exceptions per-task
         search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
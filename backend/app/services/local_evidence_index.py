@@ -0,0 +1,216 @@
+"""
+Local full-text evidence index (SQLite FTS5, BM25 ranking).
+
+Evidence is stored per perspective, either written through from live
+searches (see TieredSearchProvider) or bulk-imported from article dumps,
+and queried without any network access. It can run standalone
+(SEARCH_PROVIDER=local, e.g. for offline testing) or as the first tier in
+front of Google (SEARCH_PROVIDER=local+google).
+
+Bulk import takes JSON Lines with url, title, snippet (or text), optional
+source and perspective fields:
+
+    python -m app.services.local_evidence_index import articles.jsonl --perspective Scientific
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from app.models.schemas import Evidence, PerspectiveType
+from app.services.search_provider import RESULTS_PER_PERSPECTIVE, SearchProvider
+from app.utils.text_similarity import stem, terms, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Longest query sent to FTS5, in terms
+MAX_QUERY_TERMS = 16
+
+# Share of the query's terms a document must contain to count as evidence
+MIN_TERM_COVERAGE = 0.4
+
+# Candidates fetched per result before the coverage filter
+CANDIDATES_PER_RESULT = 5
+
+# Stored snippets are capped like search API snippets
+MAX_SNIPPET_LENGTH = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    perspective TEXT NOT NULL,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    source TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    UNIQUE (url, perspective)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, snippet, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);
+    INSERT INTO documents_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet);
+END;
+"""
+
+
+def _query_terms(text: str) -> List[str]:
+    return list(dict.fromkeys(terms(text)))[:MAX_QUERY_TERMS]
+
+
+class LocalEvidenceIndex(SearchProvider):
+    name = "local"
+
+    def __init__(self, path: str):
+        self.path = path
+        # FTS5 queries finish in milliseconds, so requests share one serialized connection
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def add(self, evidence: Iterable[Evidence]) -> int:
+        """
+        Adds (or refreshes) evidence, keyed by URL and perspective.
+
+        System placeholders (e.g. the search quota notice) are skipped.
+
+        Returns:
+            Number of documents written
+        """
+        now = time.time()
+        rows = [
+            (e.url, e.perspective.value, e.title, e.snippet[:MAX_SNIPPET_LENGTH], e.source, now)
+            for e in evidence
+            if e.url and e.source != "System"
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO documents (url, perspective, title, snippet, source, added_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url, perspective) DO UPDATE SET title = excluded.title, snippet = excluded.snippet, "
+                "source = excluded.source, added_at = excluded.added_at",
+                rows,
+            )
+        return len(rows)
+
+    def search_perspective(self, query: str, perspective: PerspectiveType, limit: int = RESULTS_PER_PERSPECTIVE) -> List[Evidence]:
+        """
+        BM25-ranked documents for one perspective containing enough of the query's terms.
+        """
+        query_terms = _query_terms(query)
+        if not query_terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in query_terms)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.url, d.title, d.snippet, d.source FROM documents_fts "
+                "JOIN documents d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ? AND d.perspective = ? "
+                "ORDER BY bm25(documents_fts) LIMIT ?",
+                (match, perspective.value, limit * CANDIDATES_PER_RESULT),
+            ).fetchall()
+
+        # Prefix stems, enough to line coverage up with FTS5's porter matches
+        wanted = {stem(term) for term in query_terms}
+        results = []
+        for url, title, snippet, source in rows:
+            stems = {stem(token) for token in tokenize(f"{title} {snippet}")}
+            if len(wanted & stems) / len(wanted) < MIN_TERM_COVERAGE:
+                continue
+            results.append(Evidence(url=url, title=title, snippet=snippet, source=source, perspective=perspective))
+            if len(results) >= limit:
+                break
+        return results
+
+    async def search(self, query: str, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+        return {perspective: self.search_perspective(query, perspective) for perspective in perspectives}
+
+    def import_jsonl(self, path: str, perspective: Optional[PerspectiveType] = None) -> int:
+        """
+        Bulk-imports articles from a JSON Lines dump.
+
+        Each line needs url, title and snippet (or text); perspective comes
+        from the line's "perspective" field or the perspective argument.
+        Malformed lines are skipped with a warning.
+
+        Returns:
+            Number of documents written
+        """
+        batch: List[Evidence] = []
+        written = 0
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    batch.append(Evidence(
+                        url=record["url"],
+                        title=record.get("title", ""),
+                        snippet=record.get("snippet") or record.get("text", ""),
+                        source=record.get("source") or urlparse(record["url"]).hostname or "",
+                        perspective=PerspectiveType(record["perspective"]) if record.get("perspective") else perspective,
+                    ))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning("Skipping line %d of %s: %s", line_number, path, e)
+                    continue
+                if len(batch) >= 500:
+                    written += self.add(batch)
+                    batch = []
+        return written + self.add(batch)
+
+    def count(self) -> Dict[str, int]:
+        """Documents stored per perspective."""
+        with self._lock:
+            rows = self._conn.execute("SELECT perspective, COUNT(*) FROM documents GROUP BY perspective").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main() -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Manage the local evidence index.")
+    parser.add_argument("--db", default=settings.EVIDENCE_INDEX_PATH, help="Index file (default: EVIDENCE_INDEX_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Import a JSON Lines article dump")
+    import_parser.add_argument("path")
+    import_parser.add_argument(
+        "--perspective",
+        choices=[p.value for p in PerspectiveType],
+        help="Perspective for lines without a perspective field",
+    )
+    commands.add_parser("stats", help="Show documents per perspective")
+    args = parser.parse_args()
+
+    index = LocalEvidenceIndex(args.db)
+    try:
+        if args.command == "import":
+            perspective = PerspectiveType(args.perspective) if args.perspective else None
+            print(f"Imported {index.import_jsonl(args.path, perspective)} documents into {args.db}")
+        else:
+            for name, count in sorted(index.count().items()):
+                print(f"{name:<20} {count}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
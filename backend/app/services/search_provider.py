@@ -0,0 +1,104 @@
+"""
+Search provider interface for evidence retrieval.
+
+A provider returns evidence for a query per perspective. Google Custom
+Search (EvidenceRetriever) and the local full-text index
+(LocalEvidenceIndex) implement it; TieredSearchProvider chains providers so
+a cheap tier answers first and later tiers only fill the gaps.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from app.core.tracing import start_span
+from app.models.schemas import Claim, Evidence, PerspectiveType
+
+if TYPE_CHECKING:
+    from app.services.local_evidence_index import LocalEvidenceIndex
+
+logger = logging.getLogger(__name__)
+
+# Results kept per perspective
+RESULTS_PER_PERSPECTIVE = 3
+
+# A tier's answer for a perspective is enough when it has this many results
+TIER_MIN_RESULTS = 2
+
+# Search APIs reject long queries; claims are cut to this many characters
+MAX_QUERY_LENGTH = 100
+
+
+class SearchProvider(ABC):
+    name = "search"
+
+    @abstractmethod
+    async def search(self, query: str, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+        """
+        Searches for evidence for every perspective.
+
+        Returns:
+            Evidence per perspective, at most RESULTS_PER_PERSPECTIVE each;
+            perspectives with no results map to an empty list
+        """
+
+    async def retrieve_evidence(self, claim: Claim, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+        """
+        Retrieves evidence for a claim across multiple perspectives.
+        """
+        # Use the claim text as the query.
+        # In a real app, we might want to summarize or extract keywords from the claim text first.
+        query = claim.text
+
+        # Truncate query if too long (Google limit is around 2048 chars, but practical limit is lower)
+        if len(query) > MAX_QUERY_LENGTH:
+            query = query[:MAX_QUERY_LENGTH]
+
+        return await self.search(query, perspectives)
+
+
+class TieredSearchProvider(SearchProvider):
+    """
+    Queries providers in order; each later tier only searches perspectives
+    the earlier tiers left with fewer than min_results results.
+
+    Evidence found by later tiers is added to write_through (normally the
+    local index that serves as the first tier), so repeated topics are
+    answered locally next time.
+    """
+
+    name = "tiered"
+
+    def __init__(
+        self,
+        tiers: List[SearchProvider],
+        write_through: Optional["LocalEvidenceIndex"] = None,
+        min_results: int = TIER_MIN_RESULTS,
+    ):
+        self.tiers = tiers
+        self.write_through = write_through
+        self.min_results = min_results
+
+    async def search(self, query: str, perspectives: List[PerspectiveType]) -> Dict[PerspectiveType, List[Evidence]]:
+        results: Dict[PerspectiveType, List[Evidence]] = {perspective: [] for perspective in perspectives}
+        for tier in self.tiers:
+            short = [p for p in perspectives if len(results[p]) < self.min_results]
+            if not short:
+                break
+            with start_span("search_tier", provider=tier.name, perspective_count=len(short)):
+                found = await tier.search(query, short)
+
+            for perspective in short:
+                seen = {evidence.url for evidence in results[perspective]}
+                for evidence in found.get(perspective, []):
+                    if evidence.url not in seen and len(results[perspective]) < RESULTS_PER_PERSPECTIVE:
+                        results[perspective].append(evidence)
+                        seen.add(evidence.url)
+
+            if self.write_through is not None and tier is not self.write_through:
+                try:
+                    self.write_through.add(e for evidence in found.values() for e in evidence)
+                except Exception as e:
+                    # The index is an optimization; never fail retrieval over it
+                    logger.error("Failed to add evidence to the local index: %s", str(e), exc_info=True)
+        return results
@@ -0,0 +1,156 @@
+"""
+Local claim-to-timestamp alignment.
+
+Instead of asking the LLM to convert "[MM:SS]" markers into seconds, each
+extracted claim is matched back to the transcript: the claim's word n-grams
+are looked up in an index over the caption segments, every hit votes for the
+transcript position where the claim would start, and the densest cluster of
+votes gives the segments (and so the times) the claim was taken from.
+
+Paraphrased claims still align as long as a fraction of their n-grams appear
+verbatim; otherwise the claim's context, which is usually quoted, is tried.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.schemas import Claim, CompactedTranscript, Transcript, TranscriptSegment
+from app.utils.text_similarity import tokenize
+
+# Tried in order; bigrams only when no trigram cluster is good enough
+NGRAM_SIZES = (3, 2)
+
+# Share of a claim's n-grams that must fall in the best cluster
+MIN_MATCH_RATIO = 0.25
+
+# How far (in words) votes may drift from each other and still count as one
+# match, to absorb words the claim inserts or drops
+MIN_ANCHOR_TOLERANCE = 4
+
+
+@dataclass
+class Alignment:
+    start: float
+    end: float
+    score: float
+    first_segment: int
+    last_segment: int
+
+
+def _ngrams(tokens: Sequence[str], n: int) -> List[Tuple[str, ...]]:
+    return [tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+
+
+class TranscriptIndex:
+    """N-gram index over transcript segments, mapping word positions back to segments."""
+
+    def __init__(self, segments: Sequence[TranscriptSegment]):
+        self.segments = list(segments)
+        self._tokens: List[str] = []
+        self._token_segment: List[int] = []
+        for index, segment in enumerate(self.segments):
+            for token in tokenize(segment.text):
+                self._tokens.append(token)
+                self._token_segment.append(index)
+        self._postings: Dict[int, Dict[Tuple[str, ...], List[int]]] = {}
+
+    @classmethod
+    def for_transcript(cls, transcript: Transcript) -> "TranscriptIndex":
+        """Index the finest-grained segments available for a transcript."""
+        if isinstance(transcript, CompactedTranscript):
+            return cls(transcript.original_segments)
+        return cls(transcript.segments)
+
+    def _postings_for(self, n: int) -> Dict[Tuple[str, ...], List[int]]:
+        postings = self._postings.get(n)
+        if postings is None:
+            postings = defaultdict(list)
+            for position, gram in enumerate(_ngrams(self._tokens, n)):
+                postings[gram].append(position)
+            self._postings[n] = postings
+        return postings
+
+    def align(self, text: str) -> Optional[Alignment]:
+        """
+        Find where text occurs in the transcript.
+
+        Returns:
+            The best matching span, or None if too few n-grams match
+        """
+        tokens = tokenize(text)
+        tolerance = max(MIN_ANCHOR_TOLERANCE, len(tokens) // 2)
+        for n in NGRAM_SIZES:
+            grams = _ngrams(tokens, n)
+            if not grams:
+                continue
+            postings = self._postings_for(n)
+
+            # (anchor, position, offset): a hit at transcript position for the
+            # gram at claim offset implies the claim starts at position - offset
+            votes = []
+            for offset, gram in enumerate(grams):
+                for position in postings.get(gram, ()):
+                    votes.append((position - offset, position, offset))
+            if not votes:
+                continue
+            votes.sort()
+
+            # Sliding window over anchors, scored by distinct claim offsets so
+            # repeated rolling-caption text does not count twice
+            best_score, best_window = 0, (0, 0)
+            offsets: Counter = Counter()
+            low = 0
+            for high, (anchor, _, offset) in enumerate(votes):
+                offsets[offset] += 1
+                while votes[low][0] < anchor - tolerance:
+                    low_offset = votes[low][2]
+                    offsets[low_offset] -= 1
+                    if not offsets[low_offset]:
+                        del offsets[low_offset]
+                    low += 1
+                if len(offsets) > best_score:
+                    best_score, best_window = len(offsets), (low, high + 1)
+
+            score = best_score / len(grams)
+            if score < MIN_MATCH_RATIO:
+                continue
+
+            positions = [position for _, position, _ in votes[best_window[0]:best_window[1]]]
+            first = self._token_segment[min(positions)]
+            last = self._token_segment[max(positions) + n - 1]
+            end_segment = self.segments[last]
+            return Alignment(
+                start=self.segments[first].start,
+                end=end_segment.start + end_segment.duration,
+                score=score,
+                first_segment=first,
+                last_segment=last,
+            )
+        return None
+
+
+def align_claims(claims: List[Claim], transcript: Transcript) -> int:
+    """
+    Set each claim's timestamps from where its text (or context) occurs in the transcript.
+
+    Claims that cannot be aligned keep whatever timestamps they already had.
+
+    Returns:
+        Number of claims aligned
+    """
+    if not claims:
+        return 0
+    index = TranscriptIndex.for_transcript(transcript)
+    aligned = 0
+    for claim in claims:
+        alignment = index.align(claim.text)
+        if alignment is None and claim.context:
+            # Summarized claims: the quoted context still pins down the span
+            alignment = index.align(claim.context)
+        if alignment is None:
+            continue
+        claim.timestamp_start = alignment.start
+        claim.timestamp_end = alignment.end
+        aligned += 1
+    return aligned
@@ -0,0 +1,67 @@
+"""
+Within-video claim deduplication.
+
+The extractor often returns the same point twice (a statistic restated later
+in the video, a conclusion repeating an earlier claim). Each claim costs four
+searches and five LLM calls downstream, so near-duplicates are merged first
+using TF-IDF cosine similarity over the claims' words. With a handful of
+claims per video, pairwise comparison is cheaper than any index.
+"""
+
+from collections import Counter
+from typing import Dict, List
+
+from app.models.schemas import Claim
+from app.utils.text_similarity import cosine, facts_conflict, terms, tfidf_vectors
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+
+
+def dedupe_claims(claims: List[Claim], threshold: float = DEFAULT_SIMILARITY_THRESHOLD) -> List[Claim]:
+    """
+    Merge near-duplicate claims, keeping the first occurrence of each.
+
+    A claim joins the first earlier cluster whose representative it matches
+    at or above threshold, unless the two state different numbers or
+    negations (see text_similarity.facts_conflict). The surviving claim gets every timestamp range of
+    its cluster in timestamp_ranges, with timestamp_start/end set to the
+    earliest one.
+
+    Returns:
+        Claims in their original order, without the merged duplicates
+    """
+    if len(claims) < 2:
+        return claims
+
+    term_counts = [Counter(terms(claim.text)) for claim in claims]
+    vectors = tfidf_vectors(term_counts)
+    representatives: List[int] = []
+    clusters: Dict[int, List[int]] = {}
+    for i, vector in enumerate(vectors):
+        for rep in representatives:
+            # Similar wording with a different number or negation is a different claim
+            if cosine(vectors[rep], vector) >= threshold and not facts_conflict(
+                term_counts[rep].keys(), term_counts[i].keys()
+            ):
+                clusters[rep].append(i)
+                break
+        else:
+            representatives.append(i)
+            clusters[i] = [i]
+
+    deduped = []
+    for rep in representatives:
+        claim = claims[rep]
+        members = clusters[rep]
+        if len(members) > 1:
+            ranges = sorted({
+                (claims[m].timestamp_start, claims[m].timestamp_end)
+                for m in members
+                if claims[m].timestamp_start is not None and claims[m].timestamp_end is not None
+            })
+            update = {"timestamp_ranges": ranges}
+            if ranges:
+                update["timestamp_start"], update["timestamp_end"] = ranges[0]
+            claim = claim.model_copy(update=update)
+        deduped.append(claim)
+    return deduped
@@ -0,0 +1,47 @@
+"""
+Playback-aware claim ordering.
+
+When the client sends the viewer's playback position, claims are analyzed
+nearest-first so the ones on screen (or coming up) are published before
+the rest. A claim spanning the position is distance 0; claims ahead count
+their distance in seconds; claims already behind the viewer count
+BEHIND_PENALTY times their distance, so something just ahead beats
+something equally far back. Claims without timestamps go last.
+"""
+
+import math
+from typing import List, Optional
+
+from app.models.schemas import Claim
+
+BEHIND_PENALTY = 3.0
+
+
+def _ranges(claim: Claim) -> List[tuple]:
+    if claim.timestamp_ranges:
+        return claim.timestamp_ranges
+    if claim.timestamp_start is None:
+        return []
+    end = claim.timestamp_end if claim.timestamp_end is not None else claim.timestamp_start
+    return [(claim.timestamp_start, end)]
+
+
+def playback_distance(claim: Claim, position: float) -> float:
+    """Weighted distance in seconds from the playback position to the claim's nearest occurrence."""
+    distances = []
+    for start, end in _ranges(claim):
+        if start <= position <= end:
+            return 0.0
+        distances.append(start - position if start > position else (position - end) * BEHIND_PENALTY)
+    return min(distances, default=math.inf)
+
+
+def schedule_claims(claims: List[Claim], position: Optional[float]) -> List[Claim]:
+    """
+    Claims in analysis order: nearest to the playback position first.
+
+    Without a position the extraction order is kept.
+    """
+    if position is None:
+        return list(claims)
+    return sorted(claims, key=lambda claim: playback_distance(claim, position))
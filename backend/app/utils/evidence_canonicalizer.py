@@ -0,0 +1,131 @@
+"""
+Evidence URL canonicalization and cross-perspective deduplication.
+
+The same article often comes back several times per claim: with tracking
+parameters, as an AMP or mobile variant, or as a wire story syndicated
+across sites that fall under different perspectives. Before evidence
+reaches the prompts and the response payload:
+
+- evidence whose canonical key was already seen is dropped. The key is
+  the URL with tracking parameters, fragments and AMP markers removed, the
+  remaining query sorted and www./m./amp. host prefixes stripped; the
+  evidence keeps its original URL, since the publisher may need those
+  parameters to serve the page;
+- evidence whose snippet nearly duplicates an earlier one (word 3-shingle
+  Jaccard similarity) is dropped, which catches syndicated copies.
+
+The first occurrence wins, in perspective order then rank order.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.models.schemas import Evidence, PerspectiveType
+from app.utils.text_similarity import tokenize
+
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ocid", "cmpid", "smid", "smtyp", "ref", "ref_src", "referrer", "taid",
+    "guccounter", "guce_referrer", "guce_referrer_sig", "share", "s_cid", "icid",
+})
+TRACKING_PREFIXES = ("utm_", "__twitter", "_hs", "pk_")
+
+# Query markers that only select an AMP rendering
+AMP_PARAMS = frozenset({"amp", "outputtype", "amp_js_v", "usqp"})
+
+# Host prefixes for mobile and AMP variants of the same site
+VARIANT_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_SIMILARITY = 0.6
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name in AMP_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def clean_url(url: str) -> str:
+    """
+    Remove tracking parameters, fragments and AMP path/query markers from a URL.
+
+    The host is kept as is so the link still resolves.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.scheme or not parts.netloc:
+        return url
+    path = parts.path
+    # /amp/story, /story/amp, /story.amp
+    path = re.sub(r"^/amp(?=/)", "", path)
+    path = re.sub(r"/amp/?$", "", path)
+    path = re.sub(r"\.amp(?=$|\.html?$)", "", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path or "/", urlencode(query), ""))
+
+
+def canonical_key(url: str) -> str:
+    """Dedup key for a URL: cleaned, scheme-less, with www./m./amp. host prefixes removed."""
+    parts = urlsplit(clean_url(url))
+    host = parts.netloc
+    stripped = True
+    while stripped:
+        stripped = False
+        for prefix in VARIANT_HOST_PREFIXES:
+            if host.startswith(prefix) and host.count(".") > 1:
+                host = host[len(prefix):]
+                stripped = True
+    return f"{host}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _shingles(text: str) -> FrozenSet[Tuple[str, ...]]:
+    words = tokenize(text)
+    if len(words) < SHINGLE_SIZE:
+        return frozenset([tuple(words)]) if words else frozenset()
+    return frozenset(tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+
+
+def _similar(a: FrozenSet, b: FrozenSet) -> bool:
+    if not a or not b:
+        return False
+    # Containment of the shorter snippet also counts: search snippets are cut
+    # at different points for the same text
+    overlap = len(a & b)
+    return overlap / len(a | b) >= NEAR_DUPLICATE_SIMILARITY or overlap / min(len(a), len(b)) >= 0.9
+
+
+def dedupe_evidence(
+    evidence_by_perspective: Dict[PerspectiveType, List[Evidence]],
+) -> Dict[PerspectiveType, List[Evidence]]:
+    """
+    Drop duplicate evidence across all perspectives.
+
+    URLs are compared by canonical_key only; kept evidence is returned
+    unchanged. System notices (e.g. the search quota message) are passed
+    through.
+
+    Returns:
+        Evidence per perspective, in the original order
+    """
+    seen_keys = set()
+    seen_snippets: List[FrozenSet] = []
+    results = {}
+    for perspective, items in evidence_by_perspective.items():
+        kept = []
+        for evidence in items:
+            if evidence.source == "System":
+                kept.append(evidence)
+                continue
+            key = canonical_key(evidence.url)
+            if key in seen_keys:
+                continue
+            shingles = _shingles(f"{evidence.title} {evidence.snippet}")
+            if any(_similar(shingles, earlier) for earlier in seen_snippets):
+                continue
+            seen_keys.add(key)
+            seen_snippets.append(shingles)
+            kept.append(evidence)
+        results[perspective] = kept
+    return results
@@ -0,0 +1,107 @@
+"""
+Local relevance filtering of retrieved evidence.
+
+Search results often include snippets unrelated to the claim. Before any
+LLM analysis, every snippet retrieved for a claim (across all
+perspectives) is scored against the claim by TF-IDF cosine similarity in
+one batch; low scorers are dropped and the rest are ranked best first. A
+perspective left with no evidence is then answered without an LLM call.
+
+NumPy does the batch as a single matrix product when installed; a
+pure-Python path gives the same scores otherwise.
+"""
+
+from collections import Counter
+from typing import Dict, List, Sequence
+
+from app.models.schemas import Evidence, PerspectiveType
+from app.utils.text_similarity import cosine, stem, terms, tfidf_vectors
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_MIN_RELEVANCE = 0.1
+
+
+def _terms(text: str) -> List[str]:
+    return [stem(t) for t in terms(text)]
+
+
+def _scores_numpy(term_counts: List[Counter]) -> List[float]:
+    vocabulary: Dict[str, int] = {}
+    for counts in term_counts:
+        for term in counts:
+            vocabulary.setdefault(term, len(vocabulary))
+    if not vocabulary:
+        return [0.0] * (len(term_counts) - 1)
+
+    matrix = np.zeros((len(term_counts), len(vocabulary)))
+    for row, counts in enumerate(term_counts):
+        for term, count in counts.items():
+            matrix[row, vocabulary[term]] = count
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(term_counts)) / (1 + document_frequency)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    return (matrix[1:] @ matrix[0]).tolist()
+
+
+def _scores_python(term_counts: List[Counter]) -> List[float]:
+    vectors = tfidf_vectors(term_counts)
+    return [cosine(vectors[0], vector) for vector in vectors[1:]]
+
+
+def relevance_scores(claim_text: str, evidence: Sequence[Evidence]) -> List[float]:
+    """
+    TF-IDF cosine similarity of each evidence item's title and snippet to the claim.
+
+    IDF is taken over the claim and the given evidence, so terms every
+    snippet shares (e.g. the topic itself) weigh less than distinguishing ones.
+    """
+    if not evidence:
+        return []
+    term_counts = [Counter(_terms(claim_text))]
+    term_counts.extend(Counter(_terms(f"{e.title} {e.snippet}")) for e in evidence)
+    if NUMPY_AVAILABLE:
+        return _scores_numpy(term_counts)
+    return _scores_python(term_counts)
+
+
+def filter_relevant_evidence(
+    claim_text: str,
+    evidence_by_perspective: Dict[PerspectiveType, List[Evidence]],
+    min_relevance: float = DEFAULT_MIN_RELEVANCE,
+) -> Dict[PerspectiveType, List[Evidence]]:
+    """
+    Drop evidence scoring below min_relevance and rank the rest, per perspective.
+
+    All perspectives are scored in one batch. System notices (e.g. the search
+    quota message) are kept as they are.
+
+    Returns:
+        Evidence per perspective, most relevant first
+    """
+    flat = [
+        (perspective, e)
+        for perspective, items in evidence_by_perspective.items()
+        for e in items
+        if e.source != "System"
+    ]
+    scores = relevance_scores(claim_text, [e for _, e in flat])
+
+    ranked: Dict[PerspectiveType, List[tuple]] = {perspective: [] for perspective in evidence_by_perspective}
+    for (perspective, e), score in zip(flat, scores):
+        if score >= min_relevance:
+            ranked[perspective].append((score, e))
+
+    results = {}
+    for perspective, items in evidence_by_perspective.items():
+        system = [e for e in items if e.source == "System"]
+        kept = sorted(ranked[perspective], key=lambda entry: entry[0], reverse=True)
+        results[perspective] = system + [e for _, e in kept]
+    return results
@@ -0,0 +1,42 @@
+"""
+HTTP caching helpers for pre-serialized API responses.
+
+Completed analysis results never change, so they are serialized once and
+served as raw bytes together with a strong ETag. These helpers compute the
+ETag and evaluate ``If-None-Match`` request headers against it.
+"""
+
+import hashlib
+from typing import Optional
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Compute a strong ETag for a response body.
+
+    The tag is derived from the exact bytes sent to the client, so two
+    responses share a tag only if they are byte-identical.
+    """
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether an ``If-None-Match`` header matches the given ETag.
+
+    Uses the weak comparison required for ``If-None-Match`` (RFC 9110), so a
+    ``W/`` prefix on either side is ignored. ``*`` matches any current
+    representation.
+    """
+    if not if_none_match:
+        return False
+
+    target = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.removeprefix("W/") == target:
+            return True
+    return False
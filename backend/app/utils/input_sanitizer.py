@@ -5,9 +5,12 @@ This module provides functions to sanitize user inputs before they are
 interpolated into LLM prompts, protecting against prompt injection attacks.
 """
 
+import hashlib
 import re
+import threading
 import unicodedata
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
 
 # Constants for delimited sections
 USER_DATA_START = "===USER DATA START==="
@@ -19,6 +22,11 @@ MAX_EVIDENCE_LENGTH = 10000
 MAX_CONTEXT_LENGTH = 2000
 MAX_PERSPECTIVE_LENGTH = 50
 
+# Maximum number of memoized sanitization outcomes (see _SanitizationMemo)
+SANITIZATION_CACHE_SIZE = 2048
+# Longest text kept verbatim in a memo key; longer texts are keyed by digest
+MEMO_KEY_MAX_CHARS = 512
+
 # Suspicious patterns that might indicate injection attempts
 SUSPICIOUS_PATTERNS = [
     r'ignore\s+(previous|above|all)\s+instructions?',
@@ -38,29 +46,182 @@ SUSPICIOUS_PATTERNS = [
     r'act\s+as\s+a',
 ]
 
+_REGEX_METACHARS = frozenset(".^$*+?{}[]|()\\")
+_OPTIONAL_QUANTIFIERS = frozenset("?*{")
+
+
+def _required_symbols(pattern: str) -> frozenset:
+    """
+    Return the non-alphanumeric literal characters every match of pattern must contain.
+
+    Only top-level literals are considered (groups and character classes are
+    skipped, as is any literal made optional by ``?``, ``*`` or ``{``). Symbols
+    such as ``:``, ``<``, ``[``, ``#`` and backticks are rare in prose, so a
+    C-level ``in`` check on them rules most patterns out without a regex scan.
+    """
+    symbols = set()
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        literal = None
+        if char == "\\":
+            escaped = pattern[i + 1:i + 2]
+            if escaped and not escaped.isalnum():
+                literal = escaped
+            i += 2
+        elif char == "[":
+            # Skip the character class; escaped ']' doesn't close it
+            i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            depth += 1
+            i += 1
+        elif char == ")":
+            depth -= 1
+            i += 1
+        elif char == "|" and depth == 0:
+            # Top-level alternation: nothing is required by every branch
+            return frozenset()
+        else:
+            if char not in _REGEX_METACHARS:
+                literal = char
+            i += 1
+
+        if literal is None or depth > 0 or literal.isalnum():
+            continue
+        if i < len(pattern) and pattern[i] in _OPTIONAL_QUANTIFIERS:
+            continue
+        symbols.add(literal)
+    return frozenset(symbols)
+
+
+# Precompiled scanners: each pattern is compiled once and paired with the
+# symbols it requires, so a cheap substring check skips the regex scan for
+# patterns that cannot possibly match. Patterns without required symbols
+# (ignore/forget/"you are now"/pretend/"act as") are still searched one by
+# one: each starts with a literal word the re engine can skip ahead to, which
+# a single alternation of them loses (2-10x slower measured on 10k chars).
+_SUSPICIOUS_SCANNERS = [
+    (tuple(_required_symbols(pattern)), re.compile(pattern))
+    for pattern in SUSPICIOUS_PATTERNS
+]
+
+# Joins batch items for a single pattern scan; no suspicious pattern can match
+# a NUL, so matches never span two items
+_BATCH_SEPARATOR = "\x00"
+
+# Matches any character outside printable ASCII and the allowed whitespace;
+# only these need a closer look in contains_control_characters()
+_NON_ASCII_PRINTABLE_RE = re.compile(r"[^\t\n\r\x20-\x7e]")
+
+
 class SanitizationError(ValueError):
     """Raised when input fails sanitization checks."""
     pass
 
 
+# (sanitized text, None) on success or (None, error message) on failure
+SanitizationOutcome = Tuple[Optional[str], Optional[str]]
+
+
+class _SanitizationMemo:
+    """
+    Bounded LRU of sanitization outcomes.
+
+    The same claim is sanitized once per perspective plus once for bias
+    analysis, and popular evidence snippets repeat across claims, so caching
+    outcomes (including rejections) skips the repeated scans and escaping.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, SanitizationOutcome]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[SanitizationOutcome]:
+        with self._lock:
+            outcome = self._entries.get(key)
+            if outcome is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return outcome
+
+    def put(self, key: Hashable, outcome: SanitizationOutcome) -> None:
+        with self._lock:
+            self._entries[key] = outcome
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_sanitization_memo = _SanitizationMemo(SANITIZATION_CACHE_SIZE)
+
+
+def get_sanitization_cache_stats() -> Dict[str, float]:
+    """Return hit/miss counters, size and hit rate of the sanitization memo."""
+    return _sanitization_memo.stats()
+
+
+def clear_sanitization_cache() -> None:
+    """Drop all memoized sanitization outcomes and reset the counters."""
+    _sanitization_memo.clear()
+
+
 def contains_control_characters(text: str) -> bool:
     """Check if text contains control characters (except common whitespace)."""
-    for char in text:
-        category = unicodedata.category(char)
-        # Allow tab, newline, carriage return
-        if char in ['\t', '\n', '\r']:
-            continue
-        # Reject other control characters
-        if category.startswith('C'):
+    # str.isprintable() is False only for "Other" (C*) and separator (Z*)
+    # characters, so printable text can't contain control characters. This
+    # C-level scan covers the common case without touching each character.
+    if text.isprintable():
+        return False
+
+    # Most remaining text is only non-printable because of allowed whitespace
+    if text.replace('\n', '').replace('\t', '').replace('\r', '').isprintable():
+        return False
+
+    # Otherwise classify only the characters outside printable ASCII; tab,
+    # newline and carriage return are allowed and never visited
+    for match in _NON_ASCII_PRINTABLE_RE.finditer(text):
+        char = match.group()
+        if not char.isprintable() and unicodedata.category(char).startswith('C'):
             return True
     return False
 
 
 def contains_suspicious_patterns(text: str) -> bool:
-    """Check if text contains patterns commonly used in injection attacks."""
+    """
+    Check if text contains patterns commonly used in injection attacks.
+
+    Each pattern whose required symbols all occur in the text gets its own
+    regex search; see _SUSPICIOUS_SCANNERS.
+    """
     text_lower = text.lower()
-    for pattern in SUSPICIOUS_PATTERNS:
-        if re.search(pattern, text_lower):
+    for required_symbols, regex in _SUSPICIOUS_SCANNERS:
+        if all(symbol in text_lower for symbol in required_symbols) and regex.search(text_lower):
             return True
     return False
 
@@ -119,6 +280,23 @@ def truncate_text(text: str, max_length: int) -> str:
     return truncated + "..."
 
 
+def _escape_and_truncate(text: str, max_length: int) -> str:
+    """
+    Escape text and truncate it to max_length.
+
+    Produces the same result as truncate_text(escape_special_characters(text)),
+    but only escapes the part of the text that can survive truncation.
+    """
+    # Normalize newlines up front: after that escaping never shrinks the text,
+    # so anything past the first max_length + 1 characters is cut off anyway
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if len(text) > max_length + 1:
+        text = text[:max_length + 1]
+
+    return truncate_text(escape_special_characters(text), max_length)
+
+
 def sanitize_input(
     text: str,
     max_length: int,
@@ -161,18 +339,90 @@ def sanitize_input(
             f"{field_name} contains patterns that may indicate a prompt injection attempt"
         )
     
-    # Escape special characters
-    text = escape_special_characters(text)
-    
-    # Truncate if needed (after escaping to ensure final length constraint)
-    text = truncate_text(text, max_length)
-    
-    return text
+    # Escape special characters, then truncate if needed (after escaping to
+    # ensure final length constraint)
+    return _escape_and_truncate(text, max_length)
+
+
+def _memo_key(
+    field_name: str,
+    max_length: int,
+    allow_suspicious_patterns: bool,
+    allow_control_chars: bool,
+    text: str
+) -> Hashable:
+    """
+    Memo key: the field type (name and options) plus the raw text.
+
+    Texts longer than MEMO_KEY_MAX_CHARS are keyed by a blake2b digest
+    instead, so the memo never holds more than that per entry however large
+    the inputs are.
+    """
+    if len(text) > MEMO_KEY_MAX_CHARS:
+        text = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return (field_name, max_length, allow_suspicious_patterns, allow_control_chars, text)
+
+
+def _sanitize_and_memoize(
+    key: Hashable,
+    text: str,
+    max_length: int,
+    field_name: str,
+    allow_suspicious_patterns: bool = False,
+    allow_control_chars: bool = False
+) -> SanitizationOutcome:
+    """Run sanitize_input() on a memo miss and store the outcome under key."""
+    try:
+        outcome = (
+            sanitize_input(
+                text, max_length, field_name, allow_suspicious_patterns, allow_control_chars
+            ),
+            None,
+        )
+    except SanitizationError as e:
+        outcome = (None, str(e))
+    _sanitization_memo.put(key, outcome)
+    return outcome
+
+
+def _unwrap(outcome: SanitizationOutcome) -> str:
+    """Return the sanitized text of an outcome, or re-raise its rejection."""
+    result, error = outcome
+    if error is not None:
+        raise SanitizationError(error)
+    return result
+
+
+def _sanitize_memoized(
+    text: str,
+    max_length: int,
+    field_name: str,
+    allow_suspicious_patterns: bool = False,
+    allow_control_chars: bool = False
+) -> str:
+    """
+    Memoized sanitize_input() keyed by field type plus text.
+
+    Rejections are cached too and re-raised as a fresh SanitizationError.
+    """
+    if not isinstance(text, str):
+        # Unhashable or otherwise invalid input; let sanitize_input reject it
+        return sanitize_input(
+            text, max_length, field_name, allow_suspicious_patterns, allow_control_chars
+        )
+
+    key = _memo_key(field_name, max_length, allow_suspicious_patterns, allow_control_chars, text)
+    outcome = _sanitization_memo.get(key)
+    if outcome is None:
+        outcome = _sanitize_and_memoize(
+            key, text, max_length, field_name, allow_suspicious_patterns, allow_control_chars
+        )
+    return _unwrap(outcome)
 
 
 def sanitize_claim_text(claim_text: str) -> str:
     """Sanitize claim text for use in prompts."""
-    return sanitize_input(
+    return _sanitize_memoized(
         claim_text,
         max_length=MAX_CLAIM_LENGTH,
         field_name="Claim text",
@@ -183,7 +433,7 @@ def sanitize_claim_text(claim_text: str) -> str:
 
 def sanitize_perspective_value(perspective_value: str) -> str:
     """Sanitize perspective value for use in prompts."""
-    return sanitize_input(
+    return _sanitize_memoized(
         perspective_value,
         max_length=MAX_PERSPECTIVE_LENGTH,
         field_name="Perspective value",
@@ -194,7 +444,7 @@ def sanitize_perspective_value(perspective_value: str) -> str:
 
 def sanitize_evidence_text(evidence_text: str) -> str:
     """Sanitize evidence text for use in prompts."""
-    return sanitize_input(
+    return _sanitize_memoized(
         evidence_text,
         max_length=MAX_EVIDENCE_LENGTH,
         field_name="Evidence text",
@@ -203,11 +453,64 @@ def sanitize_evidence_text(evidence_text: str) -> str:
     )
 
 
+def _evidence_memo_key(evidence_text: str) -> Hashable:
+    """Memo key used by sanitize_evidence_text() for the same text."""
+    return _memo_key("Evidence text", MAX_EVIDENCE_LENGTH, False, False, evidence_text)
+
+
+def sanitize_evidence_batch(evidence_texts: List[str]) -> List[str]:
+    """
+    Sanitize a list of evidence texts for use in prompts.
+
+    Equivalent to calling sanitize_evidence_text() on each item, but items
+    already in the memo are served from it and the control-character and
+    suspicious-pattern scans run once over the remaining items together
+    instead of once per item.
+
+    Raises:
+        SanitizationError: If any item fails validation (the same error the
+            per-item path would raise first)
+    """
+    keys = [_evidence_memo_key(text) if isinstance(text, str) else None for text in evidence_texts]
+    outcomes = [_sanitization_memo.get(key) if key is not None else None for key in keys]
+    pending = [i for i, outcome in enumerate(outcomes) if outcome is None]
+    stripped = [
+        evidence_texts[i].strip() if isinstance(evidence_texts[i], str) else ""
+        for i in pending
+    ]
+
+    if (
+        any(outcome is not None and outcome[1] is not None for outcome in outcomes)
+        or not all(stripped)
+        or contains_control_characters("\n".join(stripped))
+        or contains_suspicious_patterns(_BATCH_SEPARATOR.join(stripped))
+    ):
+        # Re-run item by item so the error matches the per-item path exactly,
+        # reusing the lookups above so each item counts once in the stats
+        results = []
+        for text, key, outcome in zip(evidence_texts, keys, outcomes):
+            if key is None:
+                # Non-string item; sanitize_input rejects it
+                results.append(sanitize_input(text, MAX_EVIDENCE_LENGTH, "Evidence text"))
+                continue
+            if outcome is None:
+                outcome = _sanitize_and_memoize(key, text, MAX_EVIDENCE_LENGTH, "Evidence text")
+            results.append(_unwrap(outcome))
+        return results
+
+    for i, text in zip(pending, stripped):
+        result = _escape_and_truncate(text, MAX_EVIDENCE_LENGTH)
+        _sanitization_memo.put(keys[i], (result, None))
+        outcomes[i] = (result, None)
+
+    return [result for result, _ in outcomes]
+
+
 def sanitize_context(context: Optional[str]) -> str:
     """Sanitize context text for use in prompts."""
     if not context:
         return ""
-    return sanitize_input(
+    return _sanitize_memoized(
         context,
         max_length=MAX_CONTEXT_LENGTH,
         field_name="Context",
@@ -0,0 +1,109 @@
+"""
+LLM prompt templates with a static, cache-friendly prefix.
+
+Providers cache prompt prefixes (OpenAI automatic prompt caching, Gemini
+implicit caching): a request whose leading tokens match a recent request is
+billed and processed faster for the matched part. A template therefore
+renders into a system prompt holding everything static (role, instructions,
+output format), byte-identical across calls, and a user prompt holding only
+the per-request data, wrapped in user-data delimiters. Sections are rendered
+in the template's order; put the lowest-cardinality data first so
+consecutive calls share longer prefixes.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+from app.utils.input_sanitizer import wrap_user_data
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    system: str
+    # (field, label) pairs rendered into the user prompt, in order
+    sections: Tuple[Tuple[str, str], ...]
+
+    def render(self, **data: str) -> Tuple[str, str]:
+        """
+        Render the template for one request.
+
+        Returns:
+            (system_prompt, user_prompt); system_prompt is the same for every call
+
+        Raises:
+            KeyError: If a section's field is missing from data
+        """
+        user_prompt = "\n\n".join(wrap_user_data(data[field], label) for field, label in self.sections)
+        return self.system, user_prompt
+
+
+PERSPECTIVE_ANALYSIS = PromptTemplate(
+    name="perspective_analysis",
+    system="""You are an objective analyst. Your task is to analyze a claim based on evidence from a specific perspective.
+
+INSTRUCTIONS:
+1. Read the perspective, claim and evidence provided in the USER DATA sections of the user message
+2. Based ONLY on the provided evidence, determine if this perspective SUPPORTS, REFUTES, or is AMBIGUOUS regarding the claim
+3. Provide a confidence score (0.0 to 1.0) and a brief explanation
+4. Output your analysis in the specified JSON format
+
+OUTPUT FORMAT (JSON):
+{
+    "stance": "Support" | "Refute" | "Ambiguous",
+    "confidence": float,
+    "explanation": "string"
+}""",
+    sections=(("perspective", "PERSPECTIVE"), ("claim", "CLAIM"), ("evidence", "EVIDENCE")),
+)
+
+BIAS_ANALYSIS = PromptTemplate(
+    name="bias_analysis",
+    system="""You are a bias and deception analyst. Your task is to analyze text for various forms of bias and potential deception.
+
+INSTRUCTIONS:
+1. Read the claim and context provided in the USER DATA sections of the user message
+2. Evaluate the following aspects:
+   - Framing Bias (loaded language, emotional appeals)
+   - Sourcing Bias (if sources are mentioned)
+   - Omission Bias (cherry-picking)
+   - Sensationalism (clickbait style)
+   - Deception Rating (0-10, where 10 is highly deceptive/intentional lie)
+3. Output your analysis in the specified JSON format
+
+OUTPUT FORMAT (JSON):
+{
+    "framing_bias": "string or null",
+    "sourcing_bias": "string or null",
+    "omission_bias": "string or null",
+    "sensationalism": "string or null",
+    "deception_rating": float,
+    "deception_rationale": "string"
+}""",
+    sections=(("claim", "CLAIM TEXT"), ("context", "CONTEXT")),
+)
+
+CLAIM_EXTRACTION = PromptTemplate(
+    name="claim_extraction",
+    system="""You are an expert content analyst. Your task is to analyze a video transcript and extract the key claims made by the speaker.
+
+INSTRUCTIONS:
+1. Identify distinct, verifiable claims or strong arguments in the TRANSCRIPT section of the user message.
+2. Ignore filler, introductions, questions, or purely descriptive text.
+3. For each claim, provide:
+   - The exact text of the claim (or a concise summary if the speaker is verbose).
+   - The context: the surrounding transcript text, quoted verbatim.
+4. Extract between 3 and 7 most important claims.
+5. Output valid JSON.
+
+OUTPUT FORMAT (JSON):
+{
+    "claims": [
+        {
+            "text": "string",
+            "context": "string"
+        }
+    ]
+}""",
+    sections=(("transcript", "TRANSCRIPT"),),
+)
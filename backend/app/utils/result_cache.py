@@ -0,0 +1,57 @@
+"""
+Completed analysis results by video ID.
+
+Filled by every complete (non-partial) job, interactive or prefetched, and
+consulted when a job is created: a hit returns a completed job immediately
+instead of re-running the pipeline.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.models.schemas import AnalysisResponse
+
+
+class ResultCache:
+    """Bounded LRU of analysis results with a time-to-live."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, AnalysisResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video_id: str) -> Optional[AnalysisResponse]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[video_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(video_id)
+            self.hits += 1
+            return entry[1]
+
+    def __contains__(self, video_id: str) -> bool:
+        """Whether a fresh result is cached, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            return entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds
+
+    def put(self, video_id: str, result: AnalysisResponse) -> None:
+        with self._lock:
+            self._entries[video_id] = (time.monotonic(), result)
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,207 @@
+"""
+Schema-enforced LLM output.
+
+Each response format is a pydantic model (see app.models.schemas). A
+StructuredOutput compiles it once into a TypeAdapter for validation and into
+the provider request formats: an OpenAI strict json_schema response format
+and a Gemini response_schema (the OpenAPI subset the SDK accepts).
+
+call_structured validates the response and, when it does not match, makes
+one repair call that echoes the invalid response and the validation errors,
+instead of failing the whole analysis.
+
+Schemas are only sent to models known to accept them (SCHEMA_OUTPUT_MODELS);
+other models get plain JSON mode, and their responses are validated all the
+same. A provider rejecting a schema switches the service to JSON mode too.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Type, TypeVar
+
+from app.core.metrics import record_llm_repair
+from app.models.schemas import BiasVerdict, ClaimExtractionResult, PerspectiveVerdict
+from app.utils.input_sanitizer import wrap_user_data
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Keywords neither provider enforces; bounds are checked when validating instead
+DROPPED_KEYWORDS = frozenset({"title", "default", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"})
+
+# Whether a model accepts a response schema (OpenAI json_schema / Gemini
+# response_schema), matched by longest model-name prefix; unknown models don't
+SCHEMA_OUTPUT_MODELS = {
+    "gpt-3.5-turbo": False,
+    "gpt-4": False,
+    "gpt-4o": True,
+    "gpt-4o-2024-05-13": False,
+    "gpt-4.1": True,
+    "gpt-5": True,
+    "o1": True,
+    "o1-mini": False,
+    "o1-preview": False,
+    "o3": True,
+    "o4-mini": True,
+    "gemini-pro": False,
+    "gemini-1.0-pro": False,
+    "gemini-1.5-flash": True,
+    "gemini-1.5-pro": True,
+    "gemini-2.0-flash": True,
+    "gemini-2.5": True,
+}
+
+# Words in a provider's 400 error that mark it as a rejected response format
+SCHEMA_REJECTION_MARKERS = ("response_format", "json_schema", "response_schema", "json mode")
+
+# Validation errors listed in a repair prompt
+MAX_REPORTED_ERRORS = 10
+
+# Characters of the invalid response echoed back in a repair prompt
+MAX_ECHOED_RESPONSE = 4000
+
+
+def _inline_schema(node: Any, defs: Dict[str, Any]) -> Any:
+    """Resolve $refs and drop unsupported keywords."""
+    if isinstance(node, list):
+        return [_inline_schema(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        return _inline_schema(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+    return {
+        key: (_inline_schema(value, defs) if key != "properties" else {
+            name: _inline_schema(prop, defs) for name, prop in value.items()
+        })
+        for key, value in node.items()
+        if key not in DROPPED_KEYWORDS and key != "$defs"
+    }
+
+
+def _openai_schema(node: Any) -> Any:
+    """Strict mode: every property required, no additional properties."""
+    if isinstance(node, list):
+        return [_openai_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    node = {key: _openai_schema(value) for key, value in node.items()}
+    if node.get("type") == "object":
+        node["required"] = list(node.get("properties", {}))
+        node["additionalProperties"] = False
+    return node
+
+
+def _gemini_schema(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Gemini's OpenAPI subset: nullable instead of anyOf with null."""
+    node = dict(node)
+    variants = node.pop("anyOf", None)
+    if variants is not None:
+        types = [variant for variant in variants if variant.get("type") != "null"]
+        node.update(_gemini_schema(types[0]))
+        if len(types) < len(variants):
+            node["nullable"] = True
+    if "items" in node:
+        node["items"] = _gemini_schema(node["items"])
+    if "properties" in node:
+        node["properties"] = {name: _gemini_schema(prop) for name, prop in node["properties"].items()}
+    return node
+
+
+def supports_schema_output(model: str) -> bool:
+    """Whether model accepts response schemas, by longest matching name prefix."""
+    best = ""
+    for prefix in SCHEMA_OUTPUT_MODELS:
+        if model.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return SCHEMA_OUTPUT_MODELS[best] if best else False
+
+
+def schema_output_enabled(setting: Any, model: str) -> bool:
+    """LLM_STRUCTURED_OUTPUT resolved for model: "auto" decides by model, otherwise a boolean."""
+    if isinstance(setting, str):
+        setting = setting.strip().lower()
+        if setting == "auto":
+            return supports_schema_output(model)
+        return setting in ("1", "true", "yes", "on")
+    return bool(setting)
+
+
+def is_schema_rejection(error: Exception) -> bool:
+    """Whether error is a provider refusing the response schema (HTTP 400 naming the format)."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    message = str(error).lower()
+    return status == 400 and any(marker in message for marker in SCHEMA_REJECTION_MARKERS)
+
+
+class StructuredOutput(Generic[T]):
+    def __init__(self, name: str, model: Type[T]):
+        self.name = name
+        self.model = model
+        self.adapter = TypeAdapter(model)
+        full_schema = model.model_json_schema()
+        schema = _inline_schema(full_schema, full_schema.get("$defs", {}))
+        self.openai_response_format = {
+            "type": "json_schema",
+            "json_schema": {"name": name, "schema": _openai_schema(schema), "strict": True},
+        }
+        self.gemini_schema = _gemini_schema(schema)
+
+    def parse(self, content: Optional[str]) -> T:
+        """
+        Raises:
+            ValidationError: If content is not JSON matching the model
+        """
+        return self.adapter.validate_json(content or "")
+
+
+def repair_prompt(prompt: str, content: Optional[str], error: ValidationError) -> str:
+    """The original prompt followed by the invalid response and what was wrong with it."""
+    problems = "\n".join(
+        f"- {'.'.join(str(part) for part in detail['loc']) or '(response)'}: {detail['msg']}"
+        for detail in error.errors()[:MAX_REPORTED_ERRORS]
+    )
+    return (
+        f"{prompt}\n\n"
+        f"{wrap_user_data((content or '')[:MAX_ECHOED_RESPONSE], 'PREVIOUS RESPONSE')}\n\n"
+        "The previous response did not match the required JSON format:\n"
+        f"{problems}\n\n"
+        "Respond again with corrected JSON only."
+    )
+
+
+async def call_structured(
+    call: Callable[[str, Optional[str], "StructuredOutput"], Awaitable[str]],
+    prompt: str,
+    system_prompt: Optional[str],
+    output: StructuredOutput[T],
+    service: str,
+) -> T:
+    """
+    Call the LLM and validate its response, with one repair call if it is invalid.
+
+    call is the service's _call_llm(prompt, system_prompt, output).
+
+    Raises:
+        ValidationError: If the repaired response is still invalid
+    """
+    content = await call(prompt, system_prompt, output)
+    try:
+        return output.parse(content)
+    except ValidationError as e:
+        logger.warning("%s response failed validation, retrying once: %s", output.name, e)
+        error = e
+
+    content = await call(repair_prompt(prompt, content, error), system_prompt, output)
+    try:
+        result = output.parse(content)
+    except ValidationError:
+        record_llm_repair(service, output.name, "failed")
+        raise
+    record_llm_repair(service, output.name, "repaired")
+    return result
+
+
+PERSPECTIVE_OUTPUT = StructuredOutput("perspective_analysis", PerspectiveVerdict)
+BIAS_OUTPUT = StructuredOutput("bias_analysis", BiasVerdict)
+CLAIM_EXTRACTION_OUTPUT = StructuredOutput("claim_extraction", ClaimExtractionResult)
@@ -0,0 +1,98 @@
+"""
+Shared term extraction and similarity measures for the local (non-LLM)
+text comparisons: claim deduplication, the cross-video claim index,
+evidence relevance filtering and the local evidence index.
+
+All of them tokenize the same way (lowercased word characters, minus a
+short stopword list), so a claim's terms mean the same thing everywhere.
+
+Word overlap can't tell "is safe" from "is not safe", or 1.7 trillion from
+3.7 trillion, so the claim comparisons also check the claims' key facts
+(numbers and negations) before treating them as the same claim.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import AbstractSet, Dict, FrozenSet, List, Sequence
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "been", "by", "for", "from",
+    "has", "have", "in", "is", "it", "its", "of", "on", "or", "that", "the",
+    "their", "there", "this", "to", "was", "were", "will", "with",
+})
+
+# Terms that flip a claim's meaning; "t" is the tail of n't contractions as tokenized
+NEGATIONS = frozenset({"not", "no", "never", "nor", "none", "neither", "nobody", "nothing", "without", "t"})
+
+# Prefix length of the crude stem
+STEM_LENGTH = 5
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, stopwords included."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def terms(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords, in order."""
+    return [t for t in tokenize(text) if t not in STOPWORDS]
+
+
+def stem(term: str) -> str:
+    """Five-character prefix as a crude stem, so inflections of longer words meet."""
+    return term[:STEM_LENGTH]
+
+
+def numeric_terms(term_set: AbstractSet[str]) -> FrozenSet[str]:
+    return frozenset(t for t in term_set if any(c.isdigit() for c in t))
+
+
+def negation_terms(term_set: AbstractSet[str]) -> FrozenSet[str]:
+    return frozenset(t for t in term_set if t in NEGATIONS)
+
+
+def key_facts(term_set: AbstractSet[str]) -> FrozenSet[str]:
+    """Numeric and negation terms: the ones that must agree for two claims to say the same thing."""
+    return numeric_terms(term_set) | negation_terms(term_set)
+
+
+def facts_conflict(a: AbstractSet[str], b: AbstractSet[str]) -> bool:
+    """
+    Whether two claims' terms state different facts: different negations, or
+    different numbers where both state some (a restatement may drop the figure).
+    """
+    if negation_terms(a) != negation_terms(b):
+        return True
+    numbers_a, numbers_b = numeric_terms(a), numeric_terms(b)
+    return bool(numbers_a and numbers_b and numbers_a != numbers_b)
+
+
+def tfidf_vectors(term_counts: Sequence[Counter]) -> List[Dict[str, float]]:
+    """L2-normalized TF-IDF vectors, with (smoothed) IDF taken over the given documents."""
+    document_frequency = Counter(term for counts in term_counts for term in counts)
+    total = len(term_counts)
+    vectors = []
+    for counts in term_counts:
+        vector = {
+            term: count * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors.append({term: weight / norm for term, weight in vector.items()} if norm else {})
+    return vectors
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def jaccard(a: AbstractSet[str], b: AbstractSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
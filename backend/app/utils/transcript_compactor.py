@@ -0,0 +1,136 @@
+"""
+Transcript compaction ahead of claim extraction.
+
+YouTube auto-captions arrive as many short, overlapping segments: rolling
+captions repeat the tail of the previous line, and each segment would get
+its own "[MM:SS]" prefix in the prompt. Compaction:
+
+1. strips caption annotations ("[Music]", ">>") and filler words,
+2. drops words that repeat the tail of the text already emitted,
+3. merges what is left into sentence-level units, closing a unit at
+   sentence punctuation, a pause, or a length limit.
+
+Each unit keeps the index range of the segments it was built from, so
+claims can still be mapped back to the original caption times.
+"""
+
+import re
+from collections import deque
+from typing import Deque, List, Sequence, Tuple
+
+from app.models.schemas import CompactedTranscript, Transcript, TranscriptSegment
+
+# Caption annotations and speaker-change markers
+ANNOTATION_PATTERN = re.compile(r"\[[^\]]*\]|\([^)]*\b(?:music|applause|laughter|inaudible)\b[^)]*\)|>>", re.IGNORECASE)
+FILLER_WORDS = frozenset({"um", "umm", "uh", "uhh", "uhm", "erm", "er", "ah", "hmm", "mm", "mhm"})
+SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+NORMALIZE_STRIP = "\"'.,!?;:()[]…-"
+
+# Longest rolling-caption overlap looked for, and the shortest one removed
+# (single-word repeats are usually genuine: "very, very")
+MAX_OVERLAP_WORDS = 20
+MIN_OVERLAP_WORDS = 2
+
+# Unit boundaries for captions without punctuation
+PAUSE_SECONDS = 2.0
+MAX_UNIT_SECONDS = 20.0
+MAX_UNIT_WORDS = 60
+
+DEFAULT_TIMESTAMP_INTERVAL = 30.0
+
+
+def _clean_words(text: str) -> List[str]:
+    words = ANNOTATION_PATTERN.sub(" ", text).split()
+    return [w for w in words if w.lower().strip(NORMALIZE_STRIP) not in FILLER_WORDS]
+
+
+def _normalize(word: str) -> str:
+    return word.lower().strip(NORMALIZE_STRIP)
+
+
+def _overlap(recent: Deque[str], words: Sequence[str]) -> int:
+    """Length of the longest prefix of words that repeats the end of recent."""
+    longest = min(len(recent), len(words))
+    if not longest:
+        return 0
+    tail = list(recent)
+    first = words[0]
+    for k in range(longest, 0, -1):
+        # Cheap first-word check before comparing slices
+        if tail[-k] == first and tail[-k:] == list(words[:k]):
+            if k >= MIN_OVERLAP_WORDS or k == len(words):
+                return k
+            return 0
+    return 0
+
+
+def compact_transcript(
+    transcript: Transcript,
+    timestamp_interval: float = DEFAULT_TIMESTAMP_INTERVAL,
+) -> CompactedTranscript:
+    """
+    Merge a transcript's caption segments into deduplicated sentence-level units.
+
+    Args:
+        transcript: Transcript as fetched from YouTube
+        timestamp_interval: Minimum seconds between rendered timestamps
+
+    Returns:
+        CompactedTranscript whose segments are the merged units
+    """
+    original = transcript.segments
+    units: List[TranscriptSegment] = []
+    spans: List[Tuple[int, int]] = []
+    recent: Deque[str] = deque(maxlen=MAX_OVERLAP_WORDS)
+
+    words: List[str] = []
+    unit_start = unit_end = 0.0
+    first = last = 0
+
+    def close_unit() -> None:
+        if words:
+            units.append(TranscriptSegment(
+                text=" ".join(words),
+                start=unit_start,
+                duration=max(0.0, unit_end - unit_start),
+            ))
+            spans.append((first, last))
+            words.clear()
+
+    previous_end = None
+    for index, segment in enumerate(original):
+        cleaned = _clean_words(segment.text)
+        normalized = [_normalize(w) for w in cleaned]
+        skip = _overlap(recent, normalized)
+        cleaned, normalized = cleaned[skip:], normalized[skip:]
+        if not cleaned:
+            continue
+
+        segment_end = segment.start + segment.duration
+        if words and (
+            segment.start - previous_end >= PAUSE_SECONDS
+            or unit_end - unit_start >= MAX_UNIT_SECONDS
+        ):
+            close_unit()
+
+        for word, norm in zip(cleaned, normalized):
+            if not words:
+                unit_start, unit_end, first = segment.start, segment_end, index
+            words.append(word)
+            unit_end = max(unit_end, segment_end)
+            last = index
+            recent.append(norm)
+            if SENTENCE_END.search(word) or len(words) >= MAX_UNIT_WORDS:
+                close_unit()
+        previous_end = segment_end
+
+    close_unit()
+
+    return CompactedTranscript(
+        video_id=transcript.video_id,
+        segments=units,
+        full_text=" ".join(unit.text for unit in units),
+        original_segments=original,
+        source_spans=spans,
+        timestamp_interval=timestamp_interval,
+    )
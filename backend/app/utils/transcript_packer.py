@@ -0,0 +1,188 @@
+"""
+Token-budgeted transcript packing for the claim extraction prompt.
+
+Transcript segments are rendered as "[MM:SS] text" lines and packed until the
+model's token budget is reached, in a single pass that stops at the budget
+instead of formatting segments that would be thrown away. Compacted
+transcripts render the timestamp prefix at coarser intervals.
+
+Tokens are counted with tiktoken when it is installed and its encoding can be
+loaded; otherwise a calibrated characters-per-token estimate is used, which
+errs towards over-counting so the budget is never exceeded. The encoding is
+downloaded on first use (with no timeout), so async callers load it through
+load_token_counter(), off the event loop.
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from app.core.config import settings
+from app.models.schemas import TranscriptSegment
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = "\n...[TRUNCATED]..."
+
+# Context windows in tokens, matched by longest model-name prefix
+MODEL_CONTEXT_TOKENS = {
+    "gpt-3.5-turbo": 16_385,
+    "gpt-4": 8_192,
+    "gpt-4-turbo": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    # 400k context, of which at most 272k input
+    "gpt-5": 272_000,
+    "gpt-5-chat": 128_000,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+    "gemini-pro": 30_720,
+    "gemini-1.0-pro": 30_720,
+    "gemini-1.5-flash": 1_048_576,
+    "gemini-1.5-pro": 2_097_152,
+    "gemini-2.0-flash": 1_048_576,
+    "gemini-2.5": 1_048_576,
+}
+DEFAULT_CONTEXT_TOKENS = 8_192
+
+# Room left for the prompt instructions and the claims JSON in the response
+RESERVED_PROMPT_TOKENS = 2_048
+
+# Estimator calibration: English caption text averages ~4 characters per
+# token in cl100k/o200k and Gemini's tokenizer; 3.5 over-counts slightly.
+# The "[MM:SS] " prefix is ~5 tokens and the newline 1.
+ESTIMATED_CHARS_PER_TOKEN = 3.5
+ESTIMATED_TIMESTAMP_TOKENS = 5
+
+
+@dataclass
+class PackedTranscript:
+    text: str
+    token_count: int
+    segments_used: int
+    truncated: bool
+
+
+def model_context_tokens(model: str) -> int:
+    """Context window of a model, by longest matching name prefix."""
+    best = ""
+    for prefix in MODEL_CONTEXT_TOKENS:
+        if model.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return MODEL_CONTEXT_TOKENS[best] if best else DEFAULT_CONTEXT_TOKENS
+
+
+def transcript_token_budget(model: str) -> int:
+    """
+    Tokens available for the transcript in the claim extraction prompt.
+
+    The model's context window minus room for instructions and output,
+    capped by TRANSCRIPT_MAX_TOKENS when that is set.
+    """
+    budget = max(0, model_context_tokens(model) - RESERVED_PROMPT_TOKENS)
+    if settings.TRANSCRIPT_MAX_TOKENS > 0:
+        budget = min(budget, settings.TRANSCRIPT_MAX_TOKENS)
+    return budget
+
+
+def estimate_tokens(text: str) -> int:
+    """Calibrated token estimate used when no tokenizer is available."""
+    return math.ceil(len(text) / ESTIMATED_CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_counter(model: str) -> Optional[Callable[[str], int]]:
+    if not TIKTOKEN_AVAILABLE or model.startswith("gemini"):
+        return None
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back
+        logger.warning("tiktoken encoding for %s unavailable, estimating tokens: %s", model, e)
+        return None
+    return lambda text: len(encoding.encode_ordinary(text))
+
+
+def token_counter(model: str) -> Callable[[str], int]:
+    """Token counting function for a model: tiktoken if usable, else the estimator."""
+    return _tiktoken_counter(model) or estimate_tokens
+
+
+async def load_token_counter(model: str) -> Callable[[str], int]:
+    """token_counter() in a worker thread, so loading the encoding never blocks the event loop."""
+    return await asyncio.to_thread(token_counter, model)
+
+
+def _format_line(seg: TranscriptSegment, stamped: bool) -> str:
+    if stamped:
+        minutes, seconds = divmod(int(seg.start), 60)
+        return "[%02d:%02d] %s\n" % (minutes, seconds, seg.text)
+    return seg.text + "\n"
+
+
+def pack_transcript(
+    segments: Iterable[TranscriptSegment],
+    token_budget: int,
+    model: str,
+    timestamp_interval: float = 0.0,
+) -> PackedTranscript:
+    """
+    Render segments as "[MM:SS] text" lines until the token budget is reached.
+
+    With a timestamp_interval, only segments starting at least that many
+    seconds after the last rendered timestamp get the "[MM:SS]" prefix.
+
+    Lines are collected in a list and joined once, and iteration stops at the
+    first segment that does not fit, so the cost is linear in the packed
+    output rather than in the whole transcript. When segments are dropped a
+    truncation marker is appended; its tokens count towards the budget.
+    """
+    count = token_counter(model)
+    exact = count is not estimate_tokens
+    marker_tokens = count(TRUNCATION_MARKER)
+    # Budget left for lines once the marker is reserved
+    available = token_budget - marker_tokens
+
+    lines = []
+    append = lines.append
+    used = 0
+    truncated = False
+    last_stamp = None
+    for seg in segments:
+        start = seg.start
+        stamped = last_stamp is None or start - last_stamp >= timestamp_interval
+        if exact:
+            line = _format_line(seg, stamped)
+            line_tokens = count(line)
+        else:
+            # Estimate before formatting so over-budget segments cost nothing;
+            # (2n + 6) // 7 is estimate_tokens' ceil(n / 3.5) in integer arithmetic
+            line_tokens = (2 * len(seg.text) + 6) // 7 + (ESTIMATED_TIMESTAMP_TOKENS + 1 if stamped else 1)
+            line = None
+        if used + line_tokens > available:
+            truncated = True
+            break
+        append(line if line is not None else _format_line(seg, stamped))
+        used += line_tokens
+        if stamped:
+            last_stamp = start
+
+    text = "".join(lines)
+    if truncated:
+        text += TRUNCATION_MARKER
+        used += marker_tokens
+    return PackedTranscript(text=text, token_count=used, segments_used=len(lines), truncated=truncated)
@@ -0,0 +1,13 @@
+"""
+Shared test configuration.
+
+app.main initializes its services at import time, and those validate API
+credentials. Provide dummy values so the FastAPI app can be imported in tests
+without a real .env file. No test makes a live network call.
+"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test-dummy-key")
+os.environ.setdefault("GOOGLE_API_KEY", "test-google-api-key")
+os.environ.setdefault("GOOGLE_CSE_ID", "test-cse-id")
@@ -0,0 +1,91 @@
+"""
+Tests for local claim-to-timestamp alignment.
+"""
+
+from app.models.schemas import Claim, Transcript, TranscriptSegment
+from app.utils.claim_aligner import TranscriptIndex, align_claims
+from app.utils.transcript_compactor import compact_transcript
+
+SEGMENTS = [
+    ("Hello and welcome to the channel.", 0.0, 4.0),
+    ("Today we look at the numbers on", 30.0, 3.0),
+    ("renewable energy in Europe.", 33.0, 3.0),
+    ("Solar output grew by forty percent", 60.0, 3.0),
+    ("between twenty twenty and twenty twenty three.", 63.0, 4.0),
+    ("Wind power now supplies a fifth", 90.0, 3.0),
+    ("of the continent's electricity.", 93.0, 3.0),
+]
+
+
+def make_transcript(segments=SEGMENTS):
+    segs = [TranscriptSegment(text=text, start=start, duration=duration) for text, start, duration in segments]
+    return Transcript(video_id="vid", segments=segs, full_text=" ".join(s.text for s in segs))
+
+
+def make_claim(text, context="", start=None, end=None):
+    return Claim(id="c", text=text, context=context, timestamp_start=start, timestamp_end=end)
+
+
+class TestTranscriptIndex:
+    def test_exact_quote_spanning_segments(self):
+        index = TranscriptIndex.for_transcript(make_transcript())
+
+        alignment = index.align("Solar output grew by forty percent between 2020 and 2023")
+
+        assert (alignment.start, alignment.end) == (60.0, 67.0)
+        assert (alignment.first_segment, alignment.last_segment) == (3, 4)
+
+    def test_paraphrase_with_dropped_words(self):
+        index = TranscriptIndex.for_transcript(make_transcript())
+
+        alignment = index.align("wind power supplies a fifth of the continent's electricity")
+
+        assert (alignment.start, alignment.end) == (90.0, 96.0)
+
+    def test_unrelated_text_does_not_align(self):
+        index = TranscriptIndex.for_transcript(make_transcript())
+
+        assert index.align("vaccines cause measurable side effects in children") is None
+
+    def test_common_phrase_picks_densest_match(self):
+        segments = [
+            ("the rate of the tax went up", 0.0, 3.0),
+            ("and then the rate of inflation fell sharply last year", 50.0, 5.0),
+            ("the rate of the decline", 100.0, 3.0),
+        ]
+        index = TranscriptIndex.for_transcript(make_transcript(segments))
+
+        alignment = index.align("the rate of inflation fell sharply")
+
+        assert alignment.start == 50.0
+
+    def test_compacted_transcript_uses_original_segments(self):
+        compacted = compact_transcript(make_transcript())
+
+        alignment = TranscriptIndex.for_transcript(compacted).align("renewable energy in Europe")
+
+        assert (alignment.start, alignment.end) == (33.0, 36.0)
+
+
+class TestAlignClaims:
+    def test_overrides_model_times(self):
+        claims = [make_claim("Solar output grew by forty percent", start=5.0, end=6.0)]
+
+        assert align_claims(claims, make_transcript()) == 1
+        assert (claims[0].timestamp_start, claims[0].timestamp_end) == (60.0, 63.0)
+
+    def test_falls_back_to_context(self):
+        claims = [make_claim(
+            "Renewables are booming",
+            context="Wind power now supplies a fifth of the continent's electricity.",
+        )]
+
+        align_claims(claims, make_transcript())
+
+        assert claims[0].timestamp_start == 90.0
+
+    def test_unaligned_claim_keeps_existing_times(self):
+        claims = [make_claim("Completely unrelated statement here", start=12.0, end=15.0)]
+
+        assert align_claims(claims, make_transcript()) == 0
+        assert (claims[0].timestamp_start, claims[0].timestamp_end) == (12.0, 15.0)
@@ -0,0 +1,89 @@
+"""
+Tests for within-video claim deduplication.
+"""
+
+from app.models.schemas import Claim
+from app.utils.claim_dedup import dedupe_claims
+
+
+def make_claim(i, text, start=None, end=None):
+    return Claim(id=f"claim_{i}", text=text, timestamp_start=start, timestamp_end=end)
+
+
+def test_restated_statistic_is_merged_with_all_ranges():
+    claims = [
+        make_claim(0, "Unemployment fell to 3.5 percent in 2023", 40.0, 48.0),
+        make_claim(1, "Electric cars now outsell diesel cars in Norway", 95.0, 101.0),
+        make_claim(2, "In 2023 unemployment dropped to 3.5 percent", 610.0, 616.0),
+        make_claim(3, "The central bank raised interest rates four times", 300.0, 305.0),
+    ]
+
+    deduped = dedupe_claims(claims)
+
+    assert [c.id for c in deduped] == ["claim_0", "claim_1", "claim_3"]
+    merged = deduped[0]
+    assert merged.timestamp_ranges == [(40.0, 48.0), (610.0, 616.0)]
+    assert (merged.timestamp_start, merged.timestamp_end) == (40.0, 48.0)
+    # Inputs are not modified
+    assert claims[0].timestamp_ranges is None
+
+
+def test_merged_claim_starts_at_earliest_range():
+    claims = [
+        make_claim(0, "The vaccine is ninety five percent effective", 500.0, 505.0),
+        make_claim(1, "Vaccine is 95 percent effective, ninety five percent effective", 20.0, 26.0),
+    ]
+
+    deduped = dedupe_claims(claims)
+
+    assert len(deduped) == 1
+    assert deduped[0].text == claims[0].text
+    assert deduped[0].timestamp_start == 20.0
+
+
+def test_distinct_claims_on_same_topic_are_kept():
+    claims = [
+        make_claim(0, "Global temperatures rose by 1.1 degrees since 1900"),
+        make_claim(1, "Arctic sea ice has shrunk by 40 percent since 1979"),
+        make_claim(2, "Sea levels rose 20 centimetres over the last century"),
+    ]
+
+    assert dedupe_claims(claims) == claims
+
+
+def test_negated_claim_is_kept():
+    claims = [
+        make_claim(0, "The vaccine is safe for children under five", 10.0, 15.0),
+        make_claim(1, "The vaccine is not safe for children under five", 200.0, 205.0),
+    ]
+
+    assert dedupe_claims(claims) == claims
+
+
+def test_claims_with_different_figures_are_kept():
+    claims = [
+        make_claim(0, "The federal deficit reached 1.7 trillion in 2023", 10.0, 15.0),
+        make_claim(1, "The federal deficit reached 3.7 trillion in 2023", 200.0, 205.0),
+    ]
+
+    assert dedupe_claims(claims) == claims
+
+
+def test_untimed_duplicates_merge_without_ranges():
+    claims = [make_claim(0, "Coffee prevents cancer"), make_claim(1, "coffee prevents cancer.")]
+
+    deduped = dedupe_claims(claims)
+
+    assert len(deduped) == 1
+    assert deduped[0].timestamp_ranges == []
+    assert deduped[0].timestamp_start is None
+
+
+def test_threshold_controls_merging():
+    claims = [
+        make_claim(0, "Unemployment fell to 3.5 percent in 2023"),
+        make_claim(1, "Unemployment fell sharply last year"),
+    ]
+
+    assert len(dedupe_claims(claims, threshold=0.95)) == 2
+    assert len(dedupe_claims(claims, threshold=0.2)) == 1
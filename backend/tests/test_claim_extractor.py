@@ -77,3 +77,52 @@ async def test_claim_extraction_error_handling():
         assert claims[0].metadata["status"] == "error"
         assert claims[0].metadata["code"] == "llm_extraction_failed"
         assert "API Error" in claims[0].metadata["details"]
+
+
+@pytest.mark.asyncio
+async def test_claim_timestamps_aligned_locally():
+    with patch("app.services.claim_extractor.settings") as mock_settings:
+        mock_settings.OPENAI_API_KEY = "sk-mock-key"
+        mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
+        mock_settings.LLM_PROVIDER = "openai"
+
+        extractor = ClaimExtractor()
+
+        # No times in the response, and a non-numeric one the old parser rejected
+        mock_client = MagicMock()
+        extractor.client = mock_client
+        mock_response = MagicMock()
+        mock_response.choices = [
+            MagicMock(
+                message=MagicMock(
+                    content='{"claims": ['
+                    '{"text": "Sea levels rose twenty centimetres last century", "context": ""},'
+                    '{"text": "Ice sheets are melting", "start_time": "soon", "context": "the ice sheets in Greenland are melting faster"}'
+                    ']}'
+                )
+            )
+        ]
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        mock_segments = [
+            TranscriptSegment(text="Welcome back to the show.", start=0.0, duration=4.0),
+            TranscriptSegment(text="Sea levels rose about twenty", start=60.0, duration=3.0),
+            TranscriptSegment(text="centimetres in the last century.", start=63.0, duration=3.0),
+            TranscriptSegment(text="And the ice sheets in Greenland", start=120.0, duration=3.0),
+            TranscriptSegment(text="are melting faster than expected.", start=123.0, duration=3.0),
+        ]
+        mock_transcript = Transcript(
+            video_id="test_id",
+            segments=mock_segments,
+            full_text=" ".join(s.text for s in mock_segments),
+        )
+
+        claims = await extractor.extract_claims(mock_transcript)
+
+        assert [(c.timestamp_start, c.timestamp_end) for c in claims] == [
+            (60.0, 66.0),
+            (120.0, 126.0),
+        ]
+
+        prompt = mock_client.chat.completions.create.call_args.kwargs["messages"][-1]["content"]
+        assert "start_time" not in prompt
@@ -0,0 +1,99 @@
+"""
+Tests for the cross-video claim index.
+"""
+
+import pytest
+from app.models.schemas import (
+    BiasIndicators,
+    ClientTruthProfile,
+    PerspectiveAnalysis,
+    PerspectiveType,
+)
+from app.services.claim_index import ClaimIndex, lsh_bands, minhash, normalize_claim
+
+
+def make_profile(assessment="Likely True", stance="Support"):
+    return ClientTruthProfile(
+        overall_assessment=assessment,
+        perspectives={
+            PerspectiveType.SCIENTIFIC.value: PerspectiveAnalysis(
+                perspective=PerspectiveType.SCIENTIFIC, stance=stance, confidence=0.9, explanation="ok", evidence=[]
+            )
+        },
+        bias_indicators=BiasIndicators(deception_score=1.0),
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ClaimIndex(str(tmp_path / "claims.sqlite3"), similarity_threshold=0.8, max_age_seconds=3600)
+    yield index
+    index.close()
+
+
+class TestClaimIndex:
+    def test_exact_wording_hit(self, index):
+        index.store("The Earth is 4.5 billion years old.", make_profile())
+
+        match = index.lookup("the earth is 4.5 billion years old")
+
+        assert match.similarity == 1.0
+        assert match.profile.overall_assessment == "Likely True"
+        assert (index.hits, index.misses) == (1, 0)
+
+    def test_similar_wording_hit(self, index):
+        index.store("Unemployment fell to 3.5 percent in 2023 across the whole country", make_profile())
+
+        match = index.lookup("Unemployment fell to 3.5 percent in 2023 across the country")
+
+        assert match is not None
+        assert 0.8 <= match.similarity < 1.0
+
+    def test_different_claim_misses(self, index):
+        index.store("Unemployment fell to 3.5 percent in 2023", make_profile())
+
+        assert index.lookup("Inflation rose to 9 percent in 2022") is None
+        assert index.misses == 1
+
+    def test_different_numbers_miss(self, index):
+        claim = "The federal deficit reached {} trillion dollars in fiscal year 2023 according to the Treasury"
+        index.store(claim.format("1.7"), make_profile())
+
+        assert index.lookup(claim.format("3.7")) is None
+        assert index.lookup(claim.format("1.7")) is not None
+
+    def test_negated_claim_misses(self, index):
+        index.store("Vaccines cause autism in young children according to the study", make_profile())
+
+        assert index.lookup("Vaccines do not cause autism in young children according to the study") is None
+        assert index.lookup("Vaccines don't cause autism in young children according to the study") is None
+
+    def test_stale_entries_are_ignored_and_pruned(self, index):
+        index.store("Coffee prevents cancer", make_profile())
+        index.max_age_seconds = -1
+
+        assert index.lookup("Coffee prevents cancer") is None
+        assert index.prune() == 1
+
+    def test_store_refreshes_existing_entry(self, index):
+        index.store("Coffee prevents cancer", make_profile("Likely True"))
+        index.store("coffee prevents cancer!", make_profile("Likely False", "Refute"))
+
+        assert index.lookup("Coffee prevents cancer").profile.overall_assessment == "Likely False"
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "claims.sqlite3")
+        first = ClaimIndex(path)
+        first.store("Coffee prevents cancer", make_profile())
+        first.close()
+
+        second = ClaimIndex(path)
+        assert second.lookup("Coffee prevents cancer") is not None
+        second.close()
+
+    def test_similar_claims_share_a_band(self):
+        a = frozenset(normalize_claim("Global temperatures rose by 1.1 degrees since 1900 according to NASA data").split())
+        b = frozenset(normalize_claim("Global temperatures rose by 1.1 degrees since 1900 according to NASA").split())
+
+        assert set(lsh_bands(minhash(a))) & set(lsh_bands(minhash(b)))
+        assert lsh_bands(minhash(a)) == lsh_bands(minhash(a))
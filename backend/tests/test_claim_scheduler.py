@@ -0,0 +1,54 @@
+"""
+Tests for playback-aware claim ordering.
+"""
+
+import math
+
+from app.models.schemas import Claim
+from app.utils.claim_scheduler import BEHIND_PENALTY, playback_distance, schedule_claims
+
+
+def claim(claim_id, start, end=None, ranges=None):
+    return Claim(
+        id=claim_id,
+        text=claim_id,
+        timestamp_start=start,
+        timestamp_end=end if end is not None else (start + 10 if start is not None else None),
+        timestamp_ranges=ranges,
+    )
+
+
+def test_claim_spanning_position_is_nearest():
+    assert playback_distance(claim("now", 95, 110), 100) == 0.0
+
+
+def test_claims_behind_are_penalized():
+    ahead = playback_distance(claim("ahead", 120), 100)
+    behind = playback_distance(claim("behind", 70, 80), 100)
+
+    assert ahead == 20.0
+    assert behind == 20.0 * BEHIND_PENALTY
+
+
+def test_merged_claims_use_nearest_occurrence():
+    merged = claim("merged", 10, 20, ranges=[(10.0, 20.0), (300.0, 310.0)])
+
+    assert playback_distance(merged, 295) == 5.0
+
+
+def test_untimed_claims_go_last():
+    assert playback_distance(claim("untimed", None), 100) == math.inf
+
+
+def test_schedule_orders_nearest_first():
+    claims = [claim("intro", 0), claim("behind", 80), claim("now", 98), claim("next", 125), claim("untimed", None)]
+
+    ordered = schedule_claims(claims, 100)
+
+    assert [c.id for c in ordered] == ["now", "next", "behind", "intro", "untimed"]
+
+
+def test_schedule_without_position_keeps_order():
+    claims = [claim("b", 50), claim("a", 0)]
+
+    assert [c.id for c in schedule_claims(claims, None)] == ["b", "a"]
@@ -0,0 +1,107 @@
+"""
+Tests for per-job deadlines.
+"""
+
+import asyncio
+
+import pytest
+from app.core.deadline import (
+    MIN_UPSTREAM_TIMEOUT,
+    Deadline,
+    DeadlineExceeded,
+    activate_deadline,
+    current_deadline,
+    fair_share,
+    stage_deadline,
+    time_left,
+)
+
+
+def test_time_left_without_deadline_is_default():
+    assert current_deadline() is None
+    assert time_left(60.0) == 60.0
+    assert fair_share(3) is None
+
+
+def test_time_left_capped_by_deadline():
+    with activate_deadline(Deadline(5.0)):
+        assert 4.0 < time_left(60.0) <= 5.0
+        assert time_left(1.0) == 1.0
+    assert current_deadline() is None
+
+
+def test_time_left_has_a_floor():
+    with activate_deadline(Deadline(0.0)):
+        assert time_left(60.0) == MIN_UPSTREAM_TIMEOUT
+
+
+def test_sub_deadline_never_outlives_parent():
+    parent = Deadline(1.0)
+
+    assert parent.sub(10.0).expires_at == parent.expires_at
+    assert parent.sub(0.5).expires_at < parent.expires_at
+
+
+def test_fair_share_splits_remaining():
+    with activate_deadline(Deadline(10.0)):
+        assert 4.5 < fair_share(2) <= 5.0
+
+
+async def test_stage_deadline_is_noop_without_deadline():
+    async with stage_deadline("stage", share=0.1) as deadline:
+        await asyncio.sleep(0)
+    assert deadline is None
+
+
+async def test_stage_uses_share_of_total_budget():
+    with activate_deadline(Deadline(10.0)):
+        async with stage_deadline("stage", share=0.2) as deadline:
+            assert 1.5 < deadline.remaining() <= 2.0
+            assert current_deadline() is deadline
+            assert time_left(60.0) <= 2.0
+
+
+async def test_stage_past_budget_raises():
+    with activate_deadline(Deadline(10.0)):
+        with pytest.raises(DeadlineExceeded, match="slow exceeded"):
+            async with stage_deadline("slow", seconds=0.05):
+                await asyncio.sleep(5)
+
+
+async def test_stage_after_expiry_is_skipped():
+    with activate_deadline(Deadline(0.0)):
+        with pytest.raises(DeadlineExceeded, match="skipped"):
+            async with stage_deadline("late", seconds=1.0):
+                pytest.fail("stage body should not run")
+
+
+async def test_inner_timeouts_are_not_reported_as_deadline():
+    with activate_deadline(Deadline(10.0)):
+        with pytest.raises(asyncio.TimeoutError):
+            async with stage_deadline("stage", seconds=5.0):
+                await asyncio.wait_for(asyncio.sleep(5), timeout=0.01)
+
+
+async def test_task_keeps_running_after_stage_times_out():
+    with activate_deadline(Deadline(10.0)):
+        with pytest.raises(DeadlineExceeded):
+            async with stage_deadline("slow", seconds=0.01):
+                await asyncio.sleep(5)
+        # The stage's cancellation must not leak into the rest of the job
+        await asyncio.sleep(0.02)
+
+
+async def test_outside_cancellation_is_not_reported_as_deadline():
+    started = asyncio.Event()
+
+    async def job():
+        with activate_deadline(Deadline(10.0)):
+            async with stage_deadline("stage", seconds=5.0):
+                started.set()
+                await asyncio.sleep(5)
+
+    task = asyncio.create_task(job())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,89 @@
+"""
+Tests for evidence URL canonicalization and deduplication.
+"""
+
+from app.models.schemas import Evidence, PerspectiveType
+from app.utils.evidence_canonicalizer import canonical_key, clean_url, dedupe_evidence
+
+WIRE_SNIPPET = (
+    "WASHINGTON (AP) — The Senate passed a bill on Tuesday extending funding for the "
+    "federal government through March, averting a shutdown hours before the deadline."
+)
+
+
+def evidence(url, snippet, perspective=PerspectiveType.JOURNALISTIC, title="Senate passes funding bill", source="example.org"):
+    return Evidence(url=url, title=title, snippet=snippet, source=source, perspective=perspective)
+
+
+def test_clean_url_strips_tracking_params_and_fragment():
+    url = "https://www.example.com/news/story?utm_source=twitter&id=7&fbclid=abc&page=2#comments"
+
+    assert clean_url(url) == "https://www.example.com/news/story?id=7&page=2"
+
+
+def test_clean_url_removes_amp_markers():
+    assert clean_url("https://example.com/amp/news/story") == "https://example.com/news/story"
+    assert clean_url("https://example.com/news/story/amp/") == "https://example.com/news/story"
+    assert clean_url("https://example.com/news/story.amp.html") == "https://example.com/news/story.html"
+    assert clean_url("https://example.com/news/story?outputType=amp") == "https://example.com/news/story"
+
+
+def test_clean_url_leaves_non_urls_alone():
+    assert clean_url("not a url") == "not a url"
+
+
+def test_canonical_key_merges_mobile_and_amp_hosts():
+    key = canonical_key("https://www.example.com/news/story")
+
+    assert canonical_key("http://m.example.com/news/story/") == key
+    assert canonical_key("https://amp.example.com/news/story?utm_medium=social") == key
+    assert canonical_key("https://example.com/news/other") != key
+
+
+def test_canonical_key_keeps_short_hosts():
+    assert canonical_key("https://m.tt/story") == "m.tt/story"
+
+
+def test_dedupe_drops_url_variants_across_perspectives():
+    results = dedupe_evidence({
+        PerspectiveType.JOURNALISTIC: [evidence("https://www.reuters.com/world/story?utm_source=x", "Reuters report one.")],
+        PerspectiveType.PARTISAN_LEFT: [
+            evidence("https://m.reuters.com/world/story", "Different snippet text entirely here.",
+                     perspective=PerspectiveType.PARTISAN_LEFT),
+        ],
+    })
+
+    # The link shown to users is the one the search returned
+    assert [e.url for e in results[PerspectiveType.JOURNALISTIC]] == ["https://www.reuters.com/world/story?utm_source=x"]
+    assert results[PerspectiveType.PARTISAN_LEFT] == []
+
+
+def test_dedupe_drops_syndicated_copies():
+    results = dedupe_evidence({
+        PerspectiveType.JOURNALISTIC: [evidence("https://apnews.com/article/senate-funding", WIRE_SNIPPET)],
+        PerspectiveType.PARTISAN_LEFT: [
+            evidence("https://www.msnbc.com/news/senate-funding-bill", WIRE_SNIPPET[:120] + " ...",
+                     perspective=PerspectiveType.PARTISAN_LEFT),
+            evidence("https://www.msnbc.com/opinion/shutdown", "Why the shutdown fight will return in the spring.",
+                     perspective=PerspectiveType.PARTISAN_LEFT, title="The shutdown fight"),
+        ],
+        PerspectiveType.PARTISAN_RIGHT: [
+            evidence("https://www.foxnews.com/politics/senate-funding", WIRE_SNIPPET,
+                     perspective=PerspectiveType.PARTISAN_RIGHT),
+        ],
+    })
+
+    assert len(results[PerspectiveType.JOURNALISTIC]) == 1
+    assert [e.url for e in results[PerspectiveType.PARTISAN_LEFT]] == ["https://www.msnbc.com/opinion/shutdown"]
+    assert results[PerspectiveType.PARTISAN_RIGHT] == []
+
+
+def test_dedupe_keeps_system_notices():
+    notice = evidence("", "Search quota exceeded.", source="System")
+    results = dedupe_evidence({
+        PerspectiveType.SCIENTIFIC: [notice],
+        PerspectiveType.JOURNALISTIC: [notice],
+    })
+
+    assert results[PerspectiveType.SCIENTIFIC] == [notice]
+    assert results[PerspectiveType.JOURNALISTIC] == [notice]
@@ -0,0 +1,78 @@
+"""
+Tests for local evidence relevance filtering.
+"""
+
+from collections import Counter
+
+import pytest
+from app.models.schemas import Evidence, PerspectiveType
+from app.utils import evidence_relevance
+from app.utils.evidence_relevance import filter_relevant_evidence, relevance_scores
+
+CLAIM = "Global average temperatures have risen by 1.1 degrees Celsius since pre-industrial times"
+
+
+def evidence(url, title, snippet, perspective=PerspectiveType.SCIENTIFIC, source="example.org"):
+    return Evidence(url=url, title=title, snippet=snippet, source=source, perspective=perspective)
+
+
+RELEVANT = evidence(
+    "https://nature.com/warming",
+    "Global temperatures rise 1.1C",
+    "Average global temperatures are 1.1 degrees Celsius above pre-industrial levels.",
+)
+PARTLY = evidence(
+    "https://nature.com/heat",
+    "Heatwaves in Europe",
+    "Summer temperatures in Europe rose two degrees above average.",
+)
+OFF_TOPIC = evidence(
+    "https://nature.com/bees",
+    "Bee decline",
+    "Pollinator populations fell sharply due to pesticide use.",
+)
+
+
+def test_relevant_evidence_scores_highest():
+    scores = relevance_scores(CLAIM, [OFF_TOPIC, PARTLY, RELEVANT])
+
+    assert scores[0] == 0.0
+    assert scores[2] > scores[1] > 0.0
+
+
+def test_filter_drops_and_ranks_across_perspectives():
+    left = evidence("https://vox.com/sports", "Football results", "The home side won three nil.", PerspectiveType.PARTISAN_LEFT)
+    results = filter_relevant_evidence(CLAIM, {
+        PerspectiveType.SCIENTIFIC: [OFF_TOPIC, PARTLY, RELEVANT],
+        PerspectiveType.PARTISAN_LEFT: [left],
+    })
+
+    assert results[PerspectiveType.SCIENTIFIC] == [RELEVANT, PARTLY]
+    assert results[PerspectiveType.PARTISAN_LEFT] == []
+
+
+def test_system_notices_are_kept():
+    notice = evidence("https://developers.google.com/x", "Search Quota Exceeded", "quota", source="System")
+
+    results = filter_relevant_evidence(CLAIM, {PerspectiveType.JOURNALISTIC: [notice]})
+
+    assert results[PerspectiveType.JOURNALISTIC] == [notice]
+
+
+def test_empty_input():
+    assert relevance_scores(CLAIM, []) == []
+    assert filter_relevant_evidence(CLAIM, {}) == {}
+
+
+def test_numpy_matches_pure_python():
+    pytest.importorskip("numpy")
+    term_counts = [Counter(evidence_relevance._terms(text)) for text in (
+        CLAIM,
+        f"{RELEVANT.title} {RELEVANT.snippet}",
+        f"{PARTLY.title} {PARTLY.snippet}",
+        "",
+    )]
+
+    assert evidence_relevance._scores_numpy(term_counts) == pytest.approx(
+        evidence_relevance._scores_python(term_counts)
+    )
@@ -0,0 +1,203 @@
+"""
+Tests for evidence retrieval strategies.
+"""
+
+import asyncio
+
+import pytest
+from app.models.schemas import Claim, PerspectiveType
+from app.services.evidence_retriever import COMBINED_MAX_SITES, MAX_QUERY_WORDS, EvidenceRetriever
+
+ALL_PERSPECTIVES = list(PerspectiveType)
+
+
+def item(link, title="T"):
+    host = link.split("/")[2]
+    return {"link": link, "title": title, "snippet": "S", "displayLink": host}
+
+
+@pytest.fixture
+def retriever():
+    return EvidenceRetriever()
+
+
+@pytest.fixture
+def cse_calls(retriever, monkeypatch):
+    """Replace the CSE request with canned responses keyed by call order."""
+    calls = []
+    responses = []
+
+    async def query_cse(full_query, num, label):
+        calls.append((full_query, num))
+        return responses.pop(0) if responses else ("success", [])
+
+    monkeypatch.setattr(retriever, "_query_cse", query_cse)
+    return calls, responses
+
+
+class TestDomainLookup:
+    def test_matches_subdomains(self, retriever):
+        assert retriever.perspective_for_host("www.nature.com") == PerspectiveType.SCIENTIFIC
+        assert retriever.perspective_for_host("edition.BBC.com") == PerspectiveType.JOURNALISTIC
+        assert retriever.perspective_for_host("jacobin.com") == PerspectiveType.PARTISAN_LEFT
+
+    def test_unknown_and_lookalike_hosts(self, retriever):
+        assert retriever.perspective_for_host("example.org") is None
+        assert retriever.perspective_for_host("notnature.com") is None
+
+
+class TestCombinedStrategy:
+    async def test_single_query_bucketed_by_domain(self, retriever, cse_calls):
+        calls, responses = cse_calls
+        responses.append(("success", [
+            item("https://www.nature.com/a"),
+            item("https://apnews.com/b"),
+            item("https://www.msnbc.com/c"),
+            item("https://www.foxnews.com/d"),
+            item("https://www.nature.com/e"),
+            item("https://unrelated.example/f"),
+        ]))
+
+        results = await retriever.search_google_combined("claim text", ALL_PERSPECTIVES)
+
+        assert len(calls) == 1
+        assert calls[0][0].startswith("claim text (site:nature.com OR site:reuters.com")
+        assert calls[0][0].count("site:") == COMBINED_MAX_SITES
+        assert [e.url for e in results[PerspectiveType.SCIENTIFIC]] == [
+            "https://www.nature.com/a",
+            "https://www.nature.com/e",
+        ]
+        assert results[PerspectiveType.PARTISAN_RIGHT][0].perspective == PerspectiveType.PARTISAN_RIGHT
+
+    async def test_site_filters_fit_the_query_word_limit(self, retriever, cse_calls):
+        calls, responses = cse_calls
+        responses.append(("success", []))
+        claim = " ".join(["word"] * 20)
+
+        await retriever.search_google_combined(claim, ALL_PERSPECTIVES[:3])
+
+        words = calls[0][0].replace("(", " ").replace(")", " ").split()
+        assert len(words) <= MAX_QUERY_WORDS
+        assert calls[0][0].count("site:") == 6
+
+    async def test_long_claim_searches_perspectives_individually(self, retriever, cse_calls):
+        calls, responses = cse_calls
+        claim = " ".join(["word"] * 28)
+
+        await retriever.search_google_combined(claim, ALL_PERSPECTIVES)
+
+        assert len(calls) == len(ALL_PERSPECTIVES)
+
+    async def test_empty_perspectives_get_targeted_fill(self, retriever, cse_calls):
+        calls, responses = cse_calls
+        responses.append(("success", [item("https://www.nature.com/a"), item("https://apnews.com/b")]))
+        responses.append(("success", [item("https://jacobin.com/x")]))
+
+        results = await retriever.search_google_combined(
+            "claim text", [PerspectiveType.SCIENTIFIC, PerspectiveType.JOURNALISTIC, PerspectiveType.PARTISAN_LEFT]
+        )
+
+        assert len(calls) == 2
+        assert "site:jacobin.com" not in calls[1][0]  # fill uses the perspective's own filter
+        assert "site:msnbc.com" in calls[1][0]
+        assert [e.url for e in results[PerspectiveType.PARTISAN_LEFT]] == ["https://jacobin.com/x"]
+
+    async def test_rate_limited_skips_fills(self, retriever, cse_calls):
+        calls, responses = cse_calls
+        responses.append(("rate_limited", []))
+
+        results = await retriever.search_google_combined("claim text", ALL_PERSPECTIVES)
+
+        assert len(calls) == 1
+        assert all(r[0].title == "Search Quota Exceeded" for r in results.values())
+
+    async def test_retrieve_evidence_uses_configured_strategy(self, retriever, cse_calls):
+        calls, _ = cse_calls
+        claim = Claim(id="c", text="claim text")
+
+        retriever.strategy = "per_perspective"
+        await retriever.retrieve_evidence(claim, ALL_PERSPECTIVES)
+        assert len(calls) == 4
+
+        calls.clear()
+        retriever.strategy = "combined"
+        await retriever.retrieve_evidence(claim, ALL_PERSPECTIVES)
+        # Nothing came back, so every perspective was filled
+        assert len(calls) == 1 + 4
+
+
+class TestShardedStrategy:
+    @pytest.fixture
+    def shard_requests(self, retriever, monkeypatch):
+        """CSE stand-in answering each shard after a delay chosen by its first site filter."""
+        state = {"active": 0, "peak": 0, "started": [], "cancelled": []}
+        delays = {}
+        answers = {}
+
+        async def send(params, label):
+            first_site = params["q"].split("site:")[1].split()[0].rstrip(")")
+            state["started"].append(first_site)
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                await asyncio.sleep(delays.get(first_site, 0))
+            except asyncio.CancelledError:
+                state["cancelled"].append(first_site)
+                raise
+            finally:
+                state["active"] -= 1
+            return "success", answers.get(first_site, [])
+
+        monkeypatch.setattr(retriever, "_send_cse_request", send)
+        return state, delays, answers
+
+    async def test_all_domains_are_covered(self, retriever, shard_requests):
+        state, _, answers = shard_requests
+        answers["jacobin.com"] = [item("https://jacobin.com/a")]
+
+        results = await retriever.search_google_sharded("claim", PerspectiveType.PARTISAN_LEFT)
+
+        assert sorted(state["started"]) == ["jacobin.com", "msnbc.com"]
+        assert [e.url for e in results] == ["https://jacobin.com/a"]
+
+    async def test_returns_early_and_cancels_slow_shards(self, retriever, shard_requests):
+        state, delays, answers = shard_requests
+        answers["reuters.com"] = [item(f"https://reuters.com/{i}") for i in range(3)]
+        delays["nytimes.com"] = 5
+
+        results = await asyncio.wait_for(
+            retriever.search_google_sharded("claim", PerspectiveType.JOURNALISTIC), timeout=1
+        )
+
+        assert len(results) == 3
+        assert state["cancelled"] == ["nytimes.com"]
+
+    async def test_results_interleave_by_rank(self, retriever, shard_requests):
+        _, delays, answers = shard_requests
+        answers["nature.com"] = [item("https://nature.com/1")]
+        answers["scientificamerican.com"] = [item("https://scientificamerican.com/1"), item("https://phys.org/2")]
+        delays["nature.com"] = 0.01
+
+        results = await retriever.search_google_sharded("claim", PerspectiveType.SCIENTIFIC)
+
+        assert [e.url for e in results] == [
+            "https://nature.com/1",
+            "https://scientificamerican.com/1",
+            "https://phys.org/2",
+        ]
+
+    async def test_global_limiter_caps_concurrency(self, retriever, shard_requests, monkeypatch):
+        state, delays, _ = shard_requests
+        for domain in retriever.domain_perspectives:
+            delays[domain] = 0.01
+        monkeypatch.setattr("app.services.evidence_retriever.settings.GOOGLE_SEARCH_MAX_CONCURRENT", 2)
+        retriever._limiters.clear()
+        retriever.strategy = "sharded"
+
+        await asyncio.gather(
+            retriever.retrieve_evidence(Claim(id="a", text="first"), ALL_PERSPECTIVES),
+            retriever.retrieve_evidence(Claim(id="b", text="second"), ALL_PERSPECTIVES),
+        )
+
+        assert len(state["started"]) == 2 * 8  # 2 claims x 8 shards
+        assert state["peak"] == 2
@@ -0,0 +1,43 @@
+"""
+Tests for HTTP caching helpers.
+"""
+
+from app.utils.http_cache import compute_etag, etag_matches
+
+
+class TestComputeEtag:
+    """Test strong ETag generation."""
+
+    def test_etag_is_quoted_and_strong(self):
+        etag = compute_etag(b'{"status":"completed"}')
+        assert etag.startswith('"') and etag.endswith('"')
+        assert not etag.startswith("W/")
+
+    def test_same_bytes_same_etag(self):
+        assert compute_etag(b"abc") == compute_etag(b"abc")
+
+    def test_different_bytes_different_etag(self):
+        assert compute_etag(b"abc") != compute_etag(b"abd")
+
+
+class TestEtagMatches:
+    """Test If-None-Match evaluation."""
+
+    def test_missing_header(self):
+        assert not etag_matches(None, '"abc"')
+        assert not etag_matches("", '"abc"')
+
+    def test_exact_match(self):
+        assert etag_matches('"abc"', '"abc"')
+
+    def test_no_match(self):
+        assert not etag_matches('"xyz"', '"abc"')
+
+    def test_list_of_tags(self):
+        assert etag_matches('"xyz", "abc"', '"abc"')
+
+    def test_weak_comparison(self):
+        assert etag_matches('W/"abc"', '"abc"')
+
+    def test_wildcard(self):
+        assert etag_matches("*", '"abc"')
@@ -0,0 +1,526 @@
+"""
+Tests for the analysis job status endpoint.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+from app import main
+from app.core.deadline import current_deadline
+from app.core.priority import priority_gate
+from app.core.tracing import Trace
+from app.services.claim_index import ClaimIndex
+from app.models.schemas import (
+    AnalysisMetadata,
+    AnalysisResponse,
+    BiasAnalysis,
+    Claim,
+    Evidence,
+    JobStatus,
+    PerspectiveAnalysis,
+    Transcript,
+    TranscriptSegment,
+    VideoRequest,
+)
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+
+@pytest.fixture
+def client():
+    main.jobs.clear()
+    main.result_cache.clear()
+    yield TestClient(main.app)
+    main.jobs.clear()
+    main.result_cache.clear()
+    main.prefetch_queue.clear()
+    main.prefetch_jobs.clear()
+
+
+def _add_job(job_id, status, result=None, error=None):
+    job = {
+        "status": status,
+        "result": result,
+        "error": error,
+        "created_at": datetime.now(timezone.utc),
+        "response_body": None,
+        "etag": None,
+        "partial_body": None,
+        "status_changed": asyncio.Event(),
+        "trace": Trace(job_id),
+    }
+    if status in (JobStatus.COMPLETED, JobStatus.FAILED):
+        main.finalize_job(job_id, job)
+    main.jobs[job_id] = job
+    return job
+
+
+def _result():
+    return AnalysisResponse(
+        video_id="abc123",
+        metadata=AnalysisMetadata(analyzed_at="2025-01-01T00:00:00+00:00"),
+        claims=[],
+    )
+
+
+class TestJobStatusCaching:
+    """Test pre-serialized responses and conditional requests."""
+
+    def test_unknown_job_returns_404(self, client):
+        assert client.get("/analyze/jobs/missing").status_code == 404
+
+    def test_in_flight_job_is_not_cached(self, client):
+        _add_job("job-1", JobStatus.PROCESSING)
+
+        response = client.get("/analyze/jobs/job-1")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "processing"
+        assert response.headers["cache-control"] == "no-store"
+        assert "etag" not in response.headers
+
+    def test_completed_job_serves_preserialized_body(self, client):
+        job = _add_job("job-2", JobStatus.COMPLETED, result=_result())
+
+        response = client.get("/analyze/jobs/job-2")
+
+        assert response.status_code == 200
+        assert response.content == job["response_body"]
+        assert response.headers["etag"] == job["etag"]
+        assert "max-age" in response.headers["cache-control"]
+        assert response.json()["result"]["video_id"] == "abc123"
+
+    def test_matching_if_none_match_returns_304(self, client):
+        job = _add_job("job-3", JobStatus.COMPLETED, result=_result())
+
+        response = client.get(
+            "/analyze/jobs/job-3", headers={"If-None-Match": job["etag"]}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == job["etag"]
+
+    def test_stale_if_none_match_returns_body(self, client):
+        _add_job("job-4", JobStatus.COMPLETED, result=_result())
+
+        response = client.get(
+            "/analyze/jobs/job-4", headers={"If-None-Match": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+
+    def test_failed_job_requires_revalidation(self, client):
+        _add_job("job-5", JobStatus.FAILED, error="boom")
+
+        response = client.get("/analyze/jobs/job-5")
+
+        assert response.status_code == 200
+        assert response.json()["error"] == "boom"
+        assert response.headers["cache-control"] == "no-cache"
+        assert "etag" in response.headers
+
+
+class TestJobStatusLongPoll:
+    """Test the ?wait= long-poll mode."""
+
+    @pytest.fixture
+    async def async_client(self):
+        main.jobs.clear()
+        async with AsyncClient(
+            transport=ASGITransport(app=main.app), base_url="http://test"
+        ) as client:
+            yield client
+        main.jobs.clear()
+
+    async def test_wait_returns_on_status_change(self, async_client):
+        _add_job("job-lp", JobStatus.PROCESSING)
+
+        async def complete_job():
+            await asyncio.sleep(0.1)
+            async with main.jobs_lock:
+                job = main.jobs["job-lp"]
+                job["status"] = JobStatus.COMPLETED
+                job["result"] = _result()
+                main.finalize_job("job-lp", job)
+                main.notify_job_update(job)
+
+        started = time.monotonic()
+        response, _ = await asyncio.gather(
+            async_client.get("/analyze/jobs/job-lp", params={"wait": 5}),
+            complete_job(),
+        )
+
+        assert time.monotonic() - started < 2
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        assert "etag" in response.headers
+
+    async def test_wait_times_out_with_current_status(self, async_client):
+        _add_job("job-slow", JobStatus.PROCESSING)
+
+        response = await async_client.get(
+            "/analyze/jobs/job-slow", params={"wait": 0.1}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "processing"
+
+    async def test_wait_on_terminal_job_returns_immediately(self, async_client):
+        _add_job("job-done", JobStatus.COMPLETED, result=_result())
+
+        started = time.monotonic()
+        response = await async_client.get(
+            "/analyze/jobs/job-done", params={"wait": 5}
+        )
+
+        assert time.monotonic() - started < 1
+        assert response.json()["status"] == "completed"
+
+    async def test_negative_wait_is_rejected(self, async_client):
+        _add_job("job-neg", JobStatus.PROCESSING)
+
+        response = await async_client.get(
+            "/analyze/jobs/job-neg", params={"wait": -1}
+        )
+
+        assert response.status_code == 422
+
+
+@pytest.fixture
+def stub_pipeline(monkeypatch):
+    """Replace upstream-facing service calls with fast local stubs."""
+    claims = [
+        Claim(id=f"claim_{i}", text=f"Claim {i}", timestamp_start=float(i), timestamp_end=i + 1.0)
+        for i in range(2)
+    ]
+
+    def get_transcript(video_id):
+        return Transcript(
+            video_id=video_id,
+            segments=[TranscriptSegment(text="Hello", start=0.0, duration=1.0)],
+            full_text="Hello",
+        )
+
+    async def extract_claims(transcript):
+        return claims
+
+    async def retrieve_evidence(claim, perspectives):
+        return {
+            p: [Evidence(url="https://example.com", title="T", snippet="S", source="example.com", perspective=p)]
+            for p in perspectives
+        }
+
+    async def analyze_perspective(claim, perspective, evidence):
+        return PerspectiveAnalysis(
+            perspective=perspective, stance="Support", confidence=0.9, explanation="ok", evidence=evidence
+        )
+
+    async def analyze_bias_and_deception(claim):
+        return BiasAnalysis(deception_rating=1.0, deception_rationale="fine")
+
+    monkeypatch.setattr(main.claim_extractor, "get_transcript", get_transcript)
+    monkeypatch.setattr(main.claim_extractor, "extract_claims", extract_claims)
+    monkeypatch.setattr(main.evidence_retriever, "retrieve_evidence", retrieve_evidence)
+    monkeypatch.setattr(main.analysis_service, "analyze_perspective", analyze_perspective)
+    monkeypatch.setattr(main.analysis_service, "analyze_bias_and_deception", analyze_bias_and_deception)
+    return claims
+
+
+class TestJobTrace:
+    """Test per-job tracing through the pipeline."""
+
+    async def test_process_analysis_records_span_timeline(self, client, stub_pipeline):
+        _add_job("job-trace", JobStatus.PENDING)
+
+        await main.process_analysis(
+            "job-trace", VideoRequest(url="https://www.youtube.com/watch?v=abc123")
+        )
+
+        assert main.jobs["job-trace"]["status"] == JobStatus.COMPLETED
+        response = client.get("/analyze/jobs/job-trace/trace")
+        assert response.status_code == 200
+        spans = response.json()["spans"]
+        names = [s["name"] for s in spans]
+        assert names[0] == "analysis_job"
+        assert "transcript_fetch" in names
+        assert "claim_extraction" in names
+        assert names.count("analyze_perspective") == 8  # 2 claims x 4 perspectives
+
+        by_id = {s["span_id"]: s for s in spans}
+        perspective_span = next(s for s in spans if s["name"] == "analyze_perspective")
+        assert by_id[perspective_span["parent_id"]]["name"] == "perspective_analysis"
+        assert perspective_span["attributes"]["claim_id"].startswith("claim_")
+        assert spans[0]["attributes"]["job.status"] == "completed"
+
+    def test_trace_otlp_format(self, client):
+        _add_job("job-otlp", JobStatus.PROCESSING)
+
+        response = client.get("/analyze/jobs/job-otlp/trace", params={"format": "otlp"})
+
+        assert response.status_code == 200
+        assert "resourceSpans" in response.json()
+
+    def test_trace_unknown_job(self, client):
+        assert client.get("/analyze/jobs/missing/trace").status_code == 404
+
+
+class TestClaimIndexReuse:
+    """Test cross-video reuse of per-claim truth profiles."""
+
+    async def test_repeated_claims_skip_analysis(self, client, stub_pipeline, monkeypatch, tmp_path):
+        index = ClaimIndex(str(tmp_path / "claims.sqlite3"))
+        monkeypatch.setattr(main, "claim_index", index)
+        retrieved = []
+        retrieve_evidence = main.evidence_retriever.retrieve_evidence
+
+        async def counting_retrieve(claim, perspectives):
+            retrieved.append(claim.id)
+            return await retrieve_evidence(claim, perspectives)
+
+        monkeypatch.setattr(main.evidence_retriever, "retrieve_evidence", counting_retrieve)
+
+        for job_id in ("job-first", "job-second"):
+            _add_job(job_id, JobStatus.PENDING)
+            await main.process_analysis(job_id, VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+            assert main.jobs[job_id]["status"] == JobStatus.COMPLETED
+
+        assert retrieved == ["claim_0", "claim_1"]
+        claims = main.jobs["job-second"]["result"].claims
+        assert [c.truth_profile.overall_assessment for c in claims] == ["Likely True", "Likely True"]
+        assert (index.hits, index.misses) == (2, 2)
+        index.close()
+
+
+class TestJobDeadline:
+    """Test per-job deadlines and partial results."""
+
+    async def test_slow_claim_times_out_and_job_completes(self, client, stub_pipeline, monkeypatch):
+        monkeypatch.setattr(main.settings, "JOB_DEADLINE_SECONDS", 0.5)
+        analyze_perspective = main.analysis_service.analyze_perspective
+
+        async def hanging_for_second_claim(claim, perspective, evidence):
+            if claim.id == "claim_1":
+                await asyncio.sleep(30)
+            return await analyze_perspective(claim, perspective, evidence)
+
+        monkeypatch.setattr(main.analysis_service, "analyze_perspective", hanging_for_second_claim)
+        _add_job("job-deadline", JobStatus.PENDING)
+
+        started = time.perf_counter()
+        await main.process_analysis("job-deadline", VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+
+        assert time.perf_counter() - started < 5
+        job = main.jobs["job-deadline"]
+        assert job["status"] == JobStatus.COMPLETED
+        result = job["result"]
+        assert result.metadata.partial is True
+        assert [c.status for c in result.claims] == ["completed", "timed_out"]
+        assert result.claims[0].truth_profile.overall_assessment == "Likely True"
+        assert result.claims[1].truth_profile.overall_assessment == "Timed Out"
+        spans = {span.name: span for span in job["trace"].spans}
+        assert spans["analysis_job"].attributes["claims.timed_out"] == 1
+
+    async def test_extraction_past_its_budget_fails_job(self, client, stub_pipeline, monkeypatch):
+        monkeypatch.setattr(main.settings, "JOB_DEADLINE_SECONDS", 0.5)
+
+        async def hanging_extraction(transcript):
+            await asyncio.sleep(30)
+
+        monkeypatch.setattr(main.claim_extractor, "extract_claims", hanging_extraction)
+        _add_job("job-extraction", JobStatus.PENDING)
+
+        await main.process_analysis("job-extraction", VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+
+        job = main.jobs["job-extraction"]
+        assert job["status"] == JobStatus.FAILED
+        assert "claim_extraction exceeded" in job["error"]
+
+    async def test_results_not_partial_within_deadline(self, client, stub_pipeline):
+        _add_job("job-fast", JobStatus.PENDING)
+
+        await main.process_analysis("job-fast", VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+
+        result = main.jobs["job-fast"]["result"]
+        assert result.metadata.partial is False
+        assert all(c.status == "completed" for c in result.claims)
+
+
+class TestPlaybackPriority:
+    """Test playback-position ordering and incremental publishing."""
+
+    async def test_claims_near_position_published_first(self, client, stub_pipeline, monkeypatch):
+        analyze_perspective = main.analysis_service.analyze_perspective
+        published_before = {}
+
+        async def recording_analyze(claim, perspective, evidence):
+            job = main.jobs["job-playback"]
+            published_before.setdefault(claim.id, [c.claim_text for c in job["result"].claims] if job["result"] else [])
+            return await analyze_perspective(claim, perspective, evidence)
+
+        monkeypatch.setattr(main.analysis_service, "analyze_perspective", recording_analyze)
+        _add_job("job-playback", JobStatus.PENDING)
+        waiter = main.jobs["job-playback"]["status_changed"]
+
+        await main.process_analysis(
+            "job-playback", VideoRequest(url="https://www.youtube.com/watch?v=abc123", current_time=1.5)
+        )
+
+        # claim_1 (1s-2s) spans the position, so it is analyzed and published before claim_0
+        assert published_before == {"claim_1": [], "claim_0": ["Claim 1"]}
+        assert waiter.is_set()
+        result = main.jobs["job-playback"]["result"]
+        assert [c.claim_text for c in result.claims] == ["Claim 1", "Claim 0"]
+        assert result.metadata.partial is False
+
+    async def test_in_flight_poll_returns_partial_result(self, client):
+        _add_job("job-in-flight", JobStatus.PROCESSING)
+        await main.publish_partial_result("job-in-flight", "abc123", [])
+
+        body = main.jobs["job-in-flight"]["partial_body"]
+
+        response = client.get("/analyze/jobs/job-in-flight")
+
+        assert response.content == body
+        assert response.headers["cache-control"] == "no-store"
+        assert response.json()["status"] == "processing"
+        assert response.json()["result"]["metadata"]["partial"] is True
+
+    def test_negative_position_rejected(self, client):
+        response = client.post(
+            "/analyze/jobs", json={"url": "https://www.youtube.com/watch?v=abc123", "current_time": -1}
+        )
+
+        assert response.status_code == 422
+
+
+class TestPrefetch:
+    """Test the result cache and the background prefetch queue."""
+
+    async def test_completed_analysis_is_cached(self, client, stub_pipeline):
+        _add_job("job-first", JobStatus.PENDING)
+        await main.process_analysis("job-first", VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+
+        response = client.post("/analyze/jobs", json={"url": "https://www.youtube.com/watch?v=abc123"})
+        job_id = response.json()["job_id"]
+
+        assert job_id != "job-first"
+        assert main.jobs[job_id]["status"] == JobStatus.COMPLETED
+        assert main.jobs[job_id]["result"] is main.jobs["job-first"]["result"]
+        assert main.result_cache.hits == 1
+
+    async def test_cache_skipped_with_playback_position(self, client, stub_pipeline, monkeypatch):
+        main.result_cache.put("abc123", _result())
+        started = []
+        monkeypatch.setattr(main, "process_analysis", lambda job_id, request: started.append(request))
+
+        response = client.post(
+            "/analyze/jobs", json={"url": "https://www.youtube.com/watch?v=abc123", "current_time": 2700}
+        )
+
+        assert main.jobs[response.json()["job_id"]]["status"] == JobStatus.PENDING
+        assert [r.current_time for r in started] == [2700]
+        assert main.result_cache.hits == 0
+
+    async def test_positioned_result_is_not_cached(self, client, stub_pipeline):
+        _add_job("job-positioned", JobStatus.PENDING)
+        await main.process_analysis(
+            "job-positioned", VideoRequest(url="https://www.youtube.com/watch?v=abc123", current_time=1.5)
+        )
+
+        assert main.jobs["job-positioned"]["status"] == JobStatus.COMPLETED
+        assert "abc123" not in main.result_cache
+
+    async def test_failed_extraction_is_not_cached(self, client, stub_pipeline, monkeypatch):
+        async def failing_extraction(transcript):
+            return [Claim(
+                id="error_claim",
+                text="Error: Unable to extract claims from transcript",
+                metadata={"status": "error", "code": "llm_extraction_failed"},
+            )]
+
+        monkeypatch.setattr(main.claim_extractor, "extract_claims", failing_extraction)
+        _add_job("job-failed-extraction", JobStatus.PENDING)
+        await main.process_analysis("job-failed-extraction", VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+
+        assert main.jobs["job-failed-extraction"]["status"] == JobStatus.COMPLETED
+        assert "abc123" not in main.result_cache
+
+    async def test_quota_placeholder_is_not_cached(self, client, stub_pipeline, monkeypatch):
+        async def quota_exceeded(claim, perspectives):
+            return {p: [main.evidence_retriever._quota_exceeded_evidence(p)] for p in perspectives}
+
+        monkeypatch.setattr(main.evidence_retriever, "retrieve_evidence", quota_exceeded)
+        _add_job("job-quota", JobStatus.PENDING)
+        await main.process_analysis("job-quota", VideoRequest(url="https://www.youtube.com/watch?v=abc123"))
+
+        assert main.jobs["job-quota"]["status"] == JobStatus.COMPLETED
+        assert "abc123" not in main.result_cache
+
+    async def test_prefetch_skips_cached_and_queued_videos(self, client, monkeypatch):
+        monkeypatch.setattr(main, "drain_prefetch_queue", lambda: asyncio.sleep(0))
+        main.result_cache.put("cached1", _result())
+
+        response = client.post("/analyze/prefetch", json={"video_ids": ["new1", "cached1", "new1"]})
+        assert response.status_code == 202
+        assert response.json() == {"queued": ["new1"], "skipped": ["cached1"]}
+
+        response = client.post("/analyze/prefetch", json={"video_ids": ["new1", "new2"]})
+        assert response.json() == {"queued": ["new2"], "skipped": ["new1"]}
+        assert list(main.prefetch_queue) == ["new1", "new2"]
+
+    def test_prefetch_rejects_invalid_video_ids(self, client):
+        response = client.post("/analyze/prefetch", json={"video_ids": ["not a video id"]})
+
+        assert response.status_code == 422
+
+    async def test_prefetch_waits_for_interactive_jobs(self, client, stub_pipeline):
+        interactive = main.JobPriority(interactive=True)
+        main.prefetch_queue.append("abc123")
+
+        with main.activate_priority(interactive):
+            task = asyncio.create_task(main.drain_prefetch_queue())
+            for _ in range(20):
+                await asyncio.sleep(0)
+            # Held before its first upstream call
+            job_id = main.prefetch_jobs["abc123"]
+            assert main.jobs[job_id]["status"] == JobStatus.PROCESSING
+            assert not task.done()
+
+        await asyncio.wait_for(task, 1)
+        assert main.jobs[job_id]["status"] == JobStatus.COMPLETED
+        assert "abc123" in main.result_cache
+        assert main.prefetch_jobs == {}
+
+    async def test_interactive_request_takes_over_prefetch(self, client, stub_pipeline, monkeypatch):
+        analyze_perspective = main.analysis_service.analyze_perspective
+        deadlines = []
+
+        async def recording_analyze(claim, perspective, evidence):
+            deadlines.append(current_deadline())
+            return await analyze_perspective(claim, perspective, evidence)
+
+        monkeypatch.setattr(main.analysis_service, "analyze_perspective", recording_analyze)
+        async with AsyncClient(transport=ASGITransport(app=main.app), base_url="http://test") as async_client:
+            main.prefetch_queue.append("abc123")
+            with main.activate_priority(main.JobPriority(interactive=True)):
+                task = asyncio.create_task(main.drain_prefetch_queue())
+                for _ in range(20):
+                    await asyncio.sleep(0)
+                prefetch_job_id = main.prefetch_jobs["abc123"]
+
+                response = await async_client.post(
+                    "/analyze/jobs", json={"url": "https://www.youtube.com/watch?v=abc123"}
+                )
+
+                # Promoted, so it no longer waits for the other interactive job
+                assert response.json()["job_id"] == prefetch_job_id
+                await asyncio.wait_for(task, 1)
+
+        assert main.jobs[prefetch_job_id]["status"] == JobStatus.COMPLETED
+        assert priority_gate.active == 0
+        # Bounded by the deadline it was promoted with
+        assert deadlines and all(deadline is not None for deadline in deadlines)
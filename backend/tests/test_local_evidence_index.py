@@ -0,0 +1,124 @@
+"""
+Tests for the local evidence index and tiered search.
+"""
+
+import json
+
+import pytest
+from app.models.schemas import Claim, Evidence, PerspectiveType
+from app.services.local_evidence_index import LocalEvidenceIndex
+from app.services.search_provider import SearchProvider, TieredSearchProvider
+
+SCIENTIFIC = PerspectiveType.SCIENTIFIC
+JOURNALISTIC = PerspectiveType.JOURNALISTIC
+
+
+def evidence(url, title, snippet, perspective=SCIENTIFIC, source="example.org"):
+    return Evidence(url=url, title=title, snippet=snippet, source=source, perspective=perspective)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LocalEvidenceIndex(str(tmp_path / "evidence.sqlite3"))
+    index.add([
+        evidence("https://nature.com/sea", "Sea levels rising faster", "Global sea level rise accelerated over the last decade."),
+        evidence("https://nature.com/ice", "Arctic ice loss", "Arctic sea ice extent hit a record low."),
+        evidence("https://phys.org/bees", "Bee populations", "Pollinator decline linked to pesticides."),
+        evidence("https://reuters.com/sea", "Coastal cities and sea level", "Cities prepare for rising seas.", JOURNALISTIC),
+    ])
+    yield index
+    index.close()
+
+
+class StubProvider(SearchProvider):
+    name = "stub"
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def search(self, query, perspectives):
+        self.calls.append(list(perspectives))
+        return {p: self.results.get(p, []) for p in perspectives}
+
+
+class TestLocalEvidenceIndex:
+    def test_bm25_ranked_per_perspective(self, index):
+        results = index.search_perspective("sea levels are rising", SCIENTIFIC)
+
+        assert [e.url for e in results] == ["https://nature.com/sea"]
+        assert results[0].perspective == SCIENTIFIC
+
+    def test_perspective_filter(self, index):
+        results = index.search_perspective("sea level rising", JOURNALISTIC)
+
+        assert [e.url for e in results] == ["https://reuters.com/sea"]
+
+    def test_weak_matches_filtered(self, index):
+        assert index.search_perspective("record sales of electric cars in Norway", SCIENTIFIC) == []
+
+    def test_query_syntax_is_escaped(self, index):
+        assert index.search_perspective('sea "level" OR NEAR(', SCIENTIFIC)
+
+    def test_add_skips_system_placeholders_and_dedupes(self, index):
+        written = index.add([
+            evidence("https://developers.google.com/quota", "Search Quota Exceeded", "quota", source="System"),
+            evidence("https://nature.com/sea", "Sea levels rising faster", "Updated snippet about sea level rise."),
+        ])
+
+        assert written == 1
+        assert index.count()[SCIENTIFIC.value] == 3
+        assert "Updated" in index.search_perspective("sea level rise", SCIENTIFIC)[0].snippet
+
+    def test_import_jsonl(self, index, tmp_path):
+        dump = tmp_path / "articles.jsonl"
+        dump.write_text("\n".join([
+            json.dumps({"url": "https://apnews.com/vote", "title": "Voting turnout", "text": "Turnout reached record levels.", "perspective": "Journalistic"}),
+            json.dumps({"url": "https://who.int/vax", "title": "Vaccine efficacy", "snippet": "Vaccines reduce severe illness."}),
+            "not json",
+            json.dumps({"title": "missing url"}),
+        ]))
+
+        assert index.import_jsonl(str(dump), perspective=SCIENTIFIC) == 2
+        assert index.search_perspective("vaccine efficacy", SCIENTIFIC)[0].source == "who.int"
+        assert index.search_perspective("voting turnout record", JOURNALISTIC)[0].url == "https://apnews.com/vote"
+
+    async def test_retrieve_evidence_offline(self, index):
+        results = await index.retrieve_evidence(Claim(id="c", text="Arctic sea ice hit a record low"), [SCIENTIFIC, JOURNALISTIC])
+
+        assert results[SCIENTIFIC][0].url == "https://nature.com/ice"
+        assert results[JOURNALISTIC] == []
+
+
+class TestTieredSearchProvider:
+    async def test_later_tier_fills_gaps_and_is_written_through(self, index):
+        google = StubProvider({
+            JOURNALISTIC: [
+                evidence("https://apnews.com/ice", "Arctic ice record low", "Arctic sea ice record low, scientists say.", JOURNALISTIC),
+                evidence("https://bbc.com/ice", "Arctic ice record", "Arctic sea ice shrinks to record low.", JOURNALISTIC),
+            ],
+        })
+        index.add([evidence("https://who.int/ice", "Arctic ice record low", "Arctic sea ice record low confirmed.")])
+        tiered = TieredSearchProvider([index, google], write_through=index)
+
+        results = await tiered.search("Arctic sea ice record low", [SCIENTIFIC, JOURNALISTIC])
+
+        assert google.calls == [[JOURNALISTIC]]
+        assert len(results[SCIENTIFIC]) == 2
+        assert len(results[JOURNALISTIC]) == 2
+
+        # Second time the local tier answers everything
+        again = await tiered.search("Arctic sea ice record low", [SCIENTIFIC, JOURNALISTIC])
+        assert google.calls == [[JOURNALISTIC]]
+        assert {e.url for e in again[JOURNALISTIC]} == {"https://apnews.com/ice", "https://bbc.com/ice"}
+
+    async def test_merges_without_duplicate_urls(self, index):
+        google = StubProvider({SCIENTIFIC: [
+            evidence("https://nature.com/sea", "Sea levels rising faster", "dup"),
+            evidence("https://science.org/sea", "Sea rise", "Sea level rise measured by satellites."),
+        ]})
+        tiered = TieredSearchProvider([index, google])
+
+        results = await tiered.search("sea level rise", [SCIENTIFIC])
+
+        assert [e.url for e in results[SCIENTIFIC]] == ["https://nature.com/sea", "https://science.org/sea"]
@@ -0,0 +1,110 @@
+"""
+Tests for the in-process metrics registry and the /metrics endpoint.
+"""
+
+import pytest
+from app import main
+from app.core.metrics import (
+    LLM_CALLS,
+    UPSTREAM_RATE_LIMITED,
+    MetricsRegistry,
+    is_rate_limit_error,
+    record_llm_call,
+)
+from fastapi.testclient import TestClient
+
+
+class TestMetricsRegistry:
+    """Test metric types and Prometheus text rendering."""
+
+    def test_counter_renders_with_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("test_calls_total", "Calls.", ["outcome"])
+        counter.inc(outcome="success")
+        counter.inc(2, outcome="success")
+
+        output = registry.render()
+
+        assert "# TYPE test_calls_total counter" in output
+        assert 'test_calls_total{outcome="success"} 3' in output
+
+    def test_counter_rejects_negative_increment(self):
+        counter = MetricsRegistry().counter("test_total", "Test.")
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+
+    def test_wrong_labels_rejected(self):
+        counter = MetricsRegistry().counter("test_total", "Test.", ["stage"])
+        with pytest.raises(ValueError):
+            counter.inc(status="x")
+
+    def test_duplicate_registration_rejected(self):
+        registry = MetricsRegistry()
+        registry.gauge("test_gauge", "Test.")
+        with pytest.raises(ValueError):
+            registry.gauge("test_gauge", "Test.")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("test_seconds", "Latency.", ["stage"], buckets=(1, 5))
+        for value in (0.5, 2, 10):
+            histogram.observe(value, stage="fetch")
+
+        output = registry.render()
+
+        assert 'test_seconds_bucket{stage="fetch",le="1"} 1' in output
+        assert 'test_seconds_bucket{stage="fetch",le="5"} 2' in output
+        assert 'test_seconds_bucket{stage="fetch",le="+Inf"} 3' in output
+        assert 'test_seconds_sum{stage="fetch"} 12.5' in output
+        assert 'test_seconds_count{stage="fetch"} 3' in output
+
+    def test_histogram_time_records_on_exception(self):
+        histogram = MetricsRegistry().histogram("test_seconds", "Latency.", ["stage"])
+        with pytest.raises(RuntimeError):
+            with histogram.time(stage="boom"):
+                raise RuntimeError()
+        assert histogram.get_count(stage="boom") == 1
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("test_gauge", "Test.", ["name"])
+        gauge.set(1, name='a"b\\c')
+        assert 'test_gauge{name="a\\"b\\\\c"} 1' in registry.render()
+
+
+class TestUpstreamCallRecording:
+    """Test classification of upstream call outcomes."""
+
+    def test_rate_limit_detection(self):
+        class FakeRateLimitError(Exception):
+            status_code = 429
+
+        assert is_rate_limit_error(FakeRateLimitError())
+        assert not is_rate_limit_error(ValueError())
+
+    def test_rate_limited_llm_call_is_counted(self):
+        class FakeRateLimitError(Exception):
+            status_code = 429
+
+        before = UPSTREAM_RATE_LIMITED.get(upstream="test-provider")
+        record_llm_call("test_service", "test-provider", 0.1, FakeRateLimitError())
+
+        assert UPSTREAM_RATE_LIMITED.get(upstream="test-provider") == before + 1
+        assert LLM_CALLS.get(
+            service="test_service", provider="test-provider", outcome="rate_limited"
+        ) >= 1
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint."""
+
+    def test_metrics_endpoint_exposes_queue_depth_and_cache_stats(self):
+        main.jobs.clear()
+        client = TestClient(main.app)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'perspective_prism_jobs{status="pending"} 0' in response.text
+        assert 'perspective_prism_cache_hit_ratio{cache="sanitization"}' in response.text
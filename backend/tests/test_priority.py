@@ -0,0 +1,90 @@
+"""
+Tests for interactive vs. background job priority.
+"""
+
+import asyncio
+
+import pytest
+from app.core.deadline import Deadline, activate_deadline, current_deadline
+from app.core.priority import (
+    JobPriority,
+    activate_priority,
+    adopt_promoted_deadline,
+    priority_gate,
+    promote,
+    yield_to_interactive,
+)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def idle_gate():
+    assert priority_gate.active == 0
+    yield
+    assert priority_gate.active == 0
+
+
+class TestPriorityGate:
+    async def test_interactive_job_never_waits(self):
+        with activate_priority(JobPriority(interactive=True)):
+            with activate_priority(JobPriority(interactive=True)):
+                await asyncio.wait_for(yield_to_interactive(), 0.1)
+
+    async def test_background_job_waits_for_interactive_jobs(self):
+        background = JobPriority(interactive=False)
+
+        async def background_job():
+            with activate_priority(background):
+                await yield_to_interactive()
+
+        with activate_priority(JobPriority(interactive=True)):
+            task = asyncio.create_task(background_job())
+            await _settle()
+            assert not task.done()
+
+        await asyncio.wait_for(task, 0.1)
+
+    async def test_background_job_runs_when_idle(self):
+        with activate_priority(JobPriority(interactive=False)):
+            await asyncio.wait_for(yield_to_interactive(), 0.1)
+
+    async def test_promotion_releases_waiting_job(self):
+        background = JobPriority(interactive=False)
+
+        async def background_job():
+            with activate_priority(background):
+                await yield_to_interactive()
+                assert priority_gate.active == 2
+
+        with activate_priority(JobPriority(interactive=True)):
+            task = asyncio.create_task(background_job())
+            await _settle()
+            promote(background)
+            await asyncio.wait_for(task, 0.1)
+            assert priority_gate.active == 1
+
+    async def test_promotion_before_start_counts_once(self):
+        priority = JobPriority(interactive=False)
+        promote(priority)
+        promote(priority)
+        assert priority_gate.active == 0
+
+        with activate_priority(priority):
+            assert priority_gate.active == 1
+
+    async def test_promoted_job_adopts_deadline(self):
+        priority = JobPriority(interactive=False)
+        deadline = Deadline(10.0)
+
+        with activate_deadline(None), activate_priority(priority):
+            adopt_promoted_deadline()
+            assert current_deadline() is None
+
+            promote(priority, deadline)
+            adopt_promoted_deadline()
+            assert current_deadline() is deadline
+        assert current_deadline() is None
@@ -0,0 +1,73 @@
+"""
+Tests for cache-friendly prompt templates.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.metrics import LLM_TOKENS
+from app.models.schemas import Claim, Evidence, PerspectiveType
+from app.services.analysis_service import AnalysisService
+from app.utils.prompt_templates import BIAS_ANALYSIS, CLAIM_EXTRACTION, PERSPECTIVE_ANALYSIS
+
+
+def test_system_prompt_is_identical_across_requests():
+    first_system, first_user = PERSPECTIVE_ANALYSIS.render(perspective="Scientific", claim="A", evidence="- x")
+    second_system, second_user = PERSPECTIVE_ANALYSIS.render(perspective="Journalistic", claim="B", evidence="- y")
+
+    assert first_system == second_system
+    assert first_user != second_user
+
+
+def test_user_data_only_in_user_prompt():
+    system, user = BIAS_ANALYSIS.render(claim="The moon is made of cheese", context="Said on a podcast")
+
+    assert "cheese" not in system
+    assert "OUTPUT FORMAT" in system
+    assert "OUTPUT FORMAT" not in user
+    assert user.index("CLAIM TEXT:") < user.index("CONTEXT:")
+    assert "===USER DATA START===" in user
+
+
+def test_sections_follow_template_order():
+    _, user = PERSPECTIVE_ANALYSIS.render(perspective="Scientific", claim="claim", evidence="evidence")
+
+    assert user.index("PERSPECTIVE:") < user.index("CLAIM:") < user.index("EVIDENCE:")
+
+
+def test_missing_section_raises():
+    with pytest.raises(KeyError):
+        CLAIM_EXTRACTION.render()
+
+
+@pytest.mark.asyncio
+async def test_analysis_sends_static_system_message_and_records_cached_tokens():
+    with patch("app.services.analysis_service.settings") as mock_settings:
+        mock_settings.OPENAI_API_KEY = "sk-test"
+        mock_settings.OPENAI_MODEL = "gpt-4o"
+        mock_settings.LLM_PROVIDER = "openai"
+        service = AnalysisService()
+
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content='{"stance": "Support", "confidence": 0.8, "explanation": "ok"}'))]
+    response.usage = SimpleNamespace(
+        prompt_tokens=400, completion_tokens=30, prompt_tokens_details=SimpleNamespace(cached_tokens=256)
+    )
+    service.client = MagicMock()
+    service.client.chat.completions.create = AsyncMock(return_value=response)
+    cached_before = LLM_TOKENS.get(service="analysis_service", provider="openai", kind="cached_prompt")
+
+    evidence = [
+        Evidence(url="https://example.org/a", title="T", snippet="S", source="example.org", perspective=PerspectiveType.SCIENTIFIC)
+    ]
+    for text in ("Claim one", "Claim two"):
+        claim = Claim(id="c", text=text, timestamp_start=0.0, timestamp_end=1.0, context="")
+        await service.analyze_perspective(claim, PerspectiveType.SCIENTIFIC, evidence)
+
+    calls = service.client.chat.completions.create.call_args_list
+    first, second = (call.kwargs["messages"] for call in calls)
+    assert first[0] == second[0]
+    assert first[0]["role"] == "system"
+    assert "Claim one" in first[1]["content"]
+    assert LLM_TOKENS.get(service="analysis_service", provider="openai", kind="cached_prompt") == cached_before + 512
@@ -0,0 +1,235 @@
+"""
+Tests for schema-enforced LLM output and the repair retry.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+from app.core.metrics import LLM_OUTPUT_REPAIRS
+from app.models.schemas import Claim, Evidence, PerspectiveType
+from app.services.analysis_service import AnalysisService
+from app.utils.structured_output import (
+    BIAS_OUTPUT,
+    CLAIM_EXTRACTION_OUTPUT,
+    PERSPECTIVE_OUTPUT,
+    call_structured,
+    repair_prompt,
+    schema_output_enabled,
+)
+from pydantic import ValidationError
+
+VALID_VERDICT = '{"stance": "Refute", "confidence": 0.7, "explanation": "Sources disagree."}'
+
+
+class TestSchemas:
+    def test_openai_schema_is_strict(self):
+        response_format = BIAS_OUTPUT.openai_response_format
+        schema = response_format["json_schema"]["schema"]
+
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["strict"] is True
+        assert schema["additionalProperties"] is False
+        assert set(schema["required"]) == set(schema["properties"])
+        assert "default" not in str(schema) and "title" not in schema
+
+    def test_nested_models_are_inlined(self):
+        schema = CLAIM_EXTRACTION_OUTPUT.openai_response_format["json_schema"]["schema"]
+        item = schema["properties"]["claims"]["items"]
+
+        assert "$ref" not in str(schema)
+        assert item["required"] == ["text", "context"]
+        assert item["additionalProperties"] is False
+
+    def test_gemini_schema_uses_nullable(self):
+        schema = BIAS_OUTPUT.gemini_schema
+
+        assert schema["properties"]["framing_bias"] == {"type": "string", "nullable": True}
+        assert "anyOf" not in str(schema)
+
+    def test_gemini_schema_accepted_by_sdk(self):
+        protos = pytest.importorskip("google.generativeai.protos")
+        from google.generativeai.types import generation_types
+
+        for output in (PERSPECTIVE_OUTPUT, BIAS_OUTPUT, CLAIM_EXTRACTION_OUTPUT):
+            config = {"response_schema": output.gemini_schema}
+            generation_types._normalize_schema(config)
+            assert isinstance(config["response_schema"], protos.Schema)
+
+
+class TestParse:
+    def test_numeric_strings_are_coerced(self):
+        verdict = PERSPECTIVE_OUTPUT.parse('{"stance": "Support", "confidence": "0.9", "explanation": "ok"}')
+
+        assert verdict.confidence == 0.9
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            None,
+            "not json",
+            '{"stance": "Maybe", "confidence": 0.5, "explanation": "x"}',
+            '{"stance": "Support", "confidence": 1.5, "explanation": "x"}',
+            '{"stance": "Support", "explanation": "x"}',
+        ],
+    )
+    def test_off_schema_responses_raise(self, content):
+        with pytest.raises(ValidationError):
+            PERSPECTIVE_OUTPUT.parse(content)
+
+    def test_repair_prompt_lists_errors(self):
+        content = '{"stance": "Maybe", "confidence": 0.5}'
+        with pytest.raises(ValidationError) as exc_info:
+            PERSPECTIVE_OUTPUT.parse(content)
+
+        prompt = repair_prompt("ORIGINAL", content, exc_info.value)
+
+        assert prompt.startswith("ORIGINAL")
+        assert "- stance:" in prompt
+        assert "- explanation:" in prompt
+        assert "PREVIOUS RESPONSE:" in prompt
+
+
+class TestCallStructured:
+    async def test_valid_response_needs_one_call(self):
+        call = AsyncMock(return_value=VALID_VERDICT)
+
+        verdict = await call_structured(call, "prompt", "system", PERSPECTIVE_OUTPUT, "test")
+
+        assert verdict.stance == "Refute"
+        call.assert_awaited_once_with("prompt", "system", PERSPECTIVE_OUTPUT)
+
+    async def test_invalid_response_is_repaired_once(self):
+        call = AsyncMock(side_effect=['{"stance": "Refute", "confidence": "high"}', VALID_VERDICT])
+        before = LLM_OUTPUT_REPAIRS.get(service="test", output="perspective_analysis", outcome="repaired")
+
+        verdict = await call_structured(call, "prompt", "system", PERSPECTIVE_OUTPUT, "test")
+
+        assert verdict.confidence == 0.7
+        assert call.await_count == 2
+        repair_args = call.await_args_list[1].args
+        assert repair_args[1] == "system"
+        assert "confidence" in repair_args[0]
+        assert LLM_OUTPUT_REPAIRS.get(service="test", output="perspective_analysis", outcome="repaired") == before + 1
+
+    async def test_failed_repair_raises(self):
+        call = AsyncMock(return_value="{}")
+        before = LLM_OUTPUT_REPAIRS.get(service="test", output="perspective_analysis", outcome="failed")
+
+        with pytest.raises(ValidationError):
+            await call_structured(call, "prompt", None, PERSPECTIVE_OUTPUT, "test")
+
+        assert call.await_count == 2
+        assert LLM_OUTPUT_REPAIRS.get(service="test", output="perspective_analysis", outcome="failed") == before + 1
+
+
+class TestSchemaSupport:
+    @pytest.mark.parametrize("model, expected", [
+        ("gpt-4o-mini", True),
+        ("gpt-4o-2024-05-13", False),
+        ("gpt-3.5-turbo", False),
+        ("gpt-4-turbo", False),
+        ("gpt-5-mini", True),
+        ("o1-mini", False),
+        ("gemini-pro", False),
+        ("gemini-1.5-flash-latest", True),
+        ("some-local-model", False),
+    ])
+    def test_auto_decides_by_model(self, model, expected):
+        assert schema_output_enabled("auto", model) is expected
+
+    def test_explicit_setting_overrides_model(self):
+        assert schema_output_enabled("true", "gpt-3.5-turbo") is True
+        assert schema_output_enabled("false", "gpt-4o") is False
+
+
+def _service(structured_output=True, model="gpt-4o"):
+    with patch("app.services.analysis_service.settings") as mock_settings:
+        mock_settings.OPENAI_API_KEY = "sk-test"
+        mock_settings.OPENAI_MODEL = model
+        mock_settings.LLM_PROVIDER = "openai"
+        mock_settings.LLM_STRUCTURED_OUTPUT = structured_output
+        service = AnalysisService()
+    service.client = MagicMock()
+    return service
+
+
+def _response(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    return response
+
+
+CLAIM = Claim(id="c", text="The bridge opened in 1932", timestamp_start=0.0, timestamp_end=1.0, context="")
+EVIDENCE = [
+    Evidence(url="https://example.org/a", title="T", snippet="S", source="example.org", perspective=PerspectiveType.SCIENTIFIC)
+]
+
+
+class TestAnalysisService:
+    async def test_requests_json_schema(self):
+        service = _service()
+        service.client.chat.completions.create = AsyncMock(return_value=_response(VALID_VERDICT))
+
+        analysis = await service.analyze_perspective(CLAIM, PerspectiveType.SCIENTIFIC, EVIDENCE)
+
+        assert analysis.stance == "Refute"
+        kwargs = service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == PERSPECTIVE_OUTPUT.openai_response_format
+
+    async def test_json_mode_when_disabled(self):
+        service = _service(structured_output=False)
+        service.client.chat.completions.create = AsyncMock(return_value=_response(VALID_VERDICT))
+
+        await service.analyze_perspective(CLAIM, PerspectiveType.SCIENTIFIC, EVIDENCE)
+
+        kwargs = service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    async def test_json_mode_for_models_without_schema_support(self):
+        service = _service(structured_output="auto", model="gpt-3.5-turbo")
+        service.client.chat.completions.create = AsyncMock(return_value=_response(VALID_VERDICT))
+
+        await service.analyze_perspective(CLAIM, PerspectiveType.SCIENTIFIC, EVIDENCE)
+
+        kwargs = service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    async def test_rejected_schema_falls_back_to_json_mode(self):
+        service = _service()
+        rejection = openai.BadRequestError(
+            "Invalid parameter: 'response_format' of type 'json_schema' is not supported with this model.",
+            response=httpx.Response(400, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")),
+            body=None,
+        )
+        service.client.chat.completions.create = AsyncMock(side_effect=[rejection, _response(VALID_VERDICT)])
+
+        analysis = await service.analyze_perspective(CLAIM, PerspectiveType.SCIENTIFIC, EVIDENCE)
+
+        assert analysis.stance == "Refute"
+        kwargs = service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+        assert service.structured_output is False
+
+    async def test_off_schema_bias_response_is_repaired(self):
+        service = _service()
+        service.client.chat.completions.create = AsyncMock(side_effect=[
+            _response('{"deception_rating": "eleven", "deception_rationale": "x"}'),
+            _response('{"framing_bias": null, "sourcing_bias": null, "omission_bias": null, '
+                      '"sensationalism": "Clickbait title", "deception_rating": 3, "deception_rationale": "Mild."}'),
+        ])
+
+        bias = await service.analyze_bias_and_deception(CLAIM)
+
+        assert bias.deception_rating == 3.0
+        assert bias.sensationalism == "Clickbait title"
+
+    async def test_failed_repair_reports_error(self):
+        service = _service()
+        service.client.chat.completions.create = AsyncMock(return_value=_response('{"stance": "Perhaps"}'))
+
+        analysis = await service.analyze_perspective(CLAIM, PerspectiveType.SCIENTIFIC, EVIDENCE)
+
+        assert analysis.stance == "Error"
+        assert service.client.chat.completions.create.await_count == 2
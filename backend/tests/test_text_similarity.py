@@ -0,0 +1,59 @@
+"""
+Tests for the shared term extraction and similarity measures.
+"""
+
+from collections import Counter
+
+import pytest
+from app.utils.text_similarity import (
+    cosine,
+    facts_conflict,
+    jaccard,
+    key_facts,
+    stem,
+    terms,
+    tfidf_vectors,
+    tokenize,
+)
+
+
+def test_terms_drop_stopwords_and_punctuation():
+    assert tokenize("The Earth's core, is HOT.") == ["the", "earth", "s", "core", "is", "hot"]
+    assert terms("The Earth's core, is HOT.") == ["earth", "s", "core", "hot"]
+
+
+def test_stem_is_a_prefix():
+    assert stem("vaccinations") == stem("vaccines") == "vacci"
+    assert stem("tax") == "tax"
+
+
+def test_tfidf_vectors_are_normalized():
+    vectors = tfidf_vectors([Counter(terms(text)) for text in (
+        "unemployment fell sharply",
+        "unemployment rose sharply",
+        "",
+    )])
+
+    assert cosine(vectors[0], vectors[0]) == pytest.approx(1.0)
+    assert 0.0 < cosine(vectors[0], vectors[1]) < 1.0
+    assert vectors[2] == {}
+
+
+def test_jaccard():
+    assert jaccard(frozenset("ab"), frozenset("bc")) == pytest.approx(1 / 3)
+    assert jaccard(frozenset(), frozenset()) == 1.0
+
+
+def test_key_facts_are_numbers_and_negations():
+    assert key_facts(set(terms("Unemployment didn't fall below 3.5 percent"))) == {"t", "3", "5"}
+
+
+def test_facts_conflict():
+    def conflict(a, b):
+        return facts_conflict(set(terms(a)), set(terms(b)))
+
+    assert conflict("The vaccine is safe", "The vaccine is not safe")
+    assert conflict("Deficit reached 1.7 trillion", "Deficit reached 3.7 trillion")
+    # A restatement may drop the figure
+    assert not conflict("Vaccine is ninety five percent effective", "Vaccine is 95 percent effective")
+    assert not conflict("Deficit reached 1.7 trillion", "The deficit reached 1.7 trillion dollars")
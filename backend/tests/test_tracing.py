@@ -0,0 +1,129 @@
+"""
+Tests for in-process job tracing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from app.core.tracing import (
+    Trace,
+    activate_trace,
+    annotate_llm_usage,
+    current_span,
+    start_span,
+)
+
+
+class TestSpans:
+    """Test span recording and nesting."""
+
+    def test_start_span_is_noop_without_trace(self):
+        with start_span("orphan") as span:
+            span.set_attribute("ignored", 1)
+        assert current_span() is not None
+
+    def test_nested_spans_record_parent(self):
+        trace = Trace("job-1")
+        with activate_trace(trace):
+            with start_span("outer") as outer:
+                with start_span("inner", perspective="Scientific") as inner:
+                    pass
+
+        assert [s.name for s in trace.spans] == ["outer", "inner"]
+        assert inner.parent_id == outer.span_id
+        assert inner.attributes["perspective"] == "Scientific"
+        assert outer.duration_ms >= inner.duration_ms
+
+    async def test_spans_in_gathered_tasks_share_parent(self):
+        trace = Trace("job-2")
+
+        async def child(name):
+            with start_span(name):
+                await asyncio.sleep(0)
+
+        with activate_trace(trace):
+            with start_span("parent") as parent:
+                await asyncio.gather(child("a"), child("b"))
+
+        children = [s for s in trace.spans if s.name in ("a", "b")]
+        assert len(children) == 2
+        assert all(s.parent_id == parent.span_id for s in children)
+
+    def test_exception_marks_span_as_error(self):
+        trace = Trace("job-3")
+        with activate_trace(trace):
+            with pytest.raises(ValueError):
+                with start_span("failing"):
+                    raise ValueError("bad input")
+
+        span = trace.spans[0]
+        assert span.status == "error"
+        assert "bad input" in span.error
+        assert span.end_time_ns is not None
+
+
+class TestTraceExport:
+    """Test timeline and OTLP/JSON encodings."""
+
+    def test_timeline_orders_spans(self):
+        trace = Trace("job-4")
+        with activate_trace(trace):
+            with start_span("first"):
+                pass
+            with start_span("second"):
+                pass
+
+        timeline = trace.to_dict()
+
+        assert timeline["job_id"] == "job-4"
+        assert [s["name"] for s in timeline["spans"]] == ["first", "second"]
+        assert timeline["spans"][0]["duration_ms"] is not None
+
+    def test_otlp_encoding(self):
+        trace = Trace("job-5")
+        with activate_trace(trace):
+            with start_span("llm_call", provider="openai") as span:
+                span.set_attribute("llm.prompt_tokens", 120)
+
+        otlp = trace.to_otlp()
+        spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+        assert len(spans) == 1
+        assert spans[0]["traceId"] == trace.trace_id
+        assert len(spans[0]["spanId"]) == 16
+        assert {"key": "llm.prompt_tokens", "value": {"intValue": "120"}} in spans[0]["attributes"]
+        assert {"key": "provider", "value": {"stringValue": "openai"}} in spans[0]["attributes"]
+
+
+class TestLlmUsageAnnotation:
+    """Test extraction of token counts from provider responses."""
+
+    def test_openai_usage(self):
+        trace = Trace("job-6")
+        response = SimpleNamespace(
+            usage=SimpleNamespace(
+                prompt_tokens=100,
+                completion_tokens=20,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+            )
+        )
+        with activate_trace(trace):
+            with start_span("llm_call") as span:
+                annotate_llm_usage(span, response)
+
+        assert span.attributes["llm.prompt_tokens"] == 100
+        assert span.attributes["llm.completion_tokens"] == 20
+        assert span.attributes["llm.cached_prompt_tokens"] == 64
+
+    def test_gemini_usage(self):
+        trace = Trace("job-7")
+        response = SimpleNamespace(
+            usage_metadata=SimpleNamespace(prompt_token_count=50, candidates_token_count=10)
+        )
+        with activate_trace(trace):
+            with start_span("llm_call") as span:
+                annotate_llm_usage(span, response)
+
+        assert span.attributes["llm.prompt_tokens"] == 50
+        assert "llm.cached_prompt_tokens" not in span.attributes
@@ -0,0 +1,111 @@
+"""
+Tests for transcript compaction.
+"""
+
+from app.models.schemas import CompactedTranscript, Transcript, TranscriptSegment
+from app.services.claim_extractor import format_transcript
+from app.utils.transcript_compactor import MAX_UNIT_SECONDS, compact_transcript
+
+
+def make_transcript(*segments):
+    segs = [TranscriptSegment(text=text, start=start, duration=duration) for text, start, duration in segments]
+    return Transcript(video_id="vid", segments=segs, full_text=" ".join(s.text for s in segs))
+
+
+class TestCompaction:
+    def test_merges_segments_into_sentences(self):
+        transcript = make_transcript(
+            ("Global temperatures have", 0.0, 2.0),
+            ("risen by about one degree.", 2.0, 2.0),
+            ("Sea levels are rising too.", 4.0, 2.5),
+        )
+
+        compacted = compact_transcript(transcript)
+
+        assert [s.text for s in compacted.segments] == [
+            "Global temperatures have risen by about one degree.",
+            "Sea levels are rising too.",
+        ]
+        assert compacted.segments[0].start == 0.0
+        assert compacted.segments[0].duration == 4.0
+        assert compacted.source_spans == [(0, 1), (2, 2)]
+        assert compacted.original_segments == transcript.segments
+
+    def test_drops_rolling_caption_overlap(self):
+        transcript = make_transcript(
+            ("so what we found was", 0.0, 3.0),
+            ("what we found was that the ice", 1.5, 3.0),
+            ("that the ice is melting faster.", 3.0, 3.0),
+        )
+
+        compacted = compact_transcript(transcript)
+
+        assert compacted.full_text == "so what we found was that the ice is melting faster."
+        assert compacted.source_spans == [(0, 2)]
+
+    def test_single_word_repeats_are_kept(self):
+        transcript = make_transcript(("it is very", 0.0, 1.0), ("very hot.", 1.0, 1.0))
+
+        assert compact_transcript(transcript).full_text == "it is very very hot."
+
+    def test_strips_annotations_and_filler(self):
+        transcript = make_transcript(
+            ("[Music]", 0.0, 2.0),
+            (">> um so the, uh, vaccine works.", 2.0, 3.0),
+        )
+
+        compacted = compact_transcript(transcript)
+
+        assert compacted.full_text == "so the, vaccine works."
+        assert compacted.source_spans == [(1, 1)]
+
+    def test_unpunctuated_captions_split_on_pause_and_length(self):
+        segments = [(f"word{i} and more", i * 2.0, 2.0) for i in range(20)]
+        segments.append(("after a pause", 60.0, 2.0))
+
+        compacted = compact_transcript(make_transcript(*segments))
+
+        assert all(s.duration <= MAX_UNIT_SECONDS + 2.0 for s in compacted.segments)
+        assert compacted.segments[-1].text == "after a pause"
+        assert compacted.segments[-1].start == 60.0
+        covered = [i for first, last in compacted.source_spans for i in range(first, last + 1)]
+        assert covered == list(range(21))
+
+    def test_empty_transcript(self):
+        compacted = compact_transcript(make_transcript())
+
+        assert compacted.segments == []
+        assert compacted.full_text == ""
+
+
+class TestCompactedFormatting:
+    def test_timestamps_only_at_interval(self):
+        transcript = make_transcript(
+            ("First sentence.", 0.0, 5.0),
+            ("Second sentence.", 10.0, 5.0),
+            ("Third sentence.", 35.0, 5.0),
+        )
+
+        compacted = compact_transcript(transcript, timestamp_interval=30.0)
+        text = format_transcript(compacted, "gpt-4o")
+
+        assert text.splitlines() == [
+            "[00:00] First sentence.",
+            "Second sentence.",
+            "[00:35] Third sentence.",
+        ]
+
+    def test_compaction_reduces_prompt_size(self):
+        words = "the measured rate of warming has doubled since the nineties".split()
+        segments = []
+        for i in range(200):
+            # Rolling captions: each segment repeats the previous one's tail
+            chunk = words[(i * 3) % 8:(i * 3) % 8 + 4]
+            previous = words[((i - 1) * 3) % 8 + 2:((i - 1) * 3) % 8 + 4] if i else []
+            segments.append((" ".join(previous + chunk), i * 1.5, 3.0))
+        transcript = make_transcript(*segments)
+
+        compacted = compact_transcript(transcript)
+
+        assert isinstance(compacted, CompactedTranscript)
+        assert len(format_transcript(compacted, "gpt-4o")) < 0.7 * len(format_transcript(transcript, "gpt-4o"))
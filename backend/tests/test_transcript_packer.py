@@ -0,0 +1,141 @@
+"""
+Tests for token-budgeted transcript packing.
+"""
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import Settings
+from app.models.schemas import TranscriptSegment
+from app.utils import transcript_packer
+from app.utils.transcript_packer import (
+    RESERVED_PROMPT_TOKENS,
+    TRUNCATION_MARKER,
+    estimate_tokens,
+    load_token_counter,
+    model_context_tokens,
+    pack_transcript,
+    transcript_token_budget,
+)
+
+
+def make_segments(count, text="the quick brown fox jumps over the lazy dog"):
+    return [TranscriptSegment(text=text, start=i * 4.0, duration=4.0) for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def estimator_only():
+    """Pin the estimator so results don't depend on tiktoken being installed."""
+    with patch.object(transcript_packer, "TIKTOKEN_AVAILABLE", False):
+        transcript_packer._tiktoken_counter.cache_clear()
+        yield
+    transcript_packer._tiktoken_counter.cache_clear()
+
+
+class TestPackTranscript:
+    def test_fits_without_truncation(self):
+        packed = pack_transcript(make_segments(3), 1000, "gpt-4o")
+
+        assert not packed.truncated
+        assert packed.segments_used == 3
+        assert packed.text.splitlines() == [
+            "[00:00] the quick brown fox jumps over the lazy dog",
+            "[00:04] the quick brown fox jumps over the lazy dog",
+            "[00:08] the quick brown fox jumps over the lazy dog",
+        ]
+        assert TRUNCATION_MARKER not in packed.text
+
+    def test_budget_is_respected(self):
+        packed = pack_transcript(make_segments(500), 300, "gpt-4o")
+
+        assert packed.truncated
+        assert packed.text.endswith(TRUNCATION_MARKER)
+        assert 0 < packed.segments_used < 500
+        assert packed.token_count <= 300
+        # The estimate over-counts, so the real text is within budget too
+        assert estimate_tokens(packed.text) <= 300
+
+    def test_stops_consuming_segments_at_budget(self):
+        consumed = []
+
+        def segments():
+            for seg in make_segments(10_000):
+                consumed.append(seg)
+                yield seg
+
+        packed = pack_transcript(segments(), 200, "gpt-4o")
+
+        assert packed.truncated
+        assert len(consumed) == packed.segments_used + 1
+
+    def test_timestamp_format_past_an_hour(self):
+        segments = [TranscriptSegment(text="late", start=3725.9, duration=1.0)]
+
+        assert pack_transcript(segments, 100, "gpt-4o").text == "[62:05] late\n"
+
+    def test_zero_budget_keeps_only_marker(self):
+        packed = pack_transcript(make_segments(5), 0, "gpt-4o")
+
+        assert packed.segments_used == 0
+        assert packed.truncated
+        assert packed.text == TRUNCATION_MARKER
+
+    def test_uses_tokenizer_when_available(self):
+        counter = MagicMock(side_effect=lambda text: len(text.split()))
+        with patch.object(transcript_packer, "_tiktoken_counter", return_value=counter):
+            packed = pack_transcript(make_segments(2), 1000, "gpt-4o")
+
+        assert packed.token_count == 2 * 10
+        assert counter.call_count == 3  # marker + one per segment
+
+
+    async def test_encoding_loads_off_the_event_loop(self):
+        counter = MagicMock()
+        threads = []
+
+        def loading_counter(model):
+            threads.append(threading.get_ident())
+            return counter
+
+        with patch.object(transcript_packer, "_tiktoken_counter", side_effect=loading_counter):
+            assert await load_token_counter("gpt-4o") is counter
+
+        assert threads and threads[0] != threading.get_ident()
+
+class TestBudget:
+    def test_longest_prefix_wins(self):
+        assert model_context_tokens("gpt-4") == 8_192
+        assert model_context_tokens("gpt-4o-mini") == 128_000
+        assert model_context_tokens("gemini-1.5-pro-latest") == 2_097_152
+
+    def test_gpt5_family(self):
+        assert model_context_tokens("gpt-5") == 272_000
+        assert model_context_tokens("gpt-5-mini") == 272_000
+        assert model_context_tokens("gpt-5-chat-latest") == 128_000
+
+    def test_configured_models_are_known(self):
+        """The models shipped in config.py and .env.example must not fall back to the 8k default."""
+        env_example = os.path.join(os.path.dirname(__file__), "..", ".env.example")
+        with open(env_example) as f:
+            env = dict(line.strip().split("=", 1) for line in f if line.strip() and not line.startswith("#"))
+        models = [env["OPENAI_MODEL"], env["GEMINI_MODEL"], Settings.model_fields["OPENAI_MODEL"].default]
+
+        for model in models:
+            assert any(model.startswith(prefix) for prefix in transcript_packer.MODEL_CONTEXT_TOKENS), model
+
+    def test_unknown_model_uses_default(self):
+        assert model_context_tokens("some-local-model") == transcript_packer.DEFAULT_CONTEXT_TOKENS
+
+    def test_budget_reserves_prompt_room(self):
+        with patch.object(transcript_packer, "settings") as mock_settings:
+            mock_settings.TRANSCRIPT_MAX_TOKENS = 0
+            assert transcript_token_budget("gpt-3.5-turbo") == 16_385 - RESERVED_PROMPT_TOKENS
+
+    def test_max_tokens_setting_caps_budget(self):
+        with patch.object(transcript_packer, "settings") as mock_settings:
+            mock_settings.TRANSCRIPT_MAX_TOKENS = 10_000
+            assert transcript_token_budget("gpt-4o") == 10_000
+            assert transcript_token_budget("gpt-4") == 8_192 - RESERVED_PROMPT_TOKENS
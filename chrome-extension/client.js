@@ -349,12 +349,15 @@ class PerspectivePrismClient {
    */
   async pollJobStatus(jobId, signal) {
     const POLL_INTERVAL_MS = 2000; // 2 seconds
+    const LONG_POLL_WAIT_S = 25; // Server holds the request until the status changes
 
     while (!signal.aborted) {
       try {
-        const response = await fetch(`${this.baseUrl}/analyze/jobs/${jobId}`, {
-          signal,
-        });
+        const requestStartedAt = Date.now();
+        const response = await fetch(
+          `${this.baseUrl}/analyze/jobs/${jobId}?wait=${LONG_POLL_WAIT_S}`,
+          { signal },
+        );
 
         if (!response.ok) {
           // If 404, maybe job lost? Treat as error.
@@ -374,8 +377,15 @@ class PerspectivePrismClient {
           );
         }
 
-        // If pending or processing, wait and retry
-        await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+        // If pending or processing, poll again. A long-poll that returned on a
+        // status change can be re-issued at once; only back off when the server
+        // answered quickly (e.g. a backend without long-poll support).
+        const elapsedMs = Date.now() - requestStartedAt;
+        if (elapsedMs < POLL_INTERVAL_MS) {
+          await new Promise((resolve) =>
+            setTimeout(resolve, POLL_INTERVAL_MS - elapsedMs),
+          );
+        }
       } catch (error) {
         if (signal.aborted) throw error;
         // If network error during polling, maybe retry a few times?
@@ -9,7 +9,7 @@ test.describe("Cache Management", () => {
         body: JSON.stringify({ job_id: "job-cache" }),
       });
     });
-    await context.route("**/analyze/jobs/job-cache", async (route) => {
+    await context.route("**/analyze/jobs/job-cache?wait=*", async (route) => {
       await route.fulfill({
         status: 200,
         body: JSON.stringify({
@@ -44,7 +44,7 @@ test.describe("Cache Management", () => {
 
     // Remove mocks - cached results should work without network
     await context.unroute("**/analyze/jobs");
-    await context.unroute("**/analyze/jobs/job-cache");
+    await context.unroute("**/analyze/jobs/job-cache?wait=*");
 
     await expect(analysisButton).toBeVisible();
     await analysisButton.click();
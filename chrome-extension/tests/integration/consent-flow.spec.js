@@ -31,7 +31,7 @@ test.describe("Consent Flow", () => {
       });
     });
 
-    await context.route("**/analyze/jobs/job-1", async (route) => {
+    await context.route("**/analyze/jobs/job-1?wait=*", async (route) => {
       await route.fulfill({
         status: 200,
         body: JSON.stringify({
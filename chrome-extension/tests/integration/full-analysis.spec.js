@@ -19,7 +19,7 @@ test.describe("Full Analysis Flow", () => {
       }
     });
 
-    await context.route("**/analyze/jobs/test-job-polling", async (route) => {
+    await context.route("**/analyze/jobs/test-job-polling?wait=*", async (route) => {
       pollCount++;
       if (pollCount < 3) {
         // Return processing status for first 2 calls
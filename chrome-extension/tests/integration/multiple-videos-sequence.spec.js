@@ -45,7 +45,7 @@ test.describe("Multiple Videos Analyzed in Sequence", () => {
     });
 
     // Mock polling endpoints for each video
-    await context.route("**/analyze/jobs/job-video-a", async (route) => {
+    await context.route("**/analyze/jobs/job-video-a?wait=*", async (route) => {
       await route.fulfill({
         status: 200,
         contentType: "application/json",
@@ -73,7 +73,7 @@ test.describe("Multiple Videos Analyzed in Sequence", () => {
       });
     });
 
-    await context.route("**/analyze/jobs/job-video-b", async (route) => {
+    await context.route("**/analyze/jobs/job-video-b?wait=*", async (route) => {
       await route.fulfill({
         status: 200,
         contentType: "application/json",
@@ -101,7 +101,7 @@ test.describe("Multiple Videos Analyzed in Sequence", () => {
       });
     });
 
-    await context.route("**/analyze/jobs/job-video-c", async (route) => {
+    await context.route("**/analyze/jobs/job-video-c?wait=*", async (route) => {
       await route.fulfill({
         status: 200,
         contentType: "application/json",
@@ -245,7 +245,7 @@ test.describe("Multiple Videos Analyzed in Sequence", () => {
       });
     });
 
-    await context.route("**/analyze/jobs/job-cleanup-test", async (route) => {
+    await context.route("**/analyze/jobs/job-cleanup-test?wait=*", async (route) => {
       await route.fulfill({
         status: 200,
         body: JSON.stringify({
@@ -71,10 +71,14 @@ function App() {
 
       // 2. Poll for Status
       const pollInterval = 2000 // 2 seconds
+      const longPollWaitSeconds = 25 // Server holds the request until the status changes
 
       const checkStatus = async () => {
         try {
-          const statusResponse = await fetch(`${apiUrl}/analyze/jobs/${job_id}`)
+          const requestStartedAt = Date.now()
+          const statusResponse = await fetch(
+            `${apiUrl}/analyze/jobs/${job_id}?wait=${longPollWaitSeconds}`
+          )
 
           if (!statusResponse.ok) {
             throw new Error('Failed to check job status')
@@ -89,8 +93,10 @@ function App() {
             setError(statusData.error || 'Analysis failed')
             setLoading(false)
           } else {
-            // Still processing, poll again
-            setTimeout(checkStatus, pollInterval)
+            // Still processing, poll again. Only back off if the server answered
+            // quickly rather than holding the long-poll open.
+            const elapsed = Date.now() - requestStartedAt
+            setTimeout(checkStatus, Math.max(0, pollInterval - elapsed))
           }
         } catch (err) {
           setError(err instanceof Error ? err.message : 'Error checking status')